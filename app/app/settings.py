@@ -46,6 +46,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.ServerTimingMiddleware",
+    "core.concurrency.ConcurrencyLimitMiddleware",
+    "core.routers.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -81,14 +84,78 @@ WSGI_APPLICATION = "app.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": os.environ.get("DB_ENGINE", "django.db.backends.postgresql"),
         "HOST": os.environ.get("DB_HOST"),
         "NAME": os.environ.get("DB_NAME"),
         "USER": os.environ.get("DB_USER"),
         "PASSWORD": os.environ.get("DB_PASS"),
+        # Used by the core.db.backends.postgresql_pool engine only
+        "POOL": {
+            "SIZE": int(os.environ.get("DB_POOL_SIZE", 5)),
+            "MAX_OVERFLOW": int(os.environ.get("DB_POOL_MAX_OVERFLOW", 10)),
+            "TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            "MAX_LIFETIME": float(os.environ.get("DB_POOL_MAX_LIFETIME", 1800)),
+        },
     }
 }
 
+# Read replicas of the primary, given as comma separated hosts (file paths
+# for SQLite). Tests use the primary test database for every replica.
+DATABASE_REPLICAS = []
+for host in filter(None, os.environ.get("DB_REPLICAS", "").split(",")):
+    alias = f"replica_{len(DATABASE_REPLICAS) + 1}"
+    DATABASES[alias] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+    if "sqlite" in DATABASES[alias]["ENGINE"]:
+        DATABASES[alias]["NAME"] = host
+    else:
+        DATABASES[alias]["HOST"] = host
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+
+REPLICA_ROUTING = {
+    # Seconds a client's reads stay on the primary after it wrote
+    "PIN_SECONDS": 5,
+    # Seconds between health checks of each replica
+    "HEALTH_CHECK_INTERVAL": 5,
+    # Replicas further behind the primary than this are skipped
+    "MAX_LAG_SECONDS": 10,
+    # Cache alias holding the pins; it must be shared by every server process
+    "PIN_CACHE": "replica-pins",
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "recipes": {
+        "BACKEND": os.environ.get(
+            "RECIPE_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("RECIPE_CACHE_LOCATION", "recipes"),
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    # Read-your-writes pins (core.routers), in a table of the primary every
+    # worker and host shares (created by the core migrations). Pins live a
+    # few seconds, so a few thousand rows cover every recent writer.
+    "replica-pins": {
+        "BACKEND": os.environ.get(
+            "REPLICA_PIN_CACHE_BACKEND",
+            "django.core.cache.backends.db.DatabaseCache",
+        ),
+        "LOCATION": os.environ.get("REPLICA_PIN_CACHE_LOCATION", "replica_pins"),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+# Cache alias holding rendered recipe read responses
+RECIPE_CACHE_ALIAS = "recipes"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
@@ -109,6 +176,23 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+PASSWORD_HASHERS = [
+    "core.hashers.OffloadedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Process pool used for password key stretching. The pool is per server
+# process, so keep it small: every gunicorn worker starts its own.
+PASSWORD_HASHING_EXECUTOR = {
+    "MAX_WORKERS": int(os.environ.get("HASHING_WORKERS", 2)),
+    "MAX_QUEUE": int(os.environ.get("HASHING_QUEUE", 64)),
+    "TIMEOUT": 10,
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.0/topics/i18n/
 
@@ -136,4 +220,51 @@ AUTH_USER_MODEL = "core.User"
 # REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "core.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.ORJSONParser",
+        "core.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# In-process cache of resolved auth tokens
+TOKEN_AUTH_CACHE = {
+    "MAX_SIZE": 10000,
+    "TTL": 300,
+}
+
+# Largest number of items accepted by the recipe bulk endpoint
+RECIPE_BULK_MAX_ITEMS = 1000
+# Largest number of ids accepted by recipe multi-get (?ids=)
+RECIPE_MULTI_GET_MAX_IDS = 100
+
+# Adaptive per-route-class concurrency limits and load shedding
+CONCURRENCY_LIMITS = {
+    "ENABLED": True,
+    "RETRY_AFTER": 1,
+    "MAX_CLIENT_SHARE": 0.5,
+    # META key holding the client address set by the trusted reverse proxy
+    # (e.g. "HTTP_X_FORWARDED_FOR"); anonymous requests without it are not
+    # subject to MAX_CLIENT_SHARE
+    "CLIENT_IP_HEADER": os.environ.get("CLIENT_IP_HEADER") or None,
+    "CLASSES": {
+        "auth": {"INITIAL": 8, "MIN": 2, "MAX": 32},
+        "recipe_read": {"INITIAL": 32, "MIN": 4, "MAX": 256},
+        "recipe_write": {"INITIAL": 16, "MIN": 2, "MAX": 64},
+        "admin": {"INITIAL": 4, "MIN": 1, "MAX": 16},
+    },
 }
+
+# Precomputed OpenAPI schema (core.schema), regenerated when the code
+# version changes. Without CODE_VERSION the source files are hashed.
+API_SCHEMA_DIR = BASE_DIR / "schema"
+CODE_VERSION = os.environ.get("CODE_VERSION")
+
+# Hash partitions of core_receipe by user_id on PostgreSQL (core.partitioning)
+RECIPE_PARTITIONS = int(os.environ.get("RECIPE_PARTITIONS", 16))
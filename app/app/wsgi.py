@@ -8,9 +8,15 @@ https://docs.djangoproject.com/en/4.0/howto/deployment/wsgi/
 """
 
 import os
+import time
 
 from django.core.wsgi import get_wsgi_application
+from core.warmup import warm_up
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
 
+started = time.perf_counter()
 application = get_wsgi_application()
+# Resolve URLs, build serializers and load the schema before serving (and,
+# when the server preloads the app, before forking its workers)
+warm_up_report = {"setup": time.perf_counter() - started, **warm_up()}
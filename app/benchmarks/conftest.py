@@ -0,0 +1,72 @@
+import platform
+import pytest
+import django
+from django.contrib.auth import get_user_model
+from django.db import connection
+from benchmarks.harness import load_json, seed_dataset, write_json
+
+
+@pytest.fixture(scope="session")
+def benchmark_config(request):
+    config = request.config
+    return {
+        "users": config.getoption("--benchmark-users"),
+        "recipes": config.getoption("--benchmark-recipes"),
+        "iterations": config.getoption("--benchmark-iterations"),
+        "tolerance": config.getoption("--benchmark-tolerance"),
+        "output": str(config.rootpath / config.getoption("--benchmark-output")),
+        "baseline": str(config.rootpath / config.getoption("--benchmark-baseline")),
+        "save_baseline": config.getoption("--benchmark-save-baseline"),
+    }
+
+
+@pytest.fixture(scope="session")
+def benchmark_baseline(benchmark_config):
+    """Budgets of the current database vendor, keyed by scenario"""
+    return load_json(benchmark_config["baseline"]).get(connection.vendor, {})
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(benchmark_config):
+    """Collect scenario results and write them out after the session"""
+    results = {}
+    yield results
+    if not results:
+        return
+
+    write_json(
+        benchmark_config["output"],
+        {
+            "vendor": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "dataset": {
+                "users": benchmark_config["users"],
+                "recipes_per_user": benchmark_config["recipes"],
+            },
+            "results": results,
+        },
+    )
+    if benchmark_config["save_baseline"]:
+        baseline = load_json(benchmark_config["baseline"])
+        baseline[connection.vendor] = {
+            name: {"queries": result["queries"], "p95_ms": result["p95_ms"]}
+            for name, result in results.items()
+        }
+        write_json(benchmark_config["baseline"], baseline)
+
+
+@pytest.fixture(scope="module")
+def dataset(django_db_setup, django_db_blocker, benchmark_config):
+    """Users and recipes shared by every scenario of a module
+
+    The rows are committed, so they are removed again on teardown; each
+    scenario's own writes are rolled back with its test transaction.
+    """
+    with django_db_blocker.unblock():
+        dataset = seed_dataset(benchmark_config["users"], benchmark_config["recipes"])
+    yield dataset
+    with django_db_blocker.unblock():
+        get_user_model().objects.filter(
+            pk__in=[user_id for user_id, _, _ in dataset.users]
+        ).delete()
@@ -0,0 +1,155 @@
+"""
+Helpers for the API benchmark suite: bulk seeding, timing and budgets.
+"""
+import json
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from core.models import Receipe
+
+PASSWORD = "Password123"
+BATCH_SIZE = 1000
+
+
+@dataclass
+class Dataset:
+    """Seeded users as ``(id, email, token key)`` and their recipe ids"""
+
+    users: list = field(default_factory=list)
+    recipes: dict = field(default_factory=dict)
+
+
+def seed_dataset(users, recipes_per_user):
+    """Bulk create ``users`` users with ``recipes_per_user`` recipes each
+
+    The password is hashed once and shared, so seeding cost does not
+    depend on the password hasher.
+    """
+    password = make_password(PASSWORD)
+    created = get_user_model().objects.bulk_create(
+        (
+            get_user_model()(
+                email=f"bench-{index}@example.com", name="Bench", password=password
+            )
+            for index in range(users)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    if not connection.features.can_return_rows_from_bulk_insert:
+        created = list(
+            get_user_model().objects.filter(email__startswith="bench-").order_by("id")
+        )
+
+    tokens = Token.objects.bulk_create(
+        (Token(user=user, key=Token.generate_key()) for user in created),
+        batch_size=BATCH_SIZE,
+    )
+    Receipe.objects.bulk_create(
+        (
+            Receipe(
+                user=user,
+                title=f"Recipe {index}",
+                description="Benchmark recipe",
+                time_minutes=index % 120,
+                price=Decimal(index % 10000) / 100,
+            )
+            for user in created
+            for index in range(recipes_per_user)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    dataset = Dataset(
+        users=[(user.pk, user.email, token.key) for user, token in zip(created, tokens)]
+    )
+    for user_id, recipe_id in (
+        Receipe.objects.filter(user__in=created)
+        .order_by("id")
+        .values_list("user_id", "id")
+    ):
+        dataset.recipes.setdefault(user_id, []).append(recipe_id)
+    return dataset
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile of sorted ``samples``"""
+    index = max(0, math.ceil(percent / 100 * len(samples)) - 1)
+    return samples[index]
+
+
+def best_of(fn, repeat=5):
+    """Fastest of ``repeat`` timed calls of ``fn``, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def measure(request, iterations, expected_status, warmup=1):
+    """Time ``request(i)`` and count its queries
+
+    The first ``warmup`` calls are not recorded. Every response must have
+    ``expected_status``.
+    """
+    timings, queries = [], []
+    for index in range(warmup + iterations):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = request(index)
+            elapsed = time.perf_counter() - started
+        assert response.status_code == expected_status, response.content[:200]
+        if index >= warmup:
+            timings.append(elapsed * 1000)
+            queries.append(len(captured))
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "queries": max(queries),
+    }
+
+
+def check_budget(name, result, budget, tolerance):
+    """Return the ways ``result`` exceeds its baseline ``budget``"""
+    errors = []
+    if result["queries"] > budget["queries"]:
+        errors.append(
+            f"{name}: {result['queries']} queries, budget is {budget['queries']}"
+        )
+    limit = budget["p95_ms"] * (1 + tolerance)
+    if result["p95_ms"] > limit:
+        errors.append(
+            f"{name}: p95 {result['p95_ms']:.1f}ms, budget is {limit:.1f}ms "
+            f"({budget['p95_ms']:.1f}ms baseline)"
+        )
+    return errors
+
+
+def load_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as stream:
+        return json.load(stream)
+
+
+def write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as stream:
+        json.dump(data, stream, indent=2, sort_keys=True)
+        stream.write("\n")
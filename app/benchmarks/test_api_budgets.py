@@ -0,0 +1,127 @@
+import json
+import pytest
+from django.test import Client
+from django.urls import reverse
+from core.models import Receipe
+from benchmarks.harness import PASSWORD, check_budget, measure
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+CREATE_USER_URL = reverse("users:create")
+TOKEN_URL = reverse("users:token")
+ME_URL = reverse("users:me")
+RECIPE_URL = reverse("recipes:recipe-list")
+
+
+def detail_url(recipe_id):
+    return reverse("recipes:recipe-detail", args=[recipe_id])
+
+
+def token_client(user):
+    _, _, key = user
+    return Client(HTTP_AUTHORIZATION=f"Token {key}")
+
+
+def signup(dataset, count):
+    client = Client()
+    data = {"password": PASSWORD, "name": "Bench"}
+    return (
+        lambda i: client.post(
+            CREATE_USER_URL, {**data, "email": f"bench-signup-{i}@example.com"}
+        ),
+        201,
+    )
+
+
+def token(dataset, count):
+    client = Client()
+    users = dataset.users
+    return (
+        lambda i: client.post(
+            TOKEN_URL, {"email": users[i % len(users)][1], "password": PASSWORD}
+        ),
+        200,
+    )
+
+
+def me(dataset, count):
+    clients = [token_client(user) for user in dataset.users]
+    return lambda i: clients[i % len(clients)].get(ME_URL), 200
+
+
+def recipe_list(dataset, count):
+    clients = [token_client(user) for user in dataset.users]
+    return lambda i: clients[i % len(clients)].get(RECIPE_URL), 200
+
+
+def recipe_detail(dataset, count):
+    user = dataset.users[0]
+    client, recipes = token_client(user), dataset.recipes[user[0]]
+    return lambda i: client.get(detail_url(recipes[i % len(recipes)])), 200
+
+
+def recipe_create(dataset, count):
+    user = dataset.users[0]
+    client = token_client(user)
+    data = {"title": "New recipe", "time_minutes": 10, "price": "5.00", "user": user[0]}
+    return lambda i: client.post(RECIPE_URL, data), 201
+
+
+def recipe_update(dataset, count):
+    user = dataset.users[0]
+    client, recipes = token_client(user), dataset.recipes[user[0]]
+    return (
+        lambda i: client.patch(
+            detail_url(recipes[i % len(recipes)]),
+            json.dumps({"title": f"Updated {i}"}),
+            content_type="application/json",
+        ),
+        200,
+    )
+
+
+def recipe_delete(dataset, count):
+    user = dataset.users[0]
+    client = token_client(user)
+    recipes = Receipe.objects.bulk_create(
+        Receipe(user_id=user[0], title="Doomed", time_minutes=1, price="1.00")
+        for _ in range(count)
+    )
+    if recipes[0].pk is None:
+        recipes = list(Receipe.objects.filter(title="Doomed").order_by("id"))
+    return lambda i: client.delete(detail_url(recipes[i].pk)), 204
+
+
+SCENARIOS = {
+    "signup": signup,
+    "token": token,
+    "me": me,
+    "recipe_list": recipe_list,
+    "recipe_detail": recipe_detail,
+    "recipe_create": recipe_create,
+    "recipe_update": recipe_update,
+    "recipe_delete": recipe_delete,
+}
+WARMUP = 1
+
+
+@pytest.mark.parametrize("name", SCENARIOS)
+def test_api_budget(
+    name, dataset, benchmark_config, benchmark_baseline, benchmark_results
+):
+    """Measure a scenario and compare it with the stored baseline"""
+    iterations = benchmark_config["iterations"]
+    request, expected_status = SCENARIOS[name](dataset, WARMUP + iterations)
+
+    result = measure(request, iterations, expected_status, warmup=WARMUP)
+    benchmark_results[name] = result
+    print(
+        f"\n{name}: p50 {result['p50_ms']:.1f}ms, p95 {result['p95_ms']:.1f}ms, "
+        f"p99 {result['p99_ms']:.1f}ms, {result['queries']} queries"
+    )
+
+    budget = benchmark_baseline.get(name)
+    if budget is None or benchmark_config["save_baseline"]:
+        return
+    errors = check_budget(name, result, budget, benchmark_config["tolerance"])
+    assert not errors, "\n".join(errors)
@@ -0,0 +1,46 @@
+from decimal import Decimal
+import pytest
+from rest_framework.renderers import JSONRenderer
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+from benchmarks.harness import best_of
+
+pytestmark = pytest.mark.benchmark
+
+ROWS = 10000
+MIN_SPEEDUP = 3
+
+
+def recipe_page():
+    """A recipe list as the serializers produce it"""
+    return {
+        "next": "http://testserver/api/recipes/?cursor=cD0xMDAwMA%3D%3D",
+        "previous": None,
+        "results": [
+            {
+                "id": i,
+                "title": f"Recipe {i} with a longer title",
+                "time_minutes": i % 120,
+                "price": str(Decimal(i % 10000) / 100),
+                "user": 1,
+                "link": "",
+            }
+            for i in range(ROWS)
+        ],
+    }
+
+
+def test_renderer_throughput():
+    """Compare bytes/sec of DRF's JSONRenderer with orjson and MessagePack"""
+    data = recipe_page()
+    results = {}
+    for renderer in (JSONRenderer(), ORJSONRenderer(), MessagePackRenderer()):
+        size = len(renderer.render(data, renderer.media_type))
+        seconds = best_of(lambda: renderer.render(data, renderer.media_type))
+        results[type(renderer).__name__] = (size, seconds)
+
+    print()
+    for name, (size, seconds) in results.items():
+        print(f"{name}: {size:,} bytes, {size / seconds / 1e6:,.1f} MB/s")
+    assert results["ORJSONRenderer"][0] == results["JSONRenderer"][0]
+    speedup = results["JSONRenderer"][1] / results["ORJSONRenderer"][1]
+    assert speedup >= MIN_SPEEDUP
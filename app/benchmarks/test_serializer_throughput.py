@@ -0,0 +1,36 @@
+from decimal import Decimal
+import pytest
+from core.models import Receipe
+from benchmarks.harness import best_of
+from recipes.compiled import compile_serializer
+from recipes.serializers import RecipeSerializer
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+ROWS = 10000
+MIN_SPEEDUP = 5
+
+
+def test_compiled_serializer_throughput(normal_user):
+    """Compare DRF and compiled serialization of a 10k row recipe list"""
+    Receipe.objects.bulk_create(
+        Receipe(
+            user=normal_user,
+            title=f"Recipe {i}",
+            time_minutes=i % 120,
+            price=Decimal(i % 10000) / 100,
+        )
+        for i in range(ROWS)
+    )
+    queryset = Receipe.objects.filter(user=normal_user).order_by("-id")
+    compiled = compile_serializer(RecipeSerializer)
+
+    drf = best_of(lambda: RecipeSerializer(queryset.all(), many=True).data)
+    fast = best_of(lambda: compiled.serialize(compiled.values(queryset.all())))
+
+    speedup = drf / fast
+    print(
+        f"\nDRF {ROWS / drf:,.0f} rows/s, compiled {ROWS / fast:,.0f} rows/s, "
+        f"{speedup:.1f}x"
+    )
+    assert speedup >= MIN_SPEEDUP
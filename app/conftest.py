@@ -1,9 +1,51 @@
 import pytest
 from decimal import Decimal
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
 from core.models import Receipe
 
 
+def pytest_addoption(parser):
+    parser.addoption("--benchmark", action="store_true", help="Run the benchmark suite")
+    group = parser.getgroup("benchmark")
+    group.addoption("--benchmark-users", type=int, default=20)
+    group.addoption("--benchmark-recipes", type=int, default=50, help="Per user")
+    group.addoption("--benchmark-iterations", type=int, default=30)
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=1.0,
+        help="Allowed p95 latency growth over the baseline, 1.0 = +100%%",
+    )
+    group.addoption("--benchmark-output", default="benchmarks/results.json")
+    group.addoption("--benchmark-baseline", default="benchmarks/baseline.json")
+    group.addoption(
+        "--benchmark-save-baseline",
+        action="store_true",
+        help="Store this run as the baseline instead of comparing against it",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Keep cached responses from leaking between tests"""
+    yield
+    for cache in caches.all():
+        # Database caches are rolled back with the test's transaction
+        if not isinstance(cache, DatabaseCache):
+            cache.clear()
+
+
 @pytest.fixture
 def sample_emails():
     return [
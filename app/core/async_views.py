@@ -0,0 +1,189 @@
+"""
+Natively async API views for ASGI deployments.
+
+DRF views are sync, so under ASGI every request is handed to a thread. The
+views here run authentication (answered from the token cache), permission
+checks, conditional GET, serialization and rendering on the event loop.
+Django 4.0 has no async ORM API yet, so database work is batched into
+``sync_to_async`` calls that the views await.
+"""
+import functools
+
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import classonlymethod
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+from core.authentication import CachedTokenAuthentication
+from core.conditional import (
+    NotModified,
+    evaluate_conditional_request,
+    set_conditional_headers,
+)
+from core.metrics import timed
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class AsyncAPIView(View):
+    """Async counterpart of an ``APIView`` rendering JSON or MessagePack
+
+    Handlers are ``async def`` methods returning a DRF ``Response``, which
+    is rendered to a plain ``HttpResponse`` here so Django does not have to
+    render it in a thread. Views that implement ``get_conditional_validators``
+    (as a coroutine) get ``ConditionalGetMixin`` behaviour.
+    """
+
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES
+    renderer_classes = (ORJSONRenderer, MessagePackRenderer)
+    http_method_names = ["get", "post", "put", "patch", "delete", "head"]
+
+    conditional_validators = None
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+
+        # Django 4.0 only runs a view on the event loop when the view
+        # function itself is a coroutine function. Token authentication
+        # needs no CSRF protection, like DRF's own views.
+        @functools.wraps(view)
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        async_view.csrf_exempt = True
+        return async_view
+
+    @property
+    def allowed_methods(self):
+        return [
+            method.upper() for method in self.http_method_names if hasattr(self, method)
+        ]
+
+    def get_authenticators(self):
+        return [auth() for auth in self.authentication_classes]
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, parsers=[parser() for parser in self.parser_classes])
+        renderers = [renderer() for renderer in self.renderer_classes]
+        request.accepted_renderer = renderers[0]
+        request.accepted_media_type = renderers[0].media_type
+        self.request, self.args, self.kwargs = request, args, kwargs
+        self.headers = {"Allow": ", ".join(self.allowed_methods)}
+
+        try:
+            (
+                request.accepted_renderer,
+                request.accepted_media_type,
+            ) = DefaultContentNegotiation().select_renderer(request, renderers)
+            await self.initial(request)
+            handler = None
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), None)
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        return self.finalize_response(request, response)
+
+    async def initial(self, request):
+        await self.perform_authentication(request)
+        self.check_permissions(request)
+        if request.method not in ("GET", "HEAD") or not hasattr(
+            self, "get_conditional_validators"
+        ):
+            return
+
+        validators = await self.get_conditional_validators(request)
+        if validators is None:
+            return
+        etag_source, last_modified = validators
+        self.conditional_validators = evaluate_conditional_request(
+            request, etag_source, last_modified
+        )
+
+    async def perform_authentication(self, request):
+        self.authenticator = None
+        for authenticator in self.get_authenticators():
+            user_auth = await authenticator.aauthenticate(request)
+            if user_auth is not None:
+                self.authenticator = authenticator
+                request.user, request.auth = user_auth
+                return
+        unauthenticated_user = api_settings.UNAUTHENTICATED_USER
+        request.user = unauthenticated_user() if unauthenticated_user else None
+        request.auth = None
+
+    def check_permissions(self, request):
+        for permission in self.get_permissions():
+            if not permission.has_permission(request, self):
+                if self.authenticator is None:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(
+                    detail=getattr(permission, "message", None),
+                    code=getattr(permission, "code", None),
+                )
+
+    def get_authenticate_header(self, request):
+        authenticators = self.get_authenticators()
+        if authenticators:
+            return authenticators[0].authenticate_header(request)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            auth_header = self.get_authenticate_header(self.request)
+            if auth_header:
+                exc.auth_header = auth_header
+            else:
+                exc.status_code = 403
+
+        context = {
+            "view": self,
+            "args": self.args,
+            "kwargs": self.kwargs,
+            "request": self.request,
+        }
+        response = exception_handler(exc, context)
+        if response is None:
+            raise exc
+        return response
+
+    def finalize_response(self, request, response):
+        if isinstance(response, Response):
+            content = b""
+            if response.data is not None:
+                with timed("render"):
+                    content = request.accepted_renderer.render(
+                        response.data,
+                        request.accepted_media_type,
+                        {"view": self, "request": request, "response": response},
+                    )
+            rendered = HttpResponse(
+                content,
+                status=response.status_code,
+                content_type=request.accepted_media_type,
+            )
+            for header, value in response.items():
+                if header != "Content-Type":
+                    rendered[header] = value
+            response = rendered
+
+        patch_vary_headers(response, ("Accept",))
+        for header, value in self.headers.items():
+            response[header] = value
+        return set_conditional_headers(response, self.conditional_validators)
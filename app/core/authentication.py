@@ -0,0 +1,183 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, router
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header,
+)
+from core.metrics import timed
+from core.routers import use_primary
+
+
+class TokenCache:
+    """Bounded in-process LRU cache of resolved tokens
+
+    Entries map a token key to its ``(user, token)`` pair and expire after
+    ``TTL`` seconds. The least recently used entry is evicted once
+    ``MAX_SIZE`` entries are stored.
+    """
+
+    default_max_size = 10000
+    default_ttl = 300
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self):
+        config = getattr(settings, "TOKEN_AUTH_CACHE", {})
+        return config.get("MAX_SIZE", self.default_max_size)
+
+    @property
+    def ttl(self):
+        config = getattr(settings, "TOKEN_AUTH_CACHE", {})
+        return config.get("TTL", self.default_ttl)
+
+    def get(self, key):
+        """Return the cached ``(user, token)`` pair or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, user, token = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return user, token
+
+    def set(self, key, user, token):
+        """Store the resolved pair for a token key"""
+        max_size = self.max_size
+        if max_size <= 0:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, user, token)
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def invalidate(self, key):
+        """Drop a single token key"""
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_user(self, user_id):
+        """Drop every token key resolved for a user"""
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return hit and miss counters for monitoring"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[1].pk
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that skips the database for recently seen tokens"""
+
+    def get_token_key(self, request):
+        """Return the token key from the Authorization header, if any"""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) == 1:
+            msg = _("Invalid token header. No credentials provided.")
+            raise exceptions.AuthenticationFailed(msg)
+        if len(auth) > 2:
+            msg = _("Invalid token header. Token string should not contain spaces.")
+            raise exceptions.AuthenticationFailed(msg)
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            msg = _(
+                "Invalid token header. "
+                "Token string should not contain invalid characters."
+            )
+            raise exceptions.AuthenticationFailed(msg)
+
+    def authenticate(self, request):
+        with timed("auth"):
+            key = self.get_token_key(request)
+            if key is None:
+                return None
+            return self.authenticate_credentials(key)
+
+    async def aauthenticate(self, request):
+        """Async ``authenticate``; only a token cache miss touches the database"""
+        with timed("auth"):
+            key = self.get_token_key(request)
+            if key is None:
+                return None
+            cached = token_cache.get(key)
+            if cached is None:
+                cached = await sync_to_async(self.load_credentials)(key)
+            return self.copy_credentials(cached)
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            cached = self.load_credentials(key)
+        return self.copy_credentials(cached)
+
+    def load_credentials(self, key):
+        try:
+            user, token = super().authenticate_credentials(key)
+        except exceptions.AuthenticationFailed:
+            # A token created moments ago may not have reached the replica
+            if router.db_for_read(self.get_model()) == DEFAULT_DB_ALIAS:
+                raise
+            with use_primary():
+                user, token = super().authenticate_credentials(key)
+        token_cache.set(key, user, token)
+        return user, token
+
+    def copy_credentials(self, cached):
+        # Hand out copies so a request mutating its user cannot leak the
+        # change into other requests sharing the cache entry.
+        user = copy.copy(cached[0])
+        token = copy.copy(cached[1])
+        token.user = user
+        return user, token
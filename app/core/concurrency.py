@@ -0,0 +1,291 @@
+"""
+Adaptive concurrency limits with load shedding.
+
+Requests are grouped into route classes (auth, recipe reads, recipe
+writes, admin), each with its own limit on requests in flight. A limit
+follows observed latency (the gradient algorithm): while recent latency
+stays near the long-term average it grows by about its square root, and
+as latency climbs it shrinks in proportion. Server errors cut it
+multiplicatively (AIMD). A request over the limit is answered at once
+with 503 and ``Retry-After``, so a slow database never queues work in
+the workers. No client may hold more than ``MAX_CLIENT_SHARE`` of a
+class's slots, so one heavy token cannot starve the others. Anonymous
+requests count as one client per address only when ``CLIENT_IP_HEADER``
+names where the address comes from; behind a reverse proxy
+``REMOTE_ADDR`` is the proxy's, shared by everyone. Streamed responses
+hold their slot until the body has been sent.
+"""
+import asyncio
+import hashlib
+import math
+import threading
+import time
+
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+AUTH_VIEWS = ("users:create", "users:token", "users:token-async")
+DEFAULT_CONCURRENCY_LIMITS = {
+    "ENABLED": True,
+    "RETRY_AFTER": 1,
+    "MAX_CLIENT_SHARE": 0.5,
+    "CLIENT_IP_HEADER": None,
+    "CLASSES": {
+        "auth": {"INITIAL": 8, "MIN": 2, "MAX": 32},
+        "recipe_read": {"INITIAL": 32, "MIN": 4, "MAX": 256},
+        "recipe_write": {"INITIAL": 16, "MIN": 2, "MAX": 64},
+        "admin": {"INITIAL": 4, "MIN": 1, "MAX": 16},
+    },
+}
+
+
+def get_concurrency_setting(name):
+    return getattr(settings, "CONCURRENCY_LIMITS", {}).get(
+        name, DEFAULT_CONCURRENCY_LIMITS[name]
+    )
+
+
+class AdaptiveLimiter:
+    """Concurrency limit of one route class, adapted to its latency"""
+
+    def __init__(
+        self,
+        initial,
+        min_limit,
+        max_limit,
+        smoothing=0.2,
+        tolerance=1.5,
+        backoff=0.9,
+        max_client_share=0.5,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.max_client_share = max_client_share
+        self.in_flight = 0
+        self.clients = {}
+        self.long_latency = None
+        self.shed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def client_limit(self):
+        return max(1, math.ceil(int(self.limit) * self.max_client_share))
+
+    def try_acquire(self, client):
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                self.shed += 1
+                return False
+            if client is not None and self.clients.get(client, 0) >= (
+                self.client_limit
+            ):
+                self.shed += 1
+                return False
+            self.in_flight += 1
+            if client is not None:
+                self.clients[client] = self.clients.get(client, 0) + 1
+            return True
+
+    def release(self, client, latency, failed=False):
+        with self._lock:
+            in_flight = self.in_flight
+            self.in_flight -= 1
+            if client is not None:
+                remaining = self.clients.pop(client) - 1
+                if remaining:
+                    self.clients[client] = remaining
+            self.update(latency, failed, in_flight)
+
+    def update(self, latency, failed, in_flight):
+        if failed:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            return
+        if self.long_latency is None:
+            self.long_latency = latency
+        self.long_latency = 0.95 * self.long_latency + 0.05 * latency
+        if self.long_latency > 2 * latency:
+            # Recover quickly once a slow period is over
+            self.long_latency *= 0.9
+        if in_flight < self.limit / 2:
+            # Too idle to tell whether more concurrency would help
+            return
+        gradient = max(
+            0.5, min(1.0, self.tolerance * self.long_latency / max(latency, 1e-6))
+        )
+        target = self.limit * gradient + math.sqrt(self.limit)
+        limit = (1 - self.smoothing) * self.limit + self.smoothing * target
+        self.limit = min(self.max_limit, max(self.min_limit, limit))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "shed": self.shed,
+            }
+
+
+class ConcurrencyLimits:
+    """The limiters of this process, created from settings on first use"""
+
+    def __init__(self):
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def get(self, route_class):
+        limiter = self._limiters.get(route_class)
+        if limiter is not None:
+            return limiter
+        options = get_concurrency_setting("CLASSES").get(route_class)
+        if options is None:
+            return None
+        with self._lock:
+            if route_class not in self._limiters:
+                self._limiters[route_class] = AdaptiveLimiter(
+                    options["INITIAL"],
+                    options["MIN"],
+                    options["MAX"],
+                    max_client_share=get_concurrency_setting("MAX_CLIENT_SHARE"),
+                )
+            return self._limiters[route_class]
+
+    def stats(self):
+        return {
+            route_class: limiter.stats()
+            for route_class, limiter in sorted(self._limiters.items())
+        }
+
+    def reset(self):
+        with self._lock:
+            self._limiters.clear()
+
+
+concurrency_limits = ConcurrencyLimits()
+
+
+class ReleasingContent:
+    """Streamed body that calls ``release`` once, when exhausted or closed
+
+    Servers close the response even when they never iterate it (e.g. the
+    client went away first), which a generator's ``finally`` would miss.
+    """
+
+    def __init__(self, content, release):
+        self.content = iter(content)
+        self.release = release
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self.content)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        release, self.release = self.release, None
+        if release is not None:
+            release()
+
+
+class ConcurrencyLimitMiddleware:
+    """Shed requests beyond the adaptive limit of their route class"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            self.release(request, failed=True)
+            raise
+        return self.release_on_response(request, response)
+
+    async def __acall__(self, request):
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            self.release(request, failed=True)
+            raise
+        return self.release_on_response(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not get_concurrency_setting("ENABLED"):
+            return None
+        limiter = concurrency_limits.get(self.get_route_class(request))
+        if limiter is None:
+            return None
+        client = self.get_client_key(request)
+        if not limiter.try_acquire(client):
+            return self.shed_response()
+        request._concurrency_slot = (limiter, client, time.perf_counter())
+        return None
+
+    def get_route_class(self, request):
+        match = request.resolver_match
+        if "admin" in match.namespaces:
+            return "admin"
+        if match.view_name in AUTH_VIEWS:
+            return "auth"
+        if "recipes" in match.namespaces:
+            return "recipe_read" if request.method in SAFE_METHODS else "recipe_write"
+        return None
+
+    def get_client_key(self, request):
+        credentials = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(
+            settings.SESSION_COOKIE_NAME
+        )
+        if credentials:
+            return hashlib.sha256(credentials.encode()).hexdigest()
+        header = get_concurrency_setting("CLIENT_IP_HEADER")
+        if not header or not request.META.get(header):
+            # Not identifiable: only the class limit applies
+            return None
+        # The last address of X-Forwarded-For is the one the proxy saw
+        return request.META[header].rsplit(",", 1)[-1].strip()
+
+    def shed_response(self):
+        response = JsonResponse(
+            {"detail": "Server is busy, try again later."}, status=503
+        )
+        response["Retry-After"] = str(get_concurrency_setting("RETRY_AFTER"))
+        return response
+
+    def release(self, request, failed):
+        slot = request.__dict__.pop("_concurrency_slot", None)
+        if slot is not None:
+            limiter, client, started = slot
+            limiter.release(client, time.perf_counter() - started, failed)
+
+    def release_on_response(self, request, response):
+        if not response.streaming:
+            self.release(request, failed=response.status_code >= 500)
+            return response
+        slot = request.__dict__.pop("_concurrency_slot", None)
+        if slot is not None:
+            # Keep the slot until the body is sent, but adapt the limit to
+            # the time to the headers, not the length of the body
+            limiter, client, started = slot
+            latency = time.perf_counter() - started
+            failed = response.status_code >= 500
+            response.streaming_content = ReleasingContent(
+                response.streaming_content,
+                lambda: limiter.release(client, latency, failed),
+            )
+        return response
@@ -0,0 +1,73 @@
+import hashlib
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class NotModified(Exception):
+    """Raised to short-circuit a request with a 304 response"""
+
+    def __init__(self, response):
+        self.response = response
+
+
+def evaluate_conditional_request(request, etag_source, last_modified):
+    """Return the ``(etag, timestamp)`` validators of a GET/HEAD request
+
+    Raises ``NotModified`` when the request's preconditions match them.
+    """
+    etag = quote_etag(
+        hashlib.md5(f"{etag_source}:{request.accepted_media_type}".encode()).hexdigest()
+    )
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        raise NotModified(set_conditional_headers(response, (etag, timestamp)))
+    return etag, timestamp
+
+
+def set_conditional_headers(response, validators):
+    """Add ``ETag``/``Last-Modified`` to successful and 304 responses"""
+    if validators and response.status_code in (200, 304):
+        etag, timestamp = validators
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+    return response
+
+
+class ConditionalGetMixin:
+    """Answer ``If-None-Match``/``If-Modified-Since`` before any real work
+
+    Views return cheap validators from ``get_conditional_validators`` as an
+    ``(etag_source, last_modified)`` pair, or ``None`` to skip conditional
+    handling. They are checked right after authentication, so a matching
+    request never loads rows or runs a serializer.
+    """
+
+    conditional_validators = None
+
+    def get_conditional_validators(self, request):
+        return None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in ("GET", "HEAD"):
+            return
+
+        validators = self.get_conditional_validators(request)
+        if validators is None:
+            return
+        etag_source, last_modified = validators
+        self.conditional_validators = evaluate_conditional_request(
+            request, etag_source, last_modified
+        )
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        return set_conditional_headers(response, self.conditional_validators)
@@ -0,0 +1,49 @@
+"""
+PostgreSQL backend that reuses connections from an in-process pool.
+
+Select it with ``"ENGINE": "core.db.backends.postgresql_pool"`` and tune
+the pool with a ``"POOL"`` dict next to the other connection settings::
+
+    "POOL": {"SIZE": 5, "MAX_OVERFLOW": 10, "TIMEOUT": 10,
+             "MAX_LIFETIME": 1800, "HEALTH_CHECK": True}
+
+Keep ``CONN_MAX_AGE`` at 0: closing a connection at the end of a request
+then hands it back to the pool instead of disconnecting.
+"""
+from functools import partial
+
+from django.db.backends.postgresql import base
+from core.db.pool import close_pools, get_pool
+
+
+class DatabaseCreation(base.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would keep DROP DATABASE from running
+        close_pools(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+    pool = None
+
+    def get_pool(self, conn_params):
+        # Connections to other databases (e.g. "postgres" while creating the
+        # test database) get their own pool
+        key = repr(sorted(conn_params.items()))
+        return get_pool(self.alias, key, self.settings_dict.get("POOL", {}))
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.checkout(
+            partial(super().get_new_connection, conn_params)
+        )
+        self.isolation_level = self.settings_dict["OPTIONS"].get(
+            "isolation_level", connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.checkin(self.connection)
@@ -0,0 +1,236 @@
+"""
+Bounded per-process pool of DB-API connections.
+
+A pool keeps up to ``size`` idle connections and opens at most
+``max_overflow`` more under load; overflow connections are closed when
+they are returned. A checkout waits up to ``timeout`` seconds for a free
+connection before raising ``PoolTimeout``. Connections older than
+``max_lifetime`` seconds are replaced, and idle connections are pinged
+before they are handed out so a dropped connection never reaches a view.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from django.db import OperationalError
+
+DEFAULT_POOL_OPTIONS = {
+    "SIZE": 5,
+    "MAX_OVERFLOW": 10,
+    "TIMEOUT": 10,
+    "MAX_LIFETIME": 1800,
+    "HEALTH_CHECK": True,
+}
+POOL_EVENTS = (
+    "created",
+    "closed",
+    "checkouts",
+    "waits",
+    "timeouts",
+    "health_check_failures",
+)
+
+
+class PoolTimeout(OperationalError):
+    """No pooled connection became available in time"""
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        size=5,
+        max_overflow=10,
+        timeout=10,
+        max_lifetime=1800,
+        health_check=True,
+    ):
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check = health_check
+        self._idle = deque()
+        self._created_at = {}
+        self._open = 0
+        self._condition = threading.Condition()
+        self.events = dict.fromkeys(POOL_EVENTS, 0)
+
+    def checkout(self, connect):
+        """Return a healthy connection, opening one with ``connect()`` if needed"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            connection = self._reserve(deadline)
+            if connection is None:
+                return self._create(connect)
+            if self.is_usable(connection):
+                return connection
+            self._discard(connection)
+
+    def checkin(self, connection):
+        """Give ``connection`` back, closing it if it cannot be reused"""
+        reusable = not self.is_expired(connection)
+        if reusable:
+            try:
+                self.reset(connection)
+            except Exception:
+                reusable = False
+        with self._condition:
+            if reusable and len(self._idle) < self.size:
+                self._idle.append(connection)
+                self._condition.notify()
+                return
+        self._discard(connection)
+
+    def is_expired(self, connection):
+        if getattr(connection, "closed", False):
+            return True
+        created_at = self._created_at.get(connection, 0)
+        return time.monotonic() - created_at >= self.max_lifetime
+
+    def is_usable(self, connection):
+        if self.is_expired(connection):
+            return False
+        if not self.health_check:
+            return True
+        try:
+            self.ping(connection)
+        except Exception:
+            with self._condition:
+                self.events["health_check_failures"] += 1
+            return False
+        return True
+
+    def ping(self, connection):
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        finally:
+            cursor.close()
+        if not getattr(connection, "autocommit", True):
+            connection.rollback()
+
+    def reset(self, connection):
+        """Drop any transaction left open by the previous user"""
+        connection.rollback()
+
+    def close(self):
+        """Close every idle connection; checked out ones close on return"""
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+            self.size = 0
+        for connection in idle:
+            self._discard(connection)
+
+    def stats(self):
+        with self._condition:
+            idle = len(self._idle)
+            return {
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "open": self._open,
+                "idle": idle,
+                "checked_out": self._open - idle,
+                **self.events,
+            }
+
+    def _reserve(self, deadline):
+        """Pop an idle connection, or reserve a slot to open one (``None``)"""
+        with self._condition:
+            while True:
+                if self._idle:
+                    self.events["checkouts"] += 1
+                    return self._idle.pop()
+                if self._open < self.size + self.max_overflow:
+                    self.events["checkouts"] += 1
+                    self._open += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.events["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No connection available within {self.timeout} seconds "
+                        f"({self._open} open)."
+                    )
+                self.events["waits"] += 1
+                self._condition.wait(remaining)
+
+    def _create(self, connect):
+        try:
+            connection = connect()
+        except BaseException:
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._created_at[connection] = time.monotonic()
+            self.events["created"] += 1
+        return connection
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._created_at.pop(connection, None)
+            self._open -= 1
+            self.events["closed"] += 1
+            self._condition.notify()
+
+
+_pools = {}
+_pools_pid = None
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, key, options):
+    """Return this process's pool for ``(alias, key)``, creating it once
+
+    Pools are dropped after a fork: a child must never share its parent's
+    sockets.
+    """
+    global _pools_pid
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get((alias, key))
+        if pool is None:
+            options = {**DEFAULT_POOL_OPTIONS, **options}
+            pool = _pools[alias, key] = ConnectionPool(
+                size=options["SIZE"],
+                max_overflow=options["MAX_OVERFLOW"],
+                timeout=options["TIMEOUT"],
+                max_lifetime=options["MAX_LIFETIME"],
+                health_check=options["HEALTH_CHECK"],
+            )
+        return pool
+
+
+def close_pools(alias=None):
+    """Close the idle connections of every pool (of ``alias``)"""
+    with _pools_lock:
+        pools = [
+            (key, pool)
+            for key, pool in _pools.items()
+            if alias is None or key[0] == alias
+        ]
+        for key, _ in pools:
+            del _pools[key]
+    for _, pool in pools:
+        pool.close()
+
+
+def pool_stats():
+    """Statistics of this process's pools, summed per database alias"""
+    with _pools_lock:
+        pools = list(_pools.items())
+    stats = {}
+    for (alias, _), pool in pools:
+        totals = stats.setdefault(alias, {})
+        for name, value in pool.stats().items():
+            totals[name] = totals.get(name, 0) + value
+    return stats
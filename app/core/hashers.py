@@ -0,0 +1,176 @@
+import asyncio
+import base64
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    check_password,
+    get_hasher,
+    identify_hasher,
+    is_password_usable,
+)
+from django.utils.crypto import constant_time_compare
+
+# Per server process; multi-process servers multiply it by their workers
+DEFAULT_MAX_WORKERS = 2
+
+
+class HashingExecutorBusy(Exception):
+    """Raised when the hashing executor cannot accept more work"""
+
+
+def _pbkdf2(digest_name, password, salt, iterations):
+    """Derive a base64 encoded PBKDF2 key (runs inside a pool worker)"""
+    key = hashlib.pbkdf2_hmac(digest_name, password.encode(), salt.encode(), iterations)
+    return base64.b64encode(key).decode("ascii").strip()
+
+
+class HashingExecutor:
+    """Bounded process pool for CPU heavy password hashing
+
+    At most ``MAX_WORKERS`` hashes run at once and at most ``MAX_QUEUE``
+    more wait for a worker. Anything beyond that is refused immediately
+    with ``HashingExecutorBusy`` so callers can shed load instead of
+    piling up behind the pool. ``MAX_WORKERS = 0`` hashes inline.
+    """
+
+    def __init__(self, max_workers, max_queue, timeout, start_method="spawn"):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.start_method = start_method
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context(self.start_method),
+                    )
+        return self._pool
+
+    def submit(self, fn, *args):
+        """Queue ``fn`` on the pool or raise if the queue is full"""
+        if not self._slots.acquire(blocking=False):
+            raise HashingExecutorBusy("Password hashing queue is full")
+        try:
+            future = self.pool.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn, *args):
+        """Run ``fn`` on the pool and wait for its result"""
+        if not self.max_workers:
+            return fn(*args)
+        try:
+            return self.submit(fn, *args).result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise HashingExecutorBusy("Password hashing timed out")
+
+    async def arun(self, fn, *args):
+        """Run ``fn`` on the pool without blocking the event loop"""
+        if not self.max_workers:
+            return fn(*args)
+        future = asyncio.wrap_future(self.submit(fn, *args))
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            raise HashingExecutorBusy("Password hashing timed out")
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_hashing_executor():
+    """Return the process wide hashing executor built from settings"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                config = getattr(settings, "PASSWORD_HASHING_EXECUTOR", {})
+                _executor = HashingExecutor(
+                    max_workers=config.get("MAX_WORKERS", DEFAULT_MAX_WORKERS),
+                    max_queue=config.get("MAX_QUEUE", 64),
+                    timeout=config.get("TIMEOUT", 10),
+                    start_method=config.get("START_METHOD", "spawn"),
+                )
+    return _executor
+
+
+class OffloadedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 hasher whose key stretching runs on the hashing executor
+
+    Produces the same ``pbkdf2_sha256`` hashes as Django's default hasher,
+    so existing passwords keep verifying.
+    """
+
+    digest_name = "sha256"
+
+    def _format(self, iterations, salt, hash):
+        return "%s$%d$%s$%s" % (self.algorithm, iterations, salt, hash)
+
+    def encode(self, password, salt, iterations=None):
+        self._check_encode_args(password, salt)
+        iterations = iterations or self.iterations
+        hash = get_hashing_executor().run(
+            _pbkdf2, self.digest_name, password, salt, iterations
+        )
+        return self._format(iterations, salt, hash)
+
+    async def aencode(self, password, salt, iterations=None):
+        self._check_encode_args(password, salt)
+        iterations = iterations or self.iterations
+        hash = await get_hashing_executor().arun(
+            _pbkdf2, self.digest_name, password, salt, iterations
+        )
+        return self._format(iterations, salt, hash)
+
+    async def averify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = await self.aencode(password, decoded["salt"], decoded["iterations"])
+        return constant_time_compare(encoded, encoded_2)
+
+
+async def acheck_password(password, encoded):
+    """Async counterpart of ``django.contrib.auth.hashers.check_password``"""
+    if password is None or not is_password_usable(encoded):
+        return False
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    if isinstance(hasher, OffloadedPBKDF2PasswordHasher):
+        return await hasher.averify(password, encoded)
+    return await sync_to_async(check_password, thread_sensitive=False)(
+        password, encoded
+    )
+
+
+async def ahash_password(password):
+    """Hash ``password`` once with the default hasher and discard the result"""
+    hasher = get_hasher()
+    if isinstance(hasher, OffloadedPBKDF2PasswordHasher):
+        return await hasher.aencode(password, hasher.salt())
+    return await sync_to_async(hasher.encode, thread_sensitive=False)(
+        password, hasher.salt()
+    )
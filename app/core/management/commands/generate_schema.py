@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from core.schema import code_version, render_schema_documents, schema_store
+
+
+class Command(BaseCommand):
+    help = "Write the OpenAPI schema served by /api/schema/ to API_SCHEMA_DIR"
+
+    def handle(self, *args, **options):
+        version = code_version()
+        documents = render_schema_documents()
+        schema_store.write(documents, version)
+        for schema_format, document in documents.items():
+            self.stdout.write(
+                f"{schema_store.path(schema_format)}: {len(document.content)} bytes, "
+                f"{len(document.gzipped)} gzipped"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Schema written for version {version}"))
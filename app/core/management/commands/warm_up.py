@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from core.warmup import PHASES, format_report, warm_up
+
+
+class Command(BaseCommand):
+    help = "Run the warm-up phases and report how long each takes, cold and warm"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--phase",
+            action="append",
+            choices=list(PHASES),
+            help="Only run this phase (repeatable), every phase by default",
+        )
+
+    def handle(self, *args, **options):
+        phases = options["phase"] or tuple(PHASES)
+        self.stdout.write(f"Cold: {format_report(warm_up(phases))}")
+        self.stdout.write(f"Warm: {format_report(warm_up(phases))}")
@@ -0,0 +1,278 @@
+"""
+Per-request timings and per-route histograms.
+
+``ServerTimingMiddleware`` opens a ``RequestTimings`` for every request;
+code that wants a phase measured wraps it in ``timed(name)``. Database
+queries are timed by an execute wrapper installed on every connection.
+The histograms are kept per process and rendered in the Prometheus text
+format by the metrics endpoint.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from core.db.pool import POOL_EVENTS
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """Seconds spent per phase, plus query count, for one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.queries = 0
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_query(self, seconds):
+        self.queries += 1
+        self.add("db", seconds)
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.started
+
+
+@contextmanager
+def request_timings():
+    """Collect timings for the current request (or task) into a new object"""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def current_timings():
+    return _current.get()
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to ``phase`` of the current request"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+class TimedRepresentationMixin:
+    """Count a serializer's ``to_representation`` as serialization time"""
+
+    def to_representation(self, instance):
+        with timed("serialize"):
+            return super().to_representation(instance)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper timing every query of the current request"""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add_query(time.perf_counter() - started)
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = (
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in labels
+    )
+    return "{%s}" % ",".join(pairs)
+
+
+class Counter:
+    metric_type = "counter"
+
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for labelvalues, value in values:
+            yield self.name, tuple(zip(self.labelnames, labelvalues)), value
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    metric_type = "gauge"
+
+    def set(self, value, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = value
+
+
+class Histogram(Counter):
+    metric_type = "histogram"
+
+    def __init__(self, name, documentation, labelnames, buckets):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float("inf"),)
+
+    def observe(self, value, *labelvalues):
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                state = self._values[labelvalues] = [[0] * len(self.buckets), 0, 0]
+            counts = state[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self._lock:
+            values = sorted(
+                (labelvalues, (list(counts), total, count))
+                for labelvalues, (counts, total, count) in self._values.items()
+            )
+        for labelvalues, (counts, total, count) in values:
+            labels = tuple(zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = labels + (("le", _format_value(bound)),)
+                yield f"{self.name}_bucket", bucket_labels, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class RequestMetrics:
+    """Per-route request histograms of one process"""
+
+    labelnames = ("route", "method")
+
+    def __init__(self):
+        self.requests = Counter(
+            "http_requests_total",
+            "Requests by route, method and status.",
+            self.labelnames + ("status",),
+        )
+        self.duration = self._histogram(
+            "http_request_duration_seconds", "Request latency.", DURATION_BUCKETS
+        )
+        self.phases = {
+            phase: self._histogram(
+                f"http_request_{phase}_seconds", documentation, DURATION_BUCKETS
+            )
+            for phase, documentation in (
+                ("db", "Time spent in database queries."),
+                ("auth", "Time spent authenticating."),
+                ("serialize", "Time spent serializing response data."),
+                ("render", "Time spent rendering the response body."),
+            )
+        }
+        self.queries = self._histogram(
+            "http_request_db_queries", "Database queries per request.", QUERY_BUCKETS
+        )
+        self.size = self._histogram(
+            "http_response_size_bytes", "Response body size.", SIZE_BUCKETS
+        )
+
+    def _histogram(self, name, documentation, buckets):
+        return Histogram(name, documentation, self.labelnames, buckets)
+
+    def observe(self, route, method, status, timings, total, size):
+        self.requests.inc(route, method, str(status))
+        self.duration.observe(total, route, method)
+        for phase, histogram in self.phases.items():
+            histogram.observe(timings.phases.get(phase, 0.0), route, method)
+        self.queries.observe(timings.queries, route, method)
+        if size is not None:
+            self.size.observe(size, route, method)
+
+    def collectors(self):
+        return [
+            self.requests,
+            self.duration,
+            *self.phases.values(),
+            self.queries,
+            self.size,
+        ]
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format"""
+        lines = []
+        for collector in self.collectors():
+            lines.extend(collector.render())
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def render_pool_metrics(stats):
+    """Render ``core.db.pool.pool_stats()`` in the Prometheus text format"""
+    connections = Gauge(
+        "db_pool_connections", "Pooled connections by state.", ("alias", "state")
+    )
+    events = Counter(
+        "db_pool_events_total", "Connection pool events.", ("alias", "event")
+    )
+    for alias, values in stats.items():
+        for state in ("idle", "checked_out"):
+            connections.set(values[state], alias, state)
+        for event in POOL_EVENTS:
+            events.inc(alias, event, amount=values[event])
+    return "\n".join(connections.render() + events.render()) + "\n"
+
+
+def render_concurrency_metrics(stats):
+    """Render ``ConcurrencyLimits.stats()`` in the Prometheus text format"""
+    labels = ("route_class",)
+    limit = Gauge("concurrency_limit", "Adaptive concurrency limit.", labels)
+    in_flight = Gauge("concurrency_in_flight", "Requests in flight.", labels)
+    shed = Counter("concurrency_shed_total", "Requests shed with 503.", labels)
+    for route_class, values in stats.items():
+        limit.set(values["limit"], route_class)
+        in_flight.set(values["in_flight"], route_class)
+        shed.inc(route_class, amount=values["shed"])
+    lines = limit.render() + in_flight.render() + shed.render()
+    return "\n".join(lines) + "\n"
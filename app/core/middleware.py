@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+from asgiref.sync import markcoroutinefunction
+from core.metrics import current_timings, request_metrics, request_timings
+
+SERVER_TIMING_PHASES = ("db", "auth", "serialize", "render")
+
+
+class ServerTimingMiddleware:
+    """Report where a request spent its time
+
+    Adds a ``Server-Timing`` header (database time and query count,
+    authentication, serialization, rendering, total and response size) and
+    feeds the same numbers into the per-route histograms of
+    ``core.metrics.request_metrics``. Works for sync and async views.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        with request_timings() as timings:
+            response = self.get_response(request)
+        return self.finalize(request, response, timings)
+
+    async def __acall__(self, request):
+        with request_timings() as timings:
+            response = await self.get_response(request)
+        return self.finalize(request, response, timings)
+
+    def process_template_response(self, request, response):
+        """Time the deferred rendering of DRF and template responses"""
+        timings = current_timings()
+        if timings is not None:
+            started = time.perf_counter()
+            response.add_post_render_callback(
+                lambda _: timings.add("render", time.perf_counter() - started)
+            )
+        return response
+
+    def finalize(self, request, response, timings):
+        total = timings.total
+        size = None if response.streaming else len(response.content)
+
+        metrics = [
+            f'db;dur={timings.phases.get("db", 0.0) * 1000:.2f};'
+            f'desc="{timings.queries} queries"'
+        ]
+        metrics.extend(
+            f"{phase};dur={timings.phases[phase] * 1000:.2f}"
+            for phase in SERVER_TIMING_PHASES[1:]
+            if phase in timings.phases
+        )
+        metrics.append(f"total;dur={total * 1000:.2f}")
+        if size is not None:
+            metrics.append(f'size;desc="{size} bytes"')
+        response["Server-Timing"] = ", ".join(metrics)
+
+        match = request.resolver_match
+        route = match.view_name if match else "unmatched"
+        request_metrics.observe(
+            route, request.method, response.status_code, timings, total, size
+        )
+        return response
@@ -0,0 +1,19 @@
+# Generated by Django 4.0.10 on 2026-10-18 08:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_receipe"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="receipe",
+            index=models.Index(
+                fields=["user", "-id"], name="core_receipe_user_id_desc"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+from core.search import install_recipe_search, uninstall_recipe_search
+
+
+def install(apps, schema_editor):
+    install_recipe_search(schema_editor.connection, rebuild=True)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_recipe_search(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_receipe_user_id_desc_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.0.10 on 2026-10-18 08:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_receipe_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="receipe",
+            index=models.Index(
+                fields=["user", "time_minutes", "id"], name="core_receipe_user_time"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="receipe",
+            index=models.Index(
+                fields=["user", "price", "id"], name="core_receipe_user_price"
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# The admin's "^field" search runs UPPER(field::text) LIKE UPPER('term%');
+# text_pattern_ops lets PostgreSQL answer it with an index range scan
+PREFIX_INDEXES = (
+    ("core_user_email_prefix", "core_user", "email"),
+    ("core_receipe_title_prefix", "core_receipe", "title"),
+)
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, table, column in PREFIX_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+            f"ON {table} (UPPER({column}::text) text_pattern_ops)"
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in PREFIX_INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("core", "0006_modification_tracking"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
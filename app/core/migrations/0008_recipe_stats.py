@@ -0,0 +1,74 @@
+# Generated by Django 4.0.10 on 2026-10-18 08:49
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill(apps, schema_editor):
+    """Compute the stats of users who already have recipes"""
+    Receipe = apps.get_model("core", "Receipe")
+    RecipeStats = apps.get_model("core", "RecipeStats")
+    using = schema_editor.connection.alias
+    rows = (
+        Receipe.objects.using(using)
+        .order_by()
+        .values("user_id")
+        .annotate(
+            count=models.Count("id"),
+            price_total=models.Sum("price"),
+            time_minutes_total=models.Sum("time_minutes"),
+        )
+        .values_list("user_id", "count", "price_total", "time_minutes_total")
+    )
+    batch = []
+    for user_id, count, price_total, time_minutes_total in rows.iterator():
+        batch.append(
+            RecipeStats(
+                user_id=user_id,
+                recipe_count=count,
+                price_total=price_total,
+                time_minutes_total=time_minutes_total,
+            )
+        )
+        if len(batch) == BACKFILL_BATCH_SIZE:
+            RecipeStats.objects.using(using).bulk_create(batch)
+            batch = []
+    RecipeStats.objects.using(using).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_admin_prefix_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="recipe_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("recipe_count", models.PositiveBigIntegerField(default=0)),
+                (
+                    "price_total",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=20
+                    ),
+                ),
+                ("time_minutes_total", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db import migrations
+from core.partitioning import TABLE, RecipePartitioner
+
+# Larger tables are converted online with `manage.py partition_recipes`
+INLINE_MAX_ROWS = 100000
+
+
+def partition(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    partitioner = RecipePartitioner(connection, settings.RECIPE_PARTITIONS)
+    if partitioner.is_partitioned():
+        return
+    (too_large,) = partitioner.execute(
+        f"SELECT EXISTS (SELECT 1 FROM {TABLE} OFFSET %s)", [INLINE_MAX_ROWS]
+    )[0]
+    if too_large:
+        raise RuntimeError(
+            f"{TABLE} has more than {INLINE_MAX_ROWS} rows; partition it online "
+            "with `manage.py partition_recipes --swap --drop-old` before migrating"
+        )
+    partitioner.run(swap=True, drop_old=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_recipe_stats"),
+    ]
+
+    operations = [
+        # The partitioned table serves the same model, so there is no need
+        # to undo the partitioning when migrating backwards
+        migrations.RunPython(partition, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,9 @@
-from django.db import models
+from decimal import Decimal
+
+from django.db import models, router, transaction
+from django.db.models import F
 from django.conf import settings
+from django.utils import timezone
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -31,6 +35,15 @@ class UserManager(BaseUserManager):
 
         return user
 
+    def bump_recipes_version(self, *user_ids):
+        """
+        Record that the recipes of the given users changed
+        """
+        self.filter(pk__in=user_ids).update(
+            recipes_version=F("recipes_version") + 1,
+            recipes_modified_at=timezone.now(),
+        )
+
 
 class User(AbstractBaseUser, PermissionsMixin):
     """User in the system"""
@@ -39,6 +52,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     name = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    recipes_version = models.PositiveBigIntegerField(default=0)
+    recipes_modified_at = models.DateTimeField(null=True, blank=True)
 
     USERNAME_FIELD = "email"
 
@@ -56,6 +72,86 @@ class Receipe(models.Model):
     time_minutes = models.IntegerField()
     price = models.DecimalField(max_digits=5, decimal_places=2)
     link = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-id"], name="core_receipe_user_id_desc"),
+            models.Index(
+                fields=["user", "time_minutes", "id"], name="core_receipe_user_time"
+            ),
+            models.Index(
+                fields=["user", "price", "id"], name="core_receipe_user_price"
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+    def remember_stats_values(self):
+        """Keep the values counted in the owner's ``RecipeStats``"""
+        loaded = all(name in self.__dict__ for name in RecipeStats.SOURCE_FIELDS)
+        self._stats_values = self.stats_values() if loaded else None
+
+    def lock_stats_values(self, using):
+        """Lock the stored row and keep the values counted from it
+
+        Called in the transaction of a write, so a concurrent write of the
+        same recipe waits instead of changing them under this one's delta.
+        """
+        self._stats_values = (
+            Receipe.objects.using(using)
+            .select_for_update()
+            .filter(pk=self.pk)
+            .values_list(*RecipeStats.SOURCE_FIELDS)
+            .first()
+        )
+
+    def stats_values(self):
+        price = self._meta.get_field("price").to_python(self.price)
+        return self.user_id, price, int(self.time_minutes)
+
+    def save(self, *args, **kwargs):
+        # Keep the RecipeStats update (post_save) in the same transaction;
+        # deletes already send post_delete inside theirs
+        using = kwargs.get("using") or router.db_for_write(Receipe, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            if not self._state.adding:
+                self.lock_stats_values(using)
+            super().save(*args, **kwargs)
+
+    def delete(self, using=None, keep_parents=False):
+        using = using or router.db_for_write(Receipe, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            self.lock_stats_values(using)
+            return super().delete(using=using, keep_parents=keep_parents)
+
+
+class RecipeStats(models.Model):
+    """Running totals of a user's recipes, kept up to date on every write"""
+
+    SOURCE_FIELDS = ("user_id", "price", "time_minutes")
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="recipe_stats",
+    )
+    recipe_count = models.PositiveBigIntegerField(default=0)
+    price_total = models.DecimalField(
+        max_digits=20, decimal_places=2, default=Decimal("0")
+    )
+    time_minutes_total = models.BigIntegerField(default=0)
+
+    @property
+    def average_price(self):
+        if not self.recipe_count:
+            return None
+        return (self.price_total / self.recipe_count).quantize(Decimal("0.01"))
+
+    @property
+    def average_time_minutes(self):
+        if not self.recipe_count:
+            return None
+        return self.time_minutes_total / self.recipe_count
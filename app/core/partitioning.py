@@ -0,0 +1,237 @@
+"""
+Hash partitioning of ``core_receipe`` by ``user_id`` on PostgreSQL.
+
+Every recipe query is scoped to one owner, so with ``user_id`` as the hash
+key PostgreSQL prunes each of them to a single partition and its indexes.
+The conversion runs online, in three steps:
+
+1. ``prepare`` creates ``core_receipe_partitioned`` with the same columns,
+   indexes and foreign keys, and a trigger that mirrors every write on the
+   old table into it.
+2. ``copy`` fills it in primary key batches, one short transaction each.
+   Rows are locked ``FOR SHARE`` while copied so a concurrent delete either
+   happens first or is mirrored afterwards.
+3. ``swap`` briefly locks the old table, drops the trigger and renames the
+   tables, indexes and constraints, so the ORM keeps working unchanged.
+   The old table loses its foreign keys and is kept, as a backup, until
+   ``drop_old``.
+
+The primary key of a partitioned table has to contain the partition key,
+so it becomes ``(id, user_id)``; ids still come from the one sequence.
+"""
+import time
+
+from django.db import transaction
+from core.models import Receipe
+
+TABLE = Receipe._meta.db_table
+NEW_TABLE = f"{TABLE}_partitioned"
+OLD_TABLE = f"{TABLE}_unpartitioned"
+SYNC_FUNCTION = f"{TABLE}_partition_sync"
+SYNC_TRIGGER = f"{TABLE}_partition_sync"
+NEW_SUFFIX = "_new"
+OLD_SUFFIX = "_old"
+
+
+def partition_name(index):
+    return f"{TABLE}_p{index}"
+
+
+class RecipePartitioner:
+    """Convert ``core_receipe`` into ``partitions`` hash partitions"""
+
+    def __init__(self, connection, partitions, batch_size=10000, sleep=0, log=None):
+        if connection.vendor != "postgresql":
+            raise ValueError("Partitioning needs PostgreSQL")
+        self.connection = connection
+        self.partitions = partitions
+        self.batch_size = batch_size
+        self.sleep = sleep
+        self.log = log or (lambda message: None)
+        self.columns = [field.column for field in Receipe._meta.concrete_fields]
+
+    def execute(self, sql, params=None):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            if cursor.description:
+                return cursor.fetchall()
+
+    def quoted_columns(self, prefix=""):
+        quote = self.connection.ops.quote_name
+        return ", ".join(f"{prefix}{quote(column)}" for column in self.columns)
+
+    def table_exists(self, table):
+        return self.execute("SELECT to_regclass(%s) IS NOT NULL", [table])[0][0]
+
+    def is_partitioned(self):
+        return self.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass(%s))",
+            [TABLE],
+        )[0][0]
+
+    def index_definitions(self, table):
+        """``(name, CREATE INDEX ...)`` of every index but the primary key"""
+        return self.execute(
+            """
+            SELECT index_class.relname, pg_get_indexdef(pg_index.indexrelid)
+            FROM pg_index
+            JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid
+            WHERE pg_index.indrelid = %s::regclass AND NOT pg_index.indisprimary
+            ORDER BY index_class.relname
+            """,
+            [table],
+        )
+
+    def constraint_definitions(self, table, kind):
+        return self.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = %s ORDER BY conname",
+            [table, kind],
+        )
+
+    def atomic(self):
+        return transaction.atomic(using=self.connection.alias)
+
+    def prepare(self):
+        """Create the partitioned copy and start mirroring writes into it"""
+        if self.table_exists(NEW_TABLE):
+            self.log(f"{NEW_TABLE} already exists")
+            return
+        with self.atomic():
+            self._prepare()
+        self.log(f"Created {NEW_TABLE} with {self.partitions} partitions")
+
+    def _prepare(self):
+        self.execute(
+            f"CREATE TABLE {NEW_TABLE} (LIKE {TABLE} INCLUDING DEFAULTS "
+            f"INCLUDING GENERATED INCLUDING CONSTRAINTS) PARTITION BY HASH (user_id)"
+        )
+        for index in range(self.partitions):
+            self.execute(
+                f"CREATE TABLE {partition_name(index)} PARTITION OF {NEW_TABLE} "
+                f"FOR VALUES WITH (MODULUS {self.partitions}, REMAINDER {index})"
+            )
+        self.execute(
+            f"ALTER TABLE {NEW_TABLE} ADD CONSTRAINT {TABLE}_pkey{NEW_SUFFIX} "
+            f"PRIMARY KEY (id, user_id)"
+        )
+        for name, definition in self.constraint_definitions(TABLE, "f"):
+            self.execute(
+                f"ALTER TABLE {NEW_TABLE} ADD CONSTRAINT {name}{NEW_SUFFIX} "
+                f"{definition}"
+            )
+        for name, definition in self.index_definitions(TABLE):
+            # "CREATE [UNIQUE] INDEX [CONCURRENTLY] name ON public.core_receipe
+            # USING btree (...)", rebuilt with a new name and table
+            head, _, rest = definition.partition(" ON ")
+            _, _, method = rest.partition(" USING ")
+            create = head.replace(" CONCURRENTLY", "").rsplit(" ", 1)[0]
+            self.execute(f"{create} {name}{NEW_SUFFIX} ON {NEW_TABLE} USING {method}")
+
+        columns = self.quoted_columns()
+        self.execute(
+            f"""
+            CREATE FUNCTION {SYNC_FUNCTION}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    DELETE FROM {NEW_TABLE}
+                    WHERE id = OLD.id AND user_id = OLD.user_id;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO {NEW_TABLE} ({columns})
+                    VALUES ({self.quoted_columns("NEW.")})
+                    ON CONFLICT (id, user_id) DO NOTHING;
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+        self.execute(
+            f"CREATE TRIGGER {SYNC_TRIGGER} AFTER INSERT OR UPDATE OR DELETE "
+            f"ON {TABLE} FOR EACH ROW EXECUTE FUNCTION {SYNC_FUNCTION}()"
+        )
+
+    def copy(self, start_id=0):
+        """Copy the rows that existed before ``prepare``, batch by batch
+
+        Returns the last copied id; pass it as ``start_id`` to resume.
+        """
+        (max_id,) = self.execute(f"SELECT max(id) FROM {TABLE}")[0]
+        columns = self.quoted_columns()
+        last_id = start_id
+        while max_id is not None and last_id < max_id:
+            upper = min(last_id + self.batch_size, max_id)
+            with self.atomic():
+                self.execute(
+                    f"""
+                    INSERT INTO {NEW_TABLE} ({columns})
+                    SELECT {columns} FROM (
+                        SELECT {columns} FROM {TABLE}
+                        WHERE id > %s AND id <= %s
+                        FOR SHARE
+                    ) batch
+                    ON CONFLICT (id, user_id) DO NOTHING
+                    """,
+                    [last_id, upper],
+                )
+            last_id = upper
+            self.log(f"Copied up to id {last_id} of {max_id}")
+            if self.sleep:
+                time.sleep(self.sleep)
+        return last_id
+
+    def swap(self):
+        """Put the partitioned table in place of the old one"""
+        with self.atomic():
+            self._swap()
+        self.log(f"{TABLE} is now partitioned, the old table is {OLD_TABLE}")
+
+    def _swap(self):
+        self.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+        (sequence,) = self.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])[
+            0
+        ]
+        self.execute(f"DROP TRIGGER {SYNC_TRIGGER} ON {TABLE}")
+        self.execute(f"DROP FUNCTION {SYNC_FUNCTION}()")
+
+        for name, _ in self.index_definitions(TABLE):
+            self.execute(f"ALTER INDEX {name} RENAME TO {name}{OLD_SUFFIX}")
+        for name, _ in self.constraint_definitions(TABLE, "p"):
+            self.execute(
+                f"ALTER TABLE {TABLE} RENAME CONSTRAINT {name} TO {name}{OLD_SUFFIX}"
+            )
+        # The old rows must not block deleting the users they reference
+        for name, _ in self.constraint_definitions(TABLE, "f"):
+            self.execute(f"ALTER TABLE {TABLE} DROP CONSTRAINT {name}")
+        self.execute(f"ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}")
+
+        self.execute(f"ALTER TABLE {NEW_TABLE} RENAME TO {TABLE}")
+        for name, _ in self.index_definitions(TABLE):
+            self.execute(f"ALTER INDEX {name} RENAME TO {name[: -len(NEW_SUFFIX)]}")
+        for kind in ("p", "f"):
+            for name, _ in self.constraint_definitions(TABLE, kind):
+                self.execute(
+                    f"ALTER TABLE {TABLE} RENAME CONSTRAINT {name} "
+                    f"TO {name[: -len(NEW_SUFFIX)]}"
+                )
+        # Dropping the old table must not take the id sequence with it
+        if sequence:
+            self.execute(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id")
+
+    def drop_old(self):
+        self.execute(f"DROP TABLE IF EXISTS {OLD_TABLE}")
+
+    def run(self, start_id=0, swap=True, drop_old=False):
+        """Partition the table, as far as ``swap``/``drop_old`` allow"""
+        if self.is_partitioned():
+            self.log(f"{TABLE} is already partitioned")
+        else:
+            self.prepare()
+            self.copy(start_id)
+            if not swap:
+                return
+            self.swap()
+        if drop_old:
+            self.drop_old()
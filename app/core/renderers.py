@@ -0,0 +1,57 @@
+"""
+Fast drop-in replacements for DRF's ``JSONRenderer``, plus MessagePack.
+
+``ORJSONRenderer`` produces the same bytes as ``JSONRenderer`` with the
+default settings (compact, UTF-8, ``\\u2028``/``\\u2029`` escaped). Types
+orjson does not handle itself, such as ``Decimal``, lazy strings and
+datetimes, go through DRF's own ``JSONEncoder.default``, and anything orjson
+rejects (indented output, integers over 64 bits) is left to DRF.
+``MessagePackRenderer`` encodes the same values, so both formats carry
+identical data, e.g. ``price`` stays the string ``"12.50"``.
+"""
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """Encode the types DRF's ``JSONEncoder`` knows, the way it does"""
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` backed by orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Like JSONRenderer, keep the output valid JavaScript
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Render the JSON data model as MessagePack"""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
@@ -0,0 +1,249 @@
+"""
+Read replica routing with read-your-writes consistency.
+
+``ReplicaRoutingMiddleware`` marks safe requests to views that set
+``replica_reads = True``. While such a request runs, ``ReplicaRouter``
+sends its ORM reads to one healthy replica; every other read, and every
+write, goes to the primary. After a client sends a write, its reads stay
+on the primary for ``PIN_SECONDS`` so replication lag never hides the
+client's own changes. Pins live in the ``PIN_CACHE`` alias, which must be
+shared by every server process: a write and the next read are often
+handled by different workers. Replicas that fail a health check, or lag
+more than ``MAX_LAG_SECONDS`` behind, are skipped until a later check
+passes. A request whose replica raises a database error is marked
+unhealthy and run again on the primary.
+"""
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import async_to_sync, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_KEY_PREFIX = "replica-pin"
+DEFAULT_REPLICA_ROUTING = {
+    "PIN_SECONDS": 5,
+    "HEALTH_CHECK_INTERVAL": 5,
+    "MAX_LAG_SECONDS": 10,
+    "PIN_CACHE": "default",
+}
+
+POSTGRESQL_LAG = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+_routing = ContextVar("replica_routing", default=None)
+
+
+def get_routing_setting(name):
+    return getattr(settings, "REPLICA_ROUTING", {}).get(
+        name, DEFAULT_REPLICA_ROUTING[name]
+    )
+
+
+class ReplicaHealth:
+    """Remember which replicas are usable, re-checking each periodically"""
+
+    def __init__(self):
+        self._checked = {}
+        self._lock = threading.Lock()
+
+    def is_healthy(self, alias):
+        checked_at, healthy = self._checked.get(alias, (None, True))
+        interval = get_routing_setting("HEALTH_CHECK_INTERVAL")
+        if checked_at is not None and time.monotonic() - checked_at < interval:
+            return healthy
+        if not self._lock.acquire(blocking=False):
+            # Another thread is checking; use the last known state meanwhile
+            return healthy
+        try:
+            healthy = self.check(alias)
+            self._checked[alias] = (time.monotonic(), healthy)
+        finally:
+            self._lock.release()
+        return healthy
+
+    def check(self, alias):
+        """Return whether ``alias`` answers and is not lagging too far behind"""
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == "postgresql":
+                    cursor.execute(POSTGRESQL_LAG)
+                    lag = cursor.fetchone()[0] or 0
+                    return lag <= get_routing_setting("MAX_LAG_SECONDS")
+                cursor.execute("SELECT 1")
+                return True
+        except DatabaseError:
+            connection.close()
+            return False
+
+    def mark_unhealthy(self, alias):
+        """Skip ``alias`` until its next health check"""
+        self._checked[alias] = (time.monotonic(), False)
+
+    def healthy_replicas(self):
+        return [
+            alias
+            for alias in getattr(settings, "DATABASE_REPLICAS", ())
+            if self.is_healthy(alias)
+        ]
+
+    def reset(self):
+        self._checked.clear()
+
+
+replica_health = ReplicaHealth()
+
+
+class RoutingState:
+    """Replica routing decision of one request"""
+
+    def __init__(self):
+        self.use_replica = False
+        self.force_primary = False
+        self.alias = None
+        # (view_func, args, kwargs) of a replica-routed request, for retries
+        self.view = None
+
+    def read_alias(self):
+        if not self.use_replica or self.force_primary:
+            return None
+        if self.alias is None:
+            # Stick to one replica per request so its reads are consistent
+            replicas = replica_health.healthy_replicas()
+            self.alias = random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+        return self.alias
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary inside the block, even on a replica request"""
+    state = _routing.get()
+    if state is None:
+        yield
+        return
+    previous, state.force_primary = state.force_primary, True
+    try:
+        yield
+    finally:
+        state.force_primary = previous
+
+
+class ReplicaRouter:
+    """Send reads of replica-routed requests to a replica"""
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        return state.read_alias() if state is not None else None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """Route safe requests to replicas, pinning writers to the primary
+
+    Clients are identified by their ``Authorization`` header or session
+    cookie, so a pin applies before authentication has run.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = _routing.set(RoutingState())
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        self.pin_writer(request)
+        return response
+
+    async def __acall__(self, request):
+        token = _routing.set(RoutingState())
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        # The pin cache may be a database table
+        await sync_to_async(self.pin_writer)(request)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _routing.get()
+        view_class = getattr(view_func, "cls", None) or getattr(
+            view_func, "view_class", None
+        )
+        if (
+            state is not None
+            and request.method in SAFE_METHODS
+            and getattr(view_class, "replica_reads", False)
+            and not self.is_pinned(request)
+        ):
+            state.use_replica = True
+            state.view = (view_func, view_args, view_kwargs)
+
+    def process_exception(self, request, exception):
+        """Run a request again on the primary when its replica failed"""
+        state = _routing.get()
+        if (
+            state is None
+            or state.view is None
+            or state.alias in (None, DEFAULT_DB_ALIAS)
+            or not isinstance(exception, DatabaseError)
+        ):
+            return None
+        replica_health.mark_unhealthy(state.alias)
+        view_func, view_args, view_kwargs = state.view
+        state.view = None
+        with use_primary():
+            if asyncio.iscoroutinefunction(view_func):
+                # Django calls this hook from a thread on the async path
+                return async_to_sync(view_func)(request, *view_args, **view_kwargs)
+            return view_func(request, *view_args, **view_kwargs)
+
+    def get_pin_key(self, request):
+        credentials = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(
+            settings.SESSION_COOKIE_NAME
+        )
+        if not credentials:
+            return None
+        digest = hashlib.sha256(credentials.encode()).hexdigest()
+        return f"{PIN_KEY_PREFIX}:{digest}"
+
+    def get_pin_cache(self):
+        return caches[get_routing_setting("PIN_CACHE")]
+
+    def is_pinned(self, request):
+        key = self.get_pin_key(request)
+        return key is not None and self.get_pin_cache().get(key) is not None
+
+    def pin_writer(self, request):
+        if request.method in SAFE_METHODS:
+            return
+        key = self.get_pin_key(request)
+        if key is not None:
+            self.get_pin_cache().set(key, 1, get_routing_setting("PIN_SECONDS"))
@@ -0,0 +1,150 @@
+"""
+Precomputed OpenAPI schema.
+
+Generating the schema introspects every view and serializer, so it is
+done once per code version instead of per request: ``generate_schema``
+renders the YAML and JSON documents (plus gzipped copies) into
+``API_SCHEMA_DIR``, and ``schema_store`` loads them into memory on first
+use. The files are stamped with the code version (``CODE_VERSION``, or a
+hash of the project's source files); when it no longer matches the
+running code they are regenerated once and rewritten.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import django
+import drf_spectacular
+import rest_framework
+from django.conf import settings
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+SCHEMA_RENDERERS = (OpenApiYamlRenderer, OpenApiJsonRenderer)
+SCHEMA_NAME = "openapi"
+META_FILE = f"{SCHEMA_NAME}.meta.json"
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """Identify the running code: ``CODE_VERSION`` or a hash of its sources"""
+    version = getattr(settings, "CODE_VERSION", None)
+    if version:
+        return version
+    digest = hashlib.sha256()
+    for package in (django, rest_framework, drf_spectacular):
+        digest.update(f"{package.__name__}={package.__version__};".encode())
+    base_dir = Path(settings.BASE_DIR)
+    for path in sorted(base_dir.rglob("*.py")):
+        relative = path.relative_to(base_dir)
+        if "tests" in relative.parts or "benchmarks" in relative.parts:
+            continue
+        digest.update(str(relative).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class SchemaDocument:
+    content: bytes
+    gzipped: bytes
+    digest: str
+    generated_at: float
+
+    @classmethod
+    def build(cls, content, generated_at, gzipped=None):
+        return cls(
+            content=content,
+            gzipped=gzipped or gzip.compress(content, mtime=0),
+            digest=hashlib.sha256(content).hexdigest(),
+            generated_at=generated_at,
+        )
+
+
+def render_schema_documents():
+    """Generate the schema and render it in every served format"""
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    generated_at = time.time()
+    return {
+        renderer.format: SchemaDocument.build(renderer().render(schema), generated_at)
+        for renderer in SCHEMA_RENDERERS
+    }
+
+
+def _write_atomic(path, content):
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+class SchemaStore:
+    """The schema documents of the running code version, kept in memory"""
+
+    def __init__(self):
+        self._documents = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self):
+        return Path(settings.API_SCHEMA_DIR)
+
+    def get(self, schema_format):
+        version = code_version()
+        if self._version != version:
+            with self._lock:
+                if self._version != version:
+                    self._documents = self.load(version) or self.generate(version)
+                    self._version = version
+        return self._documents[schema_format]
+
+    def load(self, version):
+        """Read documents written for ``version``, or ``None``"""
+        try:
+            meta = json.loads((self.directory / META_FILE).read_text())
+            if meta["version"] != version:
+                return None
+            return {
+                renderer.format: SchemaDocument.build(
+                    self.path(renderer.format).read_bytes(),
+                    meta["generated_at"],
+                    gzipped=self.path(renderer.format, ".gz").read_bytes(),
+                )
+                for renderer in SCHEMA_RENDERERS
+            }
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def generate(self, version):
+        documents = render_schema_documents()
+        try:
+            self.write(documents, version)
+        except OSError:
+            # A read-only deployment still serves from memory
+            pass
+        return documents
+
+    def write(self, documents, version):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for schema_format, document in documents.items():
+            _write_atomic(self.path(schema_format), document.content)
+            _write_atomic(self.path(schema_format, ".gz"), document.gzipped)
+        generated_at = next(iter(documents.values())).generated_at
+        meta = {"version": version, "generated_at": generated_at}
+        _write_atomic(self.directory / META_FILE, json.dumps(meta).encode())
+
+    def path(self, schema_format, suffix=""):
+        return self.directory / f"{SCHEMA_NAME}.{schema_format}{suffix}"
+
+    def reset(self):
+        with self._lock:
+            self._documents = self._version = None
+
+
+schema_store = SchemaStore()
@@ -0,0 +1,154 @@
+"""
+Full-text search over recipe titles and descriptions.
+
+PostgreSQL keeps a stored ``tsvector`` column, generated from the title
+(weight A) and description (weight B), behind a GIN index that leads with
+``user_id`` so a search never leaves the tenant. SQLite keeps an FTS5
+external content table in sync through triggers. Neither structure is part
+of the ``Receipe`` model; ``install_recipe_search`` creates them.
+"""
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_CONFIG = "english"
+FTS_TABLE = "core_receipe_fts"
+
+POSTGRESQL_INSTALL = (
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    f"""
+    ALTER TABLE core_receipe ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS core_receipe_search
+    ON core_receipe USING GIN (user_id, search_vector)
+    """,
+)
+POSTGRESQL_UNINSTALL = (
+    "DROP INDEX IF EXISTS core_receipe_search",
+    "ALTER TABLE core_receipe DROP COLUMN IF EXISTS search_vector",
+)
+
+SQLITE_INSTALL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, content='core_receipe', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_receipe_fts_insert
+    AFTER INSERT ON core_receipe BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_receipe_fts_delete
+    AFTER DELETE ON core_receipe BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_receipe_fts_update
+    AFTER UPDATE OF title, description ON core_receipe BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE} (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+SQLITE_REBUILD = f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')"
+SQLITE_UNINSTALL = (
+    "DROP TRIGGER IF EXISTS core_receipe_fts_insert",
+    "DROP TRIGGER IF EXISTS core_receipe_fts_delete",
+    "DROP TRIGGER IF EXISTS core_receipe_fts_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+)
+
+
+def _execute(connection, statements):
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def install_recipe_search(connection, rebuild=False):
+    """Create the search column/table, index and triggers if missing"""
+    if connection.vendor == "postgresql":
+        _execute(connection, POSTGRESQL_INSTALL)
+    elif connection.vendor == "sqlite":
+        _execute(connection, SQLITE_INSTALL)
+        if rebuild:
+            _execute(connection, (SQLITE_REBUILD,))
+
+
+def uninstall_recipe_search(connection):
+    if connection.vendor == "postgresql":
+        _execute(connection, POSTGRESQL_UNINSTALL)
+    elif connection.vendor == "sqlite":
+        _execute(connection, SQLITE_UNINSTALL)
+
+
+def fts5_query(term):
+    """Quote every word so user input cannot use FTS5 query syntax"""
+    words = term.split()
+    return " ".join('"{}"'.format(word.replace('"', '""')) for word in words)
+
+
+def search_recipes(queryset, term):
+    """Filter ``queryset`` to recipes matching ``term``, best match first
+
+    The matches are annotated with a ``rank`` where higher is better.
+    """
+    vendor = connections[queryset.db].vendor
+    table = queryset.model._meta.db_table
+
+    if vendor == "postgresql":
+        tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        return (
+            queryset.filter(
+                RawSQL(
+                    f'"{table}"."search_vector" @@ {tsquery}',
+                    [term],
+                    output_field=BooleanField(),
+                )
+            )
+            .annotate(
+                rank=RawSQL(
+                    f'ts_rank("{table}"."search_vector", {tsquery})',
+                    [term],
+                    output_field=FloatField(),
+                )
+            )
+            .order_by("-rank", "-id")
+        )
+
+    if vendor == "sqlite":
+        match = fts5_query(term)
+        if not match:
+            return queryset.none()
+        return (
+            queryset.filter(
+                id__in=RawSQL(
+                    f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                    [match],
+                )
+            )
+            .annotate(
+                rank=RawSQL(
+                    f"SELECT -bm25({FTS_TABLE}, 2.0, 1.0) FROM {FTS_TABLE} "
+                    f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+                    [match],
+                    output_field=FloatField(),
+                )
+            )
+            .order_by("-rank", "-id")
+        )
+
+    return queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
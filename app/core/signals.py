@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from core.authentication import token_cache
+from core.metrics import record_query
+from core.models import Receipe, RecipeStats
+from core.search import install_recipe_search
+from core.stats import RecipeStatsDelta, get_pending_recipe_stats
+
+_pending_version_bumps = ContextVar("pending_version_bumps", default=None)
+
+
+@contextmanager
+def deferred_recipes_version_bumps():
+    """Bump each affected user's recipes version once, when the block ends
+
+    Yields the set of user ids to bump, so callers that bypass model
+    signals (bulk_create, bulk_update) can add to it.
+    """
+    pending = set()
+    token = _pending_version_bumps.set(pending)
+    try:
+        yield pending
+    finally:
+        _pending_version_bumps.reset(token)
+    if pending:
+        get_user_model().objects.bump_recipes_version(*pending)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Forget a token as soon as it is deleted"""
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_saved_user(sender, instance, **kwargs):
+    """Forget cached tokens of a user whose row changed (e.g. deactivated)"""
+    token_cache.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Receipe)
+@receiver(post_delete, sender=Receipe)
+def bump_recipes_version(sender, instance, **kwargs):
+    """Invalidate validators and caches derived from a user's recipes"""
+    pending = _pending_version_bumps.get()
+    if pending is None:
+        get_user_model().objects.bump_recipes_version(instance.user_id)
+    else:
+        pending.add(instance.user_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def create_recipe_stats(sender, instance, created, raw, using, **kwargs):
+    """Start every new user with an empty ``RecipeStats`` row"""
+    if created and not raw:
+        RecipeStats.objects.using(using).create(user=instance)
+
+
+@receiver(post_save, sender=Receipe)
+@receiver(post_delete, sender=Receipe)
+def update_recipe_stats(sender, instance, using, created=None, **kwargs):
+    """Add the write to the owner's ``RecipeStats`` in its transaction"""
+    pending = get_pending_recipe_stats()
+    delta = RecipeStatsDelta() if pending is None else pending
+    if created is None:
+        delta.deleted(instance)
+    elif created:
+        delta.created(instance)
+    else:
+        delta.updated(instance)
+    if pending is None:
+        delta.apply(using)
+
+
+@receiver(post_migrate)
+def install_search(sender, using, **kwargs):
+    """Make sure databases built without migrations (tests) can search"""
+    connection = connections[using]
+    if sender.name == "core" and Receipe._meta.db_table in (
+        connection.introspection.table_names()
+    ):
+        install_recipe_search(connection)
+
+
+@receiver(connection_created)
+def time_queries(sender, connection, **kwargs):
+    """Time every query on the connection for the current request's metrics"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
@@ -0,0 +1,132 @@
+"""
+Incremental maintenance of ``RecipeStats``.
+
+Every recipe write turns into a delta of the owner's count, price total
+and cooking time total, which is added with a single ``UPDATE`` in the
+transaction of the write. Single saves and deletes go through the model
+signals; bulk paths, which bypass them, record their changes inside
+``deferred_recipe_stats()``. A user without a stats row, or a change whose
+previous values are unknown, is recomputed from the recipe table instead.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, F, Sum
+from core.models import Receipe, RecipeStats
+
+_pending_stats = ContextVar("pending_recipe_stats", default=None)
+
+
+class RecipeStatsDelta:
+    """Changes to the recipe aggregates of some users"""
+
+    def __init__(self):
+        self.deltas = defaultdict(lambda: [0, Decimal("0"), 0])
+        self.recompute = set()
+
+    def _add(self, values, sign):
+        user_id, price, time_minutes = values
+        delta = self.deltas[user_id]
+        delta[0] += sign
+        delta[1] += sign * price
+        delta[2] += sign * time_minutes
+
+    def created(self, recipe):
+        self._add(recipe.stats_values(), 1)
+        recipe.remember_stats_values()
+
+    def updated(self, recipe):
+        previous = getattr(recipe, "_stats_values", None)
+        if previous is None:
+            self.recompute.add(recipe.user_id)
+        else:
+            self._add(previous, -1)
+            self._add(recipe.stats_values(), 1)
+        recipe.remember_stats_values()
+
+    def deleted(self, recipe):
+        previous = getattr(recipe, "_stats_values", None)
+        self._add(previous or recipe.stats_values(), -1)
+
+    def apply(self, using=DEFAULT_DB_ALIAS):
+        """Write the deltas, one ``UPDATE`` per changed user"""
+        stats = RecipeStats.objects.using(using)
+        missing = set()
+        for user_id, (count, price, time_minutes) in self.deltas.items():
+            if user_id in self.recompute or not (count or price or time_minutes):
+                continue
+            updated = stats.filter(user_id=user_id).update(
+                recipe_count=F("recipe_count") + count,
+                price_total=F("price_total") + price,
+                time_minutes_total=F("time_minutes_total") + time_minutes,
+            )
+            # Without a row there is nothing to decrement: the user is being
+            # deleted, or the next write will compute the row
+            if not updated and count >= 0:
+                missing.add(user_id)
+        if self.recompute or missing:
+            recompute_recipe_stats(self.recompute | missing, using=using)
+        self.deltas.clear()
+        self.recompute.clear()
+
+
+def get_pending_recipe_stats():
+    return _pending_stats.get()
+
+
+@contextmanager
+def deferred_recipe_stats(using=DEFAULT_DB_ALIAS):
+    """Apply all recipe stats changes of the block at once, when it ends
+
+    Yields the ``RecipeStatsDelta`` so callers that bypass model signals
+    (bulk_create, bulk_update, COPY) can record their changes. Use it
+    inside the transaction of the writes.
+    """
+    delta = RecipeStatsDelta()
+    token = _pending_stats.set(delta)
+    try:
+        yield delta
+    finally:
+        _pending_stats.reset(token)
+    delta.apply(using)
+
+
+def aggregate_recipe_stats(user_ids=None, using=DEFAULT_DB_ALIAS):
+    """Compute ``{user_id: (count, price_total, time_minutes_total)}``"""
+    recipes = Receipe.objects.using(using)
+    if user_ids is not None:
+        recipes = recipes.filter(user_id__in=user_ids)
+    rows = (
+        recipes.order_by()
+        .values("user_id")
+        .annotate(
+            count=Count("id"),
+            price_total=Sum("price"),
+            time_minutes_total=Sum("time_minutes"),
+        )
+        .values_list("user_id", "count", "price_total", "time_minutes_total")
+    )
+    return {
+        user_id: (count, Decimal(price_total), time_minutes_total)
+        for user_id, count, price_total, time_minutes_total in rows.iterator()
+    }
+
+
+def recompute_recipe_stats(user_ids, using=DEFAULT_DB_ALIAS):
+    """Replace the stats of ``user_ids`` with a fresh aggregate"""
+    totals = aggregate_recipe_stats(user_ids, using=using)
+    for user_id in user_ids:
+        count, price_total, time_minutes_total = totals.get(
+            user_id, (0, Decimal("0"), 0)
+        )
+        RecipeStats.objects.using(using).update_or_create(
+            user_id=user_id,
+            defaults={
+                "recipe_count": count,
+                "price_total": price_total,
+                "time_minutes_total": time_minutes_total,
+            },
+        )
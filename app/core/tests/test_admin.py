@@ -1,5 +1,10 @@
 import pytest
+from unittest.mock import patch
+from django.db import connection
 from django.urls import reverse
+from mixer.backend.django import mixer
+from core.admin import EstimatedCountPaginator, estimate_count
+from core.models import Receipe
 
 
 pytestmark = pytest.mark.django_db
@@ -31,3 +36,97 @@ def test_create_user_page(client, superuser):
     response = client.get(url)
 
     assert response.status_code == 200
+
+
+def test_users_search_by_email_prefix(client, superuser, normal_user):
+    """Test that users are searched by the start of their email"""
+    url = reverse("admin:core_user_changelist")
+    client.force_login(superuser)
+
+    found = client.get(url, {"q": normal_user.email[:4]}).content.decode()
+    missed = client.get(url, {"q": normal_user.email[2:]}).content.decode()
+
+    assert normal_user.email in found
+    assert normal_user.email not in missed
+
+
+def test_recipes_list(client, superuser, normal_user, django_assert_max_num_queries):
+    """Test that the recipe changelist loads owners without extra queries"""
+    mixer.cycle(5).blend(Receipe, user=normal_user)
+    mixer.cycle(5).blend(Receipe, user=superuser)
+    url = reverse("admin:core_receipe_changelist")
+    client.force_login(superuser)
+
+    with django_assert_max_num_queries(6):
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert normal_user.email in response.content.decode()
+
+
+def test_recipes_search_by_title_prefix(client, superuser, normal_user):
+    """Test that recipes are searched by the start of their title"""
+    mixer.blend(Receipe, user=normal_user, title="Banana bread")
+    mixer.blend(Receipe, user=normal_user, title="Sweet banana")
+    url = reverse("admin:core_receipe_changelist")
+    client.force_login(superuser)
+
+    content = client.get(url, {"q": "banana"}).content.decode()
+
+    assert "Banana bread" in content
+    assert "Sweet banana" not in content
+
+
+def test_recipe_user_autocomplete(client, superuser, normal_user):
+    """Test that the recipe owner is picked through autocomplete"""
+    client.force_login(superuser)
+    response = client.get(
+        reverse("admin:autocomplete"),
+        {
+            "app_label": "core",
+            "model_name": "receipe",
+            "field_name": "user",
+            "term": normal_user.email[:4],
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"id": str(normal_user.pk), "text": normal_user.email}
+    ]
+
+
+def test_large_changelist_uses_estimated_count(client, superuser, normal_user):
+    """Test that an unfiltered changelist trusts the planner estimate"""
+    mixer.blend(Receipe, user=normal_user)
+    url = reverse("admin:core_receipe_changelist")
+    client.force_login(superuser)
+
+    with patch("core.admin.estimate_count", return_value=25_000_000):
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.context["cl"].result_count == 25_000_000
+
+
+def test_paginator_counts_small_tables_exactly(normal_user):
+    """Test that estimates below the threshold fall back to COUNT(*)"""
+    mixer.cycle(3).blend(Receipe, user=normal_user)
+    queryset = Receipe.objects.order_by("id")
+
+    with patch("core.admin.estimate_count", return_value=10):
+        assert EstimatedCountPaginator(queryset, 2).count == 3
+    assert estimate_count(queryset.filter(user=normal_user)) is None
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="needs a PostgreSQL database"
+)
+def test_estimate_count_reads_pg_class(normal_user):
+    """Test the pg_class estimate once the table was analyzed"""
+    mixer.cycle(3).blend(Receipe, user=normal_user)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE core_receipe")
+
+    assert estimate_count(Receipe.objects.all()) == 3
+    assert estimate_count(Receipe.objects.filter(title="x")) is None
@@ -0,0 +1,92 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from core.authentication import token_cache
+
+pytestmark = pytest.mark.django_db
+ME_URL = reverse("users:me")
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+@pytest.fixture
+def token_client(normal_user):
+    token = Token.objects.create(user=normal_user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    client.token = token
+    return client
+
+
+def test_cached_token_skips_database(token_client):
+    """Test that a repeated token is resolved without a token query"""
+    assert token_client.get(ME_URL).status_code == status.HTTP_200_OK
+
+    with CaptureQueriesContext(connection) as captured:
+        response = token_client.get(ME_URL)
+
+    assert not any(
+        "authtoken_token" in query["sql"] for query in captured.captured_queries
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert token_cache.stats()["hits"] == 1
+    assert token_cache.stats()["misses"] == 1
+
+
+def test_deleted_token_is_rejected(token_client):
+    """Test that deleting a token invalidates its cache entry"""
+    token_client.get(ME_URL)
+    token_client.token.delete()
+
+    response = token_client.get(ME_URL)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_deactivated_user_is_rejected(token_client, normal_user):
+    """Test that deactivating a user invalidates its cache entries"""
+    token_client.get(ME_URL)
+    normal_user.is_active = False
+    normal_user.save()
+
+    response = token_client.get(ME_URL)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_profile_update_refreshes_cached_user(token_client):
+    """Test that updating the profile is visible on the next request"""
+    token_client.get(ME_URL)
+    token_client.patch(ME_URL, {"name": "New name"})
+
+    response = token_client.get(ME_URL)
+
+    assert response.data["name"] == "New name"
+
+
+def test_cache_evicts_least_recently_used(normal_user, superuser):
+    """Test that the cache stays within its size bound"""
+    with override_settings(TOKEN_AUTH_CACHE={"MAX_SIZE": 1, "TTL": 60}):
+        token_cache.set("first", normal_user, None)
+        token_cache.set("second", superuser, None)
+
+    assert token_cache.get("first") is None
+    assert token_cache.get("second") == (superuser, None)
+
+
+def test_cache_entries_expire(normal_user):
+    """Test that entries are dropped once their TTL has passed"""
+    with override_settings(TOKEN_AUTH_CACHE={"MAX_SIZE": 10, "TTL": 0}):
+        token_cache.set("key", normal_user, None)
+
+    assert token_cache.get("key") is None
@@ -0,0 +1,41 @@
+import threading
+import time
+import pytest
+from core.cache import SingleFlight
+
+
+def test_single_flight_runs_concurrent_calls_once():
+    """Test that concurrent callers for one key share a single call"""
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return "value"
+
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("key", compute)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["value"] * 5
+
+
+def test_single_flight_shares_errors_then_forgets_key():
+    """Test that a failure is raised to callers and not remembered"""
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+
+    assert flight.do("key", lambda: "ok") == "ok"
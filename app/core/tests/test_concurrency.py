@@ -0,0 +1,197 @@
+import hashlib
+import pytest
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from core.concurrency import (
+    AdaptiveLimiter,
+    ConcurrencyLimitMiddleware,
+    concurrency_limits,
+)
+
+RECIPE_URL = reverse("recipes:recipe-list")
+ME_URL = reverse("users:me")
+TOKEN_URL = reverse("users:token")
+METRICS_URL = reverse("metrics")
+
+
+@pytest.fixture(autouse=True)
+def reset_limits():
+    concurrency_limits.reset()
+    yield
+    concurrency_limits.reset()
+
+
+@pytest.fixture
+def limits(settings):
+    def configure(initial, share=1.0):
+        settings.CONCURRENCY_LIMITS = {
+            "MAX_CLIENT_SHARE": share,
+            "RETRY_AFTER": 3,
+            "CLASSES": {"recipe_read": {"INITIAL": initial, "MIN": 1, "MAX": 8}},
+        }
+        concurrency_limits.reset()
+        return concurrency_limits.get("recipe_read")
+
+    return configure
+
+
+@pytest.fixture
+def token_client(normal_user):
+    token = Token.objects.create(user=normal_user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    client.client_key = hashlib.sha256(f"Token {token.key}".encode()).hexdigest()
+    return client
+
+
+def test_limiter_sheds_beyond_limit():
+    """Test that no more than ``limit`` requests are admitted"""
+    limiter = AdaptiveLimiter(2, 1, 10)
+
+    assert limiter.try_acquire("a") and limiter.try_acquire("b")
+    assert not limiter.try_acquire("c")
+    limiter.release("a", 0.01)
+    assert limiter.try_acquire("c")
+    assert limiter.stats() == {"limit": 2, "in_flight": 2, "shed": 1}
+
+
+def test_limiter_caps_each_client():
+    """Test that one client cannot take every slot"""
+    limiter = AdaptiveLimiter(4, 1, 10, max_client_share=0.5)
+
+    assert limiter.try_acquire("heavy") and limiter.try_acquire("heavy")
+    assert not limiter.try_acquire("heavy")
+    assert limiter.try_acquire("light")
+
+
+def test_limiter_grows_while_latency_is_stable():
+    """Test the additive increase under steady latency"""
+    limiter = AdaptiveLimiter(10, 1, 100)
+    for _ in range(50):
+        limiter.in_flight = int(limiter.limit)
+        limiter.update(0.01, False, limiter.in_flight)
+
+    assert limiter.limit > 20
+
+
+def test_limiter_shrinks_when_latency_climbs():
+    """Test the gradient decrease when requests slow down"""
+    limiter = AdaptiveLimiter(50, 2, 100)
+    for _ in range(20):
+        limiter.update(0.01, False, 50)
+    before = limiter.limit
+    for _ in range(20):
+        limiter.update(0.2, False, 50)
+
+    assert limiter.limit < before * 0.6
+    assert limiter.limit >= 2
+
+
+def test_limiter_backs_off_on_errors_and_stays_idle():
+    """Test the multiplicative decrease and that idle traffic never grows it"""
+    limiter = AdaptiveLimiter(10, 4, 100)
+    limiter.update(0.01, False, 1)
+    assert limiter.limit == 10
+
+    for _ in range(20):
+        limiter.update(0.01, True, 10)
+    assert limiter.limit == 4
+
+
+@pytest.mark.django_db
+def test_overloaded_route_class_is_shed(token_client, limits):
+    """Test the 503 + Retry-After answer to a full route class"""
+    limiter = limits(1)
+    limiter.try_acquire("someone else")
+
+    response = token_client.get(RECIPE_URL)
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response["Retry-After"] == "3"
+    assert token_client.get(ME_URL).status_code == status.HTTP_200_OK
+
+    limiter.release("someone else", 0.01)
+    assert token_client.get(RECIPE_URL).status_code == status.HTTP_200_OK
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.django_db
+def test_heavy_client_is_shed_first(token_client, superuser, limits):
+    """Test per-token fairness through the middleware"""
+    limiter = limits(4, share=0.5)
+    limiter.try_acquire(token_client.client_key)
+    limiter.try_acquire(token_client.client_key)
+
+    assert token_client.get(RECIPE_URL).status_code == 503
+
+    client = APIClient()
+    client.force_authenticate(user=superuser)
+    assert client.get(RECIPE_URL).status_code == status.HTTP_200_OK
+
+
+def test_anonymous_client_key(settings):
+    """Test that anonymous clients are told apart only by a trusted header"""
+    middleware = ConcurrencyLimitMiddleware(lambda request: None)
+    request = RequestFactory().post(
+        TOKEN_URL, HTTP_X_FORWARDED_FOR="10.0.0.1, 203.0.113.7"
+    )
+    assert middleware.get_client_key(request) is None
+
+    settings.CONCURRENCY_LIMITS = {"CLIENT_IP_HEADER": "HTTP_X_FORWARDED_FOR"}
+    assert middleware.get_client_key(request) == "203.0.113.7"
+    assert middleware.get_client_key(RequestFactory().post(TOKEN_URL)) is None
+
+
+@pytest.mark.django_db
+def test_logins_behind_proxy_share_the_auth_class(settings, normal_user):
+    """Test that logins from one proxy address are not capped per client"""
+    settings.CONCURRENCY_LIMITS = {
+        "MAX_CLIENT_SHARE": 0.5,
+        "CLASSES": {"auth": {"INITIAL": 2, "MIN": 1, "MAX": 8}},
+    }
+    limiter = concurrency_limits.get("auth")
+    limiter.try_acquire("127.0.0.1")
+
+    data = {"email": normal_user.email, "password": "Password123"}
+    response = APIClient().post(TOKEN_URL, data)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_streamed_response_holds_its_slot(token_client, limits):
+    """Test that a stream counts against the limit until it is sent"""
+    limiter = limits(2)
+    response = token_client.get(RECIPE_URL, {"stream": "ndjson"})
+
+    assert limiter.in_flight == 1
+    b"".join(response.streaming_content)
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.django_db
+def test_closed_stream_releases_its_slot(token_client, limits):
+    """Test that a stream closed before it was sent frees its slot once"""
+    limiter = limits(2)
+    response = token_client.get(RECIPE_URL, {"stream": "ndjson"})
+
+    response.close()
+    response.close()
+
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.django_db
+def test_concurrency_metrics(token_client, superuser):
+    """Test that limits are exported with the other metrics"""
+    token_client.get(RECIPE_URL)
+    client = APIClient()
+    client.force_authenticate(user=superuser)
+
+    body = client.get(METRICS_URL).content.decode()
+
+    assert 'concurrency_limit{route_class="recipe_read"}' in body
+    assert 'concurrency_in_flight{route_class="recipe_read"} 0' in body
@@ -0,0 +1,45 @@
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from core.async_views import AsyncAPIView
+from core.conditional import ConditionalGetMixin
+
+
+class PlainView(ConditionalGetMixin, APIView):
+    authentication_classes = ()
+    permission_classes = ()
+
+    def get(self, request):
+        return Response({"ok": True})
+
+
+class PlainAsyncView(AsyncAPIView):
+    authentication_classes = ()
+    permission_classes = ()
+
+    async def get_conditional_validators(self, request):
+        return None
+
+    async def get(self, request):
+        return Response({"ok": True})
+
+
+def test_view_without_validators_skips_conditional_handling():
+    """Test that a view returning no validators is served unconditionally"""
+    request = APIRequestFactory().get("/", HTTP_IF_NONE_MATCH="*")
+    response = PlainView.as_view()(request)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not response.has_header("ETag")
+
+
+def test_async_view_without_validators_skips_conditional_handling():
+    """Test that an async view returning no validators is served unconditionally"""
+    request = AsyncRequestFactory().get("/", HTTP_IF_NONE_MATCH="*")
+    response = async_to_sync(PlainAsyncView.as_view())(request)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not response.has_header("ETag")
@@ -0,0 +1,44 @@
+import threading
+import time
+import pytest
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from core.hashers import (
+    HashingExecutor,
+    HashingExecutorBusy,
+    OffloadedPBKDF2PasswordHasher,
+)
+
+
+def test_offloaded_hasher_matches_django_pbkdf2():
+    """Test that offloaded hashes are interchangeable with Django's"""
+    offloaded = OffloadedPBKDF2PasswordHasher()
+    encoded = PBKDF2PasswordHasher().encode("Password123", "somesalt", 1000)
+
+    assert offloaded.encode("Password123", "somesalt", 1000) == encoded
+    assert offloaded.verify("Password123", encoded) is True
+    assert offloaded.verify("wrong", encoded) is False
+
+
+def test_executor_rejects_work_beyond_queue_depth():
+    """Test that a full executor sheds work instead of queueing it"""
+    executor = HashingExecutor(max_workers=1, max_queue=0, timeout=5)
+    try:
+        future = executor.submit(time.sleep, 0.5)
+        # Done callbacks run in order, so this one runs after the slot release
+        released = threading.Event()
+        future.add_done_callback(lambda _: released.set())
+        with pytest.raises(HashingExecutorBusy):
+            executor.submit(time.sleep, 0)
+        future.result()
+        assert released.wait(5)
+        executor.submit(time.sleep, 0).result()
+    finally:
+        executor.shutdown()
+
+
+def test_executor_runs_inline_without_workers():
+    """Test that zero workers hashes in the calling process"""
+    executor = HashingExecutor(max_workers=0, max_queue=0, timeout=5)
+
+    assert executor.run(sum, [1, 2]) == 3
+    assert executor._pool is None
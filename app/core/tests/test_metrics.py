@@ -0,0 +1,108 @@
+import re
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from mixer.backend.django import mixer
+from core.metrics import Histogram
+from core.models import Receipe
+
+pytestmark = pytest.mark.django_db
+METRICS_URL = reverse("metrics")
+RECIPE_URL = reverse("recipes:recipe-list")
+ASYNC_RECIPE_URL = reverse("recipes:recipe-async-list")
+
+
+def parse_server_timing(header):
+    """Map metric names to their ``dur``/``desc`` parameters"""
+    metrics = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+@pytest.fixture
+def token_client(normal_user):
+    mixer.cycle(3).blend(Receipe, user=normal_user)
+    token = Token.objects.create(user=normal_user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    client.token = token
+    return client
+
+
+def test_server_timing_header(token_client):
+    """Test that every phase of a recipe list is reported"""
+    response = token_client.get(RECIPE_URL)
+
+    timing = parse_server_timing(response["Server-Timing"])
+    assert set(timing) == {"db", "auth", "serialize", "render", "total", "size"}
+    queries = int(re.match(r'"(\d+) queries"', timing["db"]["desc"]).group(1))
+    assert queries >= 2
+    assert float(timing["total"]["dur"]) >= float(timing["db"]["dur"])
+    assert timing["size"]["desc"] == f'"{len(response.content)} bytes"'
+
+
+def test_server_timing_counts_async_view_queries(token_client):
+    """Test that queries run through sync_to_async are attributed"""
+
+    async def request():
+        return await AsyncClient().get(
+            ASYNC_RECIPE_URL, authorization=f"Token {token_client.token.key}"
+        )
+
+    response = async_to_sync(request)()
+
+    timing = parse_server_timing(response["Server-Timing"])
+    assert timing["db"]["desc"] != '"0 queries"'
+    assert {"auth", "serialize", "render"} <= set(timing)
+
+
+def test_metrics_endpoint_requires_staff(token_client):
+    """Test that only staff users can read the metrics"""
+    assert APIClient().get(METRICS_URL).status_code == status.HTTP_401_UNAUTHORIZED
+    assert token_client.get(METRICS_URL).status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_metrics_endpoint_reports_routes(token_client, superuser):
+    """Test that requests show up in per-route histograms"""
+    token_client.get(RECIPE_URL)
+    client = APIClient()
+    client.force_authenticate(user=superuser)
+
+    response = client.get(METRICS_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = response.content.decode()
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert (
+        'http_request_db_queries_bucket{route="recipes:recipe-list",'
+        'method="GET",le="+Inf"}' in body
+    )
+    assert re.search(
+        r'http_requests_total\{route="recipes:recipe-list",method="GET",'
+        r'status="200"\} [1-9]',
+        body,
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test the Prometheus text rendering of a histogram"""
+    histogram = Histogram("latency", "Latency.", ("route",), (0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, "home")
+
+    assert histogram.render() == [
+        "# HELP latency Latency.",
+        "# TYPE latency histogram",
+        'latency_bucket{route="home",le="0.1"} 1',
+        'latency_bucket{route="home",le="1"} 2',
+        'latency_bucket{route="home",le="+Inf"} 3',
+        'latency_sum{route="home"} 5.55',
+        'latency_count{route="home"} 3',
+    ]
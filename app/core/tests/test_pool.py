@@ -0,0 +1,171 @@
+import threading
+import pytest
+from django.db import connection, connections
+from core.db import pool as pool_module
+from core.db.pool import ConnectionPool, PoolTimeout, pool_stats
+from core.metrics import render_pool_metrics
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql):
+        if self.connection.broken:
+            raise RuntimeError("server closed the connection unexpectedly")
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    autocommit = True
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+def make_pool(**options):
+    return ConnectionPool(**{"size": 2, "max_overflow": 1, "timeout": 0.05, **options})
+
+
+def test_connections_are_reused():
+    """Test that a returned connection is handed out again"""
+    pool = make_pool()
+    first = pool.checkout(FakeConnection)
+    pool.checkin(first)
+
+    assert pool.checkout(FakeConnection) is first
+    assert first.rollbacks == 1
+    assert pool.stats()["created"] == 1
+
+
+def test_overflow_connections_are_closed_on_return():
+    """Test that connections beyond ``size`` do not stay idle"""
+    pool = make_pool()
+    checked_out = [pool.checkout(FakeConnection) for _ in range(3)]
+    assert pool.stats()["checked_out"] == 3
+
+    for conn in checked_out:
+        pool.checkin(conn)
+
+    stats = pool.stats()
+    assert (stats["idle"], stats["open"], stats["closed"]) == (2, 2, 1)
+    assert checked_out[2].closed
+
+
+def test_checkout_times_out_when_exhausted():
+    """Test that a checkout gives up once size and overflow are in use"""
+    pool = make_pool()
+    for _ in range(3):
+        pool.checkout(FakeConnection)
+
+    with pytest.raises(PoolTimeout):
+        pool.checkout(FakeConnection)
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_waiting_checkout_gets_returned_connection():
+    """Test that a waiting checkout is woken by a checkin"""
+    pool = make_pool(size=1, max_overflow=0, timeout=5)
+    conn = pool.checkout(FakeConnection)
+    timer = threading.Timer(0.05, pool.checkin, (conn,))
+    timer.start()
+
+    assert pool.checkout(FakeConnection) is conn
+    timer.join()
+    assert pool.stats()["waits"] >= 1
+
+
+def test_broken_connection_is_replaced_on_checkout():
+    """Test that the health check discards a dropped connection"""
+    pool = make_pool()
+    conn = pool.checkout(FakeConnection)
+    pool.checkin(conn)
+    conn.broken = True
+
+    replacement = pool.checkout(FakeConnection)
+
+    assert replacement is not conn
+    assert conn.closed
+    stats = pool.stats()
+    assert (stats["health_check_failures"], stats["open"]) == (1, 1)
+
+
+def test_connections_are_recycled_after_max_lifetime():
+    """Test that old connections are closed instead of reused"""
+    pool = make_pool(max_lifetime=0)
+    conn = pool.checkout(FakeConnection)
+    pool.checkin(conn)
+
+    assert conn.closed
+    assert pool.checkout(FakeConnection) is not conn
+
+
+def test_failed_connect_frees_its_slot():
+    """Test that a connection error does not leak pool capacity"""
+    pool = make_pool(size=1, max_overflow=0)
+
+    def refuse():
+        raise RuntimeError("connection refused")
+
+    with pytest.raises(RuntimeError):
+        pool.checkout(refuse)
+    assert pool.checkout(FakeConnection)
+
+
+def test_pool_metrics(monkeypatch):
+    """Test that pool statistics are rendered per alias"""
+    monkeypatch.setattr(pool_module, "_pools", {})
+    pool = pool_module.get_pool("default", "key", {"SIZE": 1})
+    pool.checkout(FakeConnection)
+
+    body = render_pool_metrics(pool_stats())
+
+    assert "# TYPE db_pool_connections gauge" in body
+    assert 'db_pool_connections{alias="default",state="checked_out"} 1' in body
+    assert 'db_pool_events_total{alias="default",event="created"} 1' in body
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="needs a PostgreSQL database"
+)
+@pytest.mark.django_db(transaction=True)
+def test_postgresql_backend_reuses_connections():
+    """Test the pooled backend against the test database"""
+    connections.settings["pooled"] = {
+        **connection.settings_dict,
+        "ENGINE": "core.db.backends.postgresql_pool",
+        "POOL": {"SIZE": 1, "MAX_OVERFLOW": 0},
+    }
+    try:
+        pooled = connections["pooled"]
+        pooled.ensure_connection()
+        first = pooled.connection
+        pooled.close()
+        pooled.ensure_connection()
+
+        assert pooled.connection is first
+        with pooled.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            assert cursor.fetchone() == (1,)
+        assert pool_stats()["pooled"]["created"] == 1
+    finally:
+        connections["pooled"].close()
+        pool_module.close_pools("pooled")
+        del connections["pooled"]
+        del connections.settings["pooled"]
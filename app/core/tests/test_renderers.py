@@ -0,0 +1,154 @@
+import datetime
+import io
+import json
+import uuid
+import msgpack
+import pytest
+from decimal import Decimal
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.authtoken.models import Token
+from mixer.backend.django import mixer
+from core.models import Receipe
+from core.parsers import MessagePackParser, ORJSONParser
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+
+RECIPES_URL = reverse("recipes:recipe-list")
+ASYNC_RECIPES_URL = reverse("recipes:recipe-async-list")
+TOKEN_URL = reverse("users:token")
+MSGPACK = "application/msgpack"
+
+SAMPLE = {
+    "price": Decimal("12.50"),
+    "created": datetime.datetime(
+        2022, 7, 5, 6, 9, 1, 123456, tzinfo=datetime.timezone.utc
+    ),
+    "day": datetime.date(2022, 7, 5),
+    "duration": datetime.timedelta(minutes=90),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "label": gettext_lazy("Personal Info"),
+    "errors": [ErrorDetail("This field is required.", code="required")],
+    "text": "café \u2028\u2029 \U0001f373",
+    "counts": {1: "one", 2: "two"},
+    "big": 2**70,
+    "nested": ({"none": None, "flag": True, "ratio": 0.5},),
+}
+
+
+def test_orjson_renderer_matches_json_renderer():
+    """Test that the output is byte for byte DRF's"""
+    for data in (SAMPLE, {k: v for k, v in SAMPLE.items() if k != "big"}, []):
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_orjson_renderer_indents_like_json_renderer():
+    """Test that ``indent`` in the Accept header is honoured"""
+    media_type = "application/json; indent=4"
+    assert ORJSONRenderer().render(SAMPLE, media_type) == JSONRenderer().render(
+        SAMPLE, media_type
+    )
+
+
+def test_msgpack_renderer_carries_the_json_values():
+    """Test that MessagePack decodes to the same values as JSON"""
+    data = {k: v for k, v in SAMPLE.items() if k not in ("big", "counts")}
+
+    decoded = msgpack.unpackb(MessagePackRenderer().render(data))
+
+    assert decoded == json.loads(JSONRenderer().render(data))
+    assert decoded["price"] == 12.5
+
+
+def test_parsers():
+    """Test JSON and MessagePack parsing, including errors"""
+    data = {"title": "Café", "price": "12.50", "tags": [1, 2]}
+
+    assert ORJSONParser().parse(io.BytesIO(json.dumps(data).encode())) == data
+    assert ORJSONParser().parse(
+        io.BytesIO('{"title": "Café"}'.encode("latin-1")),
+        parser_context={"encoding": "latin-1"},
+    ) == {"title": "Café"}
+    assert MessagePackParser().parse(io.BytesIO(msgpack.packb(data))) == data
+
+    with pytest.raises(ParseError, match="JSON parse error"):
+        ORJSONParser().parse(io.BytesIO(b'{"title": NaN}'))
+    with pytest.raises(ParseError, match="MessagePack parse error"):
+        MessagePackParser().parse(io.BytesIO(b"\xc1"))
+
+
+@pytest.fixture
+def token_client(normal_user):
+    token = Token.objects.create(user=normal_user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    client.token = token
+    return client
+
+
+@pytest.mark.django_db
+def test_recipe_list_in_msgpack(token_client, normal_user):
+    """Test that recipes negotiate MessagePack and keep decimal prices"""
+    mixer.blend(Receipe, user=normal_user, price=Decimal("12.50"))
+
+    json_response = token_client.get(RECIPES_URL)
+    response = token_client.get(RECIPES_URL, HTTP_ACCEPT=MSGPACK)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == MSGPACK
+    assert msgpack.unpackb(response.content) == json_response.json()
+    assert msgpack.unpackb(response.content)["results"][0]["price"] == "12.50"
+    assert response["ETag"] != json_response["ETag"]
+
+
+@pytest.mark.django_db
+def test_recipe_create_from_msgpack(token_client, normal_user):
+    """Test that a MessagePack body is parsed like JSON"""
+    body = {"title": "Soup", "time_minutes": 5, "price": "3.25"}
+    body["user"] = normal_user.pk
+
+    response = token_client.generic(
+        "POST", RECIPES_URL, msgpack.packb(body), MSGPACK, HTTP_ACCEPT=MSGPACK
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert msgpack.unpackb(response.content)["price"] == "3.25"
+
+
+@pytest.mark.django_db
+def test_token_view_speaks_msgpack(normal_user):
+    """Test that the token endpoint uses the configured parsers/renderers"""
+    body = msgpack.packb({"email": normal_user.email, "password": "Password123"})
+
+    response = APIClient().generic(
+        "POST", TOKEN_URL, body, MSGPACK, HTTP_ACCEPT=MSGPACK
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "token" in msgpack.unpackb(response.content)
+
+
+@pytest.mark.django_db
+def test_async_view_negotiates_msgpack(token_client, normal_user):
+    """Test content negotiation of the async recipe view"""
+    mixer.blend(Receipe, user=normal_user)
+
+    async def request(accept):
+        return await AsyncClient().get(
+            ASYNC_RECIPES_URL,
+            authorization=f"Token {token_client.token.key}",
+            accept=accept,
+        )
+
+    response = async_to_sync(request)(MSGPACK)
+    assert response["Content-Type"] == MSGPACK
+    assert msgpack.unpackb(response.content) == token_client.get(RECIPES_URL).json()
+
+    response = async_to_sync(request)("text/csv")
+    assert response.status_code == status.HTTP_406_NOT_ACCEPTABLE
@@ -0,0 +1,175 @@
+from decimal import Decimal
+import pytest
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.conf import settings as django_settings
+from django.core.cache import caches
+from django.db import connections
+from django.test import AsyncClient, RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from core.models import Receipe, RecipeStats
+from core.routers import ReplicaHealth, ReplicaRoutingMiddleware, replica_health
+
+pytestmark = pytest.mark.django_db
+REPLICA = "replica"
+RECIPE_URL = reverse("recipes:recipe-list")
+ASYNC_RECIPE_URL = reverse("recipes:recipe-async-list")
+ME_URL = reverse("users:me")
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    """A second SQLite database standing in for a read replica"""
+    connections.settings[REPLICA] = connections.configure_settings(
+        {
+            "default": connections.settings["default"],
+            REPLICA: {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": str(tmp_path / "replica.sqlite3"),
+            },
+        }
+    )[REPLICA]
+    with connections[REPLICA].schema_editor() as editor:
+        for model in (get_user_model(), Token, Receipe, RecipeStats):
+            editor.create_model(model)
+    settings.DATABASE_REPLICAS = [REPLICA]
+    settings.REPLICA_ROUTING = {"PIN_SECONDS": 60, "HEALTH_CHECK_INTERVAL": 60}
+    replica_health.reset()
+    yield REPLICA
+    replica_health.reset()
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+def create_recipe(title, using="default", **kwargs):
+    return Receipe.objects.using(using).create(
+        title=title, time_minutes=5, price=Decimal("1.00"), **kwargs
+    )
+
+
+@pytest.fixture
+def token_client(normal_user, replica):
+    """A client whose user and token exist on both databases"""
+    token = Token.objects.create(user=normal_user)
+    normal_user.save(using=replica, force_insert=True)
+    token.save(using=replica, force_insert=True)
+    create_recipe("Primary recipe", user=normal_user)
+    create_recipe("Replica recipe", using=replica, user_id=normal_user.pk)
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client
+
+
+def list_titles(client):
+    response = client.get(RECIPE_URL)
+    assert response.status_code == status.HTTP_200_OK
+    return [recipe["title"] for recipe in response.data["results"]]
+
+
+def test_safe_requests_read_from_replica(token_client):
+    """Test that recipe reads are served by the replica"""
+    assert list_titles(token_client) == ["Replica recipe"]
+
+
+def test_reads_are_pinned_after_write(token_client, settings):
+    """Test that a client reads its own writes from the primary"""
+    data = {"title": "New", "time_minutes": 5, "price": "1.00"}
+    data["user"] = get_user_model().objects.get().pk
+    response = token_client.post(RECIPE_URL, data)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert list_titles(token_client) == ["New", "Primary recipe"]
+    assert not Receipe.objects.using(REPLICA).filter(title="New").exists()
+
+
+def test_pin_expires(token_client, settings):
+    """Test that reads return to the replica once the pin window passed"""
+    settings.REPLICA_ROUTING = {"PIN_SECONDS": 0}
+    token_client.patch(ME_URL, {"name": "Changed"})
+
+    assert list_titles(token_client) == ["Replica recipe"]
+
+
+def test_pin_is_per_client(token_client, superuser, replica):
+    """Test that another client's write does not pin this client"""
+    client = APIClient()
+    client.force_authenticate(user=superuser)
+    client.post(RECIPE_URL, {"title": "Other", "time_minutes": 1, "price": "1"})
+
+    assert list_titles(token_client) == ["Replica recipe"]
+
+
+def test_pin_is_shared_between_workers(settings):
+    """Test that a pin written through one cache instance is read by another"""
+    alias = django_settings.REPLICA_ROUTING["PIN_CACHE"]
+    settings.REPLICA_ROUTING = {"PIN_SECONDS": 60, "PIN_CACHE": alias}
+    factory = RequestFactory()
+    auth = {"HTTP_AUTHORIZATION": "Token shared"}
+    # Two middleware instances with their own cache connections stand in for
+    # two server processes
+    writer, reader = (ReplicaRoutingMiddleware(lambda request: None) for _ in "ab")
+    writer_cache, reader_cache = caches.create_connection(
+        alias
+    ), caches.create_connection(alias)
+
+    with patch.object(writer, "get_pin_cache", return_value=writer_cache):
+        writer.pin_writer(factory.post("/", **auth))
+    with patch.object(reader, "get_pin_cache", return_value=reader_cache):
+        assert reader.is_pinned(factory.get("/", **auth))
+        assert not reader.is_pinned(factory.get("/", HTTP_AUTHORIZATION="Token other"))
+
+
+def test_unhealthy_replica_falls_back_to_primary(token_client):
+    """Test that reads go to the primary when no replica is healthy"""
+    with patch.object(ReplicaHealth, "check", return_value=False):
+        assert list_titles(token_client) == ["Primary recipe"]
+
+
+@pytest.mark.parametrize("url", [RECIPE_URL, ASYNC_RECIPE_URL])
+def test_failed_replica_read_is_retried_on_primary(token_client, replica, url):
+    """Test that a replica error marks it unhealthy and reads the primary"""
+    with connections[replica].schema_editor() as editor:
+        editor.delete_model(Receipe)
+    token = Token.objects.get()
+
+    async def get():
+        return await AsyncClient().get(url, authorization=f"Token {token.key}")
+
+    response = (
+        async_to_sync(get)() if url == ASYNC_RECIPE_URL else token_client.get(url)
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [recipe["title"] for recipe in response.json()["results"]] == [
+        "Primary recipe"
+    ]
+    assert not replica_health.is_healthy(replica)
+
+
+def test_new_token_is_looked_up_on_primary(normal_user, replica):
+    """Test that a token missing on the replica is retried on the primary"""
+    normal_user.save(using=replica, force_insert=True)
+    token = Token.objects.create(user=normal_user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    response = client.get(ME_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_health_check(replica, tmp_path):
+    """Test that an unreachable database is reported unhealthy"""
+    health = ReplicaHealth()
+    assert health.check(replica) is True
+
+    connections[replica].close()
+    connections.settings[replica]["NAME"] = str(tmp_path / "missing" / "db.sqlite3")
+    connections[replica].settings_dict["NAME"] = connections.settings[replica]["NAME"]
+    assert health.check(replica) is False
@@ -0,0 +1,114 @@
+import gzip
+import json
+import yaml
+import pytest
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from core import schema
+from core.schema import code_version, render_schema_documents, schema_store
+
+pytestmark = pytest.mark.django_db
+SCHEMA_URL = reverse("api-schema")
+OPENAPI_JSON = "application/vnd.oai.openapi+json"
+
+
+@pytest.fixture(autouse=True)
+def schema_dir(settings, tmp_path):
+    settings.API_SCHEMA_DIR = tmp_path / "schema"
+    settings.CODE_VERSION = "test-1"
+    code_version.cache_clear()
+    schema_store.reset()
+    yield settings.API_SCHEMA_DIR
+    code_version.cache_clear()
+    schema_store.reset()
+
+
+@pytest.fixture
+def count_generations():
+    with patch.object(
+        schema, "render_schema_documents", wraps=render_schema_documents
+    ) as render:
+        yield render
+
+
+def test_generate_schema_command(schema_dir):
+    """Test that the command writes every format with its version"""
+    out = StringIO()
+    call_command("generate_schema", stdout=out)
+
+    assert "version test-1" in out.getvalue()
+    for name in ("openapi.yaml", "openapi.yaml.gz", "openapi.json", "openapi.json.gz"):
+        assert (schema_dir / name).exists()
+    assert json.loads((schema_dir / "openapi.meta.json").read_text())["version"] == (
+        "test-1"
+    )
+
+
+def test_schema_served_from_file(count_generations):
+    """Test that a precomputed schema is served without generating it"""
+    call_command("generate_schema", stdout=StringIO())
+    count_generations.reset_mock()
+    schema_store.reset()
+
+    response = APIClient().get(SCHEMA_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("application/vnd.oai.openapi")
+    assert "/api/recipes/recipes/" in yaml.safe_load(response.content)["paths"]
+    assert count_generations.call_count == 0
+
+
+def test_schema_json_matches_live_generation():
+    """Test that the JSON document is the schema drf-spectacular renders"""
+    response = APIClient().get(SCHEMA_URL, HTTP_ACCEPT=OPENAPI_JSON)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith(OPENAPI_JSON)
+    assert json.loads(response.content)["openapi"].startswith("3.")
+    assert json.loads(response.content) == yaml.safe_load(
+        render_schema_documents()["yaml"].content
+    )
+
+
+def test_schema_etag(count_generations):
+    """Test that a repeated request with the ETag gets 304"""
+    client = APIClient()
+    response = client.get(SCHEMA_URL)
+    etag = response["ETag"]
+
+    response = client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert count_generations.call_count == 1
+
+
+def test_schema_gzip():
+    """Test that clients accepting gzip get the compressed document"""
+    client = APIClient()
+    plain = client.get(SCHEMA_URL)
+    response = client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING="br, gzip")
+
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.content) == plain.content
+    assert response["ETag"] != plain["ETag"]
+    assert "Accept-Encoding" in response["Vary"]
+
+
+def test_schema_regenerated_when_code_version_changes(settings, count_generations):
+    """Test that the schema is generated once per code version"""
+    client = APIClient()
+    client.get(SCHEMA_URL)
+    client.get(SCHEMA_URL, HTTP_ACCEPT=OPENAPI_JSON)
+    assert count_generations.call_count == 1
+
+    settings.CODE_VERSION = "test-2"
+    code_version.cache_clear()
+    client.get(SCHEMA_URL)
+
+    assert count_generations.call_count == 2
+    meta = json.loads((settings.API_SCHEMA_DIR / "openapi.meta.json").read_text())
+    assert meta["version"] == "test-2"
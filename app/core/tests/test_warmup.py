@@ -0,0 +1,78 @@
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.urls import clear_url_caches, get_resolver, reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.schema import code_version, schema_store
+from core.warmup import PROCESS_PHASES, WORKER_PHASES, format_report, warm_up
+from recipes.compiled import compile_serializer
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def schema_dir(settings, tmp_path):
+    settings.API_SCHEMA_DIR = tmp_path / "schema"
+    settings.CODE_VERSION = "test"
+    code_version.cache_clear()
+    schema_store.reset()
+    yield
+    code_version.cache_clear()
+    schema_store.reset()
+
+
+def test_warm_up_reports_every_phase():
+    """Test that the report has the duration of each phase"""
+    report = warm_up()
+
+    assert tuple(report) == PROCESS_PHASES
+    assert all(seconds >= 0 for seconds in report.values())
+    assert format_report(report).endswith("ms)")
+
+
+def test_warm_up_populates_lazy_state():
+    """Test that resolvers, compiled serializers and the schema are ready"""
+    clear_url_caches()
+    compile_serializer.cache_clear()
+
+    warm_up()
+
+    assert get_resolver()._populated
+    assert compile_serializer.cache_info().currsize == 2
+    assert schema_store.load(code_version()) is not None
+
+
+def test_first_request_after_warm_up(superuser):
+    """Test that the first request finds the serializers already compiled"""
+    compile_serializer.cache_clear()
+    warm_up()
+    misses = compile_serializer.cache_info().misses
+
+    client = APIClient()
+    client.force_authenticate(user=superuser)
+    response = client.get(reverse("recipes:recipe-list"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert compile_serializer.cache_info().misses == misses
+
+
+def test_warm_up_databases():
+    """Test that the worker phase connects to the database"""
+    connection.close()
+
+    warm_up(WORKER_PHASES)
+
+    assert connection.connection is not None
+
+
+def test_warm_up_command():
+    """Test that the command reports cold and warm timings"""
+    out = StringIO()
+    call_command("warm_up", "--phase", "urls", "--phase", "serializers", stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith("Cold: ")
+    assert lines[1].startswith("Warm: ")
+    assert "serializers" in lines[1] and "schema" not in lines[1]
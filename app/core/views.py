@@ -0,0 +1,73 @@
+import re
+from datetime import datetime, timezone
+
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+from core.authentication import CachedTokenAuthentication
+from core.concurrency import concurrency_limits
+from core.conditional import ConditionalGetMixin
+from core.db.pool import pool_stats
+from core.metrics import (
+    render_concurrency_metrics,
+    render_pool_metrics,
+    request_metrics,
+)
+from core.schema import schema_store
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+class MetricsView(APIView):
+    """Expose this process's request metrics to Prometheus, staff only"""
+
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
+    permission_classes = (IsAdminUser,)
+    schema = None
+
+    def get(self, request):
+        body = (
+            request_metrics.render()
+            + render_pool_metrics(pool_stats())
+            + render_concurrency_metrics(concurrency_limits.stats())
+        )
+        return HttpResponse(body, content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+class CachedSchemaView(ConditionalGetMixin, SpectacularAPIView):
+    """Serve the OpenAPI schema precomputed by ``generate_schema``
+
+    The YAML or JSON document is negotiated as before and served from
+    memory, gzipped when the client accepts it, with an ``ETag``.
+    """
+
+    def get_conditional_validators(self, request):
+        self.document = schema_store.get(request.accepted_renderer.format)
+        self.gzipped = bool(
+            ACCEPTS_GZIP.search(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        )
+        encoding = "gzip" if self.gzipped else "identity"
+        generated_at = datetime.fromtimestamp(
+            self.document.generated_at, tz=timezone.utc
+        )
+        return f"schema:{self.document.digest}:{encoding}", generated_at
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        document = self.document
+        response = HttpResponse(
+            document.gzipped if self.gzipped else document.content,
+            content_type=request.accepted_media_type,
+        )
+        if self.gzipped:
+            response["Content-Encoding"] = "gzip"
+        response[
+            "Content-Disposition"
+        ] = f'inline; filename="{self._get_filename(request, None)}"'
+        patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+        return response
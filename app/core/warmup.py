@@ -0,0 +1,118 @@
+"""
+Process warm-up.
+
+A fresh process pays for lazy initialisation on its first requests: URL
+pattern regexes are compiled and the resolvers populated on first match,
+translation catalogs loaded, serializer field maps built, the OpenAPI
+schema loaded and database connections opened. ``warm_up`` does that
+work up front and reports how long each phase took.
+
+``PROCESS_PHASES`` are safe to run before forking: ``app.wsgi`` and
+``app.asgi`` run them on import, so with ``preload_app`` the gunicorn
+master warms up once and every worker inherits the result.
+``WORKER_PHASES`` open connections and must run in each worker after the
+fork (``post_fork`` in ``gunicorn.conf.py``).
+"""
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.urls import URLResolver, get_resolver
+from django.utils import translation
+from django.utils.module_loading import import_string
+
+SERIALIZERS = (
+    "recipes.serializers.RecipeSerializer",
+    "recipes.serializers.RecipeDetailSerializer",
+    "recipes.serializers.RecipeStatsSerializer",
+    "users.serializers.UserSerializer",
+)
+# Read paths served through recipes.compiled
+COMPILED_SERIALIZERS = (
+    "recipes.serializers.RecipeSerializer",
+    "recipes.serializers.RecipeDetailSerializer",
+)
+
+
+def warm_urls():
+    """Compile every URL pattern and populate the resolvers"""
+
+    def walk(resolver):
+        # Populates the reverse and namespace lookups of this resolver
+        resolver.reverse_dict
+        for pattern in resolver.url_patterns:
+            pattern.pattern.regex
+            if isinstance(pattern, URLResolver):
+                walk(pattern)
+
+    walk(get_resolver())
+
+
+def warm_translations():
+    """Load the catalogs of the default language"""
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext("")
+
+
+def warm_serializers():
+    """Build the field maps of the API serializers"""
+    from recipes.compiled import compile_serializer
+
+    for path in SERIALIZERS:
+        import_string(path)().fields
+    for path in COMPILED_SERIALIZERS:
+        # Same arguments as SparseFieldsetMixin, so the lru_cache key matches
+        compile_serializer(import_string(path), None)
+
+
+def warm_schema():
+    """Load (or generate) the precomputed OpenAPI schema"""
+    from core.schema import SCHEMA_RENDERERS, schema_store
+
+    for renderer in SCHEMA_RENDERERS:
+        schema_store.get(renderer.format)
+
+
+def warm_databases():
+    """Connect to every database
+
+    Pooled connections (``core.db.backends.postgresql_pool``) go back to
+    the pool right away so any thread of the worker can use them.
+    Unreachable databases are skipped; requests will retry them.
+    """
+    for connection in connections.all():
+        try:
+            connection.ensure_connection()
+        except DatabaseError:
+            continue
+        if getattr(connection, "pool", None) is not None:
+            connection.close()
+
+
+PHASES = {
+    "urls": warm_urls,
+    "translations": warm_translations,
+    "serializers": warm_serializers,
+    "schema": warm_schema,
+    "databases": warm_databases,
+}
+PROCESS_PHASES = ("urls", "translations", "serializers", "schema")
+WORKER_PHASES = ("databases",)
+
+
+def warm_up(phases=PROCESS_PHASES):
+    """Run ``phases``, return the seconds each took"""
+    report = {}
+    for name in phases:
+        started = time.perf_counter()
+        PHASES[name]()
+        report[name] = time.perf_counter() - started
+    return report
+
+
+def format_report(report):
+    total = sum(report.values())
+    phases = ", ".join(
+        f"{name} {seconds * 1000:.1f}ms" for name, seconds in report.items()
+    )
+    return f"{total * 1000:.1f}ms ({phases})"
@@ -0,0 +1,61 @@
+"""
+gunicorn settings, read by ``gunicorn app.wsgi`` run from this directory.
+
+The app is preloaded: ``app.wsgi`` is imported, and warms up, once in the
+master before the workers fork, so every worker starts with resolved URLs,
+serializer field maps and the OpenAPI schema in memory. Each worker then
+opens its own database connections before it accepts requests.
+
+``WEB_CONCURRENCY`` sets the number of workers; by default it is
+``GUNICORN_WORKERS_PER_CPU`` (2) times the available CPUs, plus one.
+Workers are threaded, ``GUNICORN_THREADS`` (8) requests each: the
+concurrency limits (``core.concurrency``) count requests in flight per
+process, and a worker serving one request at a time could never shed.
+"""
+import os
+import time
+
+started = time.perf_counter()
+
+
+def available_cpus():
+    # Respects CPU affinity (e.g. taskset or a container's cpuset)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(
+    os.environ.get("WEB_CONCURRENCY")
+    or available_cpus() * int(os.environ.get("GUNICORN_WORKERS_PER_CPU", 2)) + 1
+)
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+preload_app = True
+accesslog = "-"
+
+
+def when_ready(server):
+    from django.db import connections
+    from app.wsgi import warm_up_report
+    from core.db.pool import close_pools
+    from core.warmup import format_report
+
+    # Nothing opened while loading may be shared with the forked workers
+    connections.close_all()
+    close_pools()
+    server.log.info(
+        "Cold start %.1fms, warm-up %s, %d workers",
+        (time.perf_counter() - started) * 1000,
+        format_report(warm_up_report),
+        server.num_workers,
+    )
+
+
+def post_fork(server, worker):
+    from core.warmup import WORKER_PHASES, format_report, warm_up
+
+    server.log.info(
+        "Worker %s ready in %s", worker.pid, format_report(warm_up(WORKER_PHASES))
+    )
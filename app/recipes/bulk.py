@@ -0,0 +1,155 @@
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from core.models import Receipe
+from core.signals import deferred_recipes_version_bumps
+from core.stats import deferred_recipe_stats
+from recipes.serializers import RecipeBulkSerializer
+
+BULK_BATCH_SIZE = 500
+
+
+class RecipeBulkMixin:
+    """List valued create, partial update and delete for recipes
+
+    Every item is validated first and errors are reported per item, in the
+    order they were sent. Nothing is written unless all items are valid,
+    and all writes happen in a single transaction.
+    """
+
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request):
+        """Create, update or delete many recipes at once"""
+        items = request.data
+        if not isinstance(items, list):
+            raise serializers.ValidationError(
+                {"non_field_errors": ["Expected a list of items."]}
+            )
+        max_items = getattr(settings, "RECIPE_BULK_MAX_ITEMS", 1000)
+        if len(items) > max_items:
+            raise serializers.ValidationError(
+                {
+                    "non_field_errors": [
+                        f"Ensure there are no more than {max_items} items."
+                    ]
+                }
+            )
+
+        if request.method == "POST":
+            return self.bulk_create(items)
+        if request.method == "PATCH":
+            return self.bulk_update(items)
+        return self.bulk_destroy(items)
+
+    def bulk_create(self, items):
+        recipes, errors = [], []
+        for item in items:
+            serializer = RecipeBulkSerializer(data=item)
+            if serializer.is_valid():
+                recipes.append(
+                    Receipe(user=self.request.user, **serializer.validated_data)
+                )
+                errors.append({})
+            else:
+                errors.append(serializer.errors)
+        if any(errors):
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic(), deferred_recipes_version_bumps() as bumps:
+            with deferred_recipe_stats() as stats:
+                self.bulk_insert(recipes)
+                for recipe in recipes:
+                    stats.created(recipe)
+            bumps.add(self.request.user.pk)
+        data = RecipeBulkSerializer(recipes, many=True).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def bulk_insert(self, recipes):
+        """``bulk_create`` that sets the ids on every backend
+
+        Backends that cannot return rows from a bulk insert (older SQLite,
+        MySQL) leave ``pk`` unset; the ids are then read back, relying on
+        auto-increment ids following insert order within the transaction.
+        """
+        db = Receipe.objects.db
+        if connections[db].features.can_return_rows_from_bulk_insert:
+            Receipe.objects.bulk_create(recipes, batch_size=BULK_BATCH_SIZE)
+            return
+        last_id = Receipe.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+        Receipe.objects.bulk_create(recipes, batch_size=BULK_BATCH_SIZE)
+        ids = (
+            self.get_queryset()
+            .filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        for recipe, pk in zip(recipes, ids):
+            recipe.pk = pk
+
+    def bulk_update(self, items):
+        # The rows stay locked until the update, so the stats deltas start
+        # from the values they replace
+        with transaction.atomic(), deferred_recipes_version_bumps() as bumps:
+            ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+            existing = (
+                self.get_queryset()
+                .select_for_update()
+                .in_bulk([pk for pk in ids if isinstance(pk, int)])
+            )
+
+            recipes, fields, errors = [], set(), []
+            for pk, item in zip(ids, items):
+                recipe = existing.get(pk) if isinstance(pk, int) else None
+                if recipe is None:
+                    errors.append({"id": ["Not found."]})
+                    continue
+                serializer = RecipeBulkSerializer(recipe, data=item, partial=True)
+                if not serializer.is_valid():
+                    errors.append(serializer.errors)
+                    continue
+                recipe.remember_stats_values()
+                for field, value in serializer.validated_data.items():
+                    setattr(recipe, field, value)
+                    fields.add(field)
+                recipes.append(recipe)
+                errors.append({})
+            if any(errors):
+                return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+            if fields:
+                now = timezone.now()
+                for recipe in recipes:
+                    recipe.updated_at = now
+                fields.add("updated_at")
+                with deferred_recipe_stats() as stats:
+                    Receipe.objects.bulk_update(
+                        recipes, sorted(fields), batch_size=BULK_BATCH_SIZE
+                    )
+                    for recipe in recipes:
+                        stats.updated(recipe)
+                bumps.add(self.request.user.pk)
+        data = RecipeBulkSerializer(recipes, many=True).data
+        return Response(data)
+
+    def bulk_destroy(self, items):
+        queryset = self.get_queryset()
+        valid_ids = [pk for pk in items if isinstance(pk, int)]
+        # Locked, so the deleted recipes are subtracted with their last values
+        with transaction.atomic(), deferred_recipes_version_bumps():
+            existing = set(
+                queryset.filter(id__in=valid_ids)
+                .select_for_update()
+                .values_list("id", flat=True)
+            )
+
+            errors = [{} if pk in existing else {"id": ["Not found."]} for pk in items]
+            if any(errors):
+                return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+            with deferred_recipe_stats():
+                queryset.filter(id__in=existing).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
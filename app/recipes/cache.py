@@ -0,0 +1,63 @@
+import hashlib
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+from core.cache import SingleFlight
+
+response_flight = SingleFlight()
+
+
+class RecipeResponseCacheMixin:
+    """Cache recipe read responses per user, keyed by recipes version
+
+    The user's ``recipes_version`` (bumped on every recipe write) is part
+    of the key, so a write makes every older entry unreachable and stale
+    data is never served; old entries simply age out of the backend.
+    """
+
+    recipes_version = None
+
+    def get_response_cache(self):
+        return caches[getattr(settings, "RECIPE_CACHE_ALIAS", "default")]
+
+    def get_response_cache_key(self, request, *args, **kwargs):
+        params = urlencode(sorted(request.query_params.lists()), doseq=True)
+        variant = hashlib.sha1(
+            f"{request.get_host()}:{request.accepted_media_type}:{params}".encode()
+        ).hexdigest()
+        return ":".join(
+            [
+                "recipes",
+                str(request.user.pk),
+                str(self.recipes_version),
+                self.action,
+                str(kwargs.get(self.lookup_field, "")),
+                variant,
+            ]
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Serve ``handler`` from the cache, computing misses only once"""
+        cache = self.get_response_cache()
+        key = self.get_response_cache_key(request, *args, **kwargs)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = None
+
+        def compute():
+            nonlocal response
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return None
+            cache.set(key, response.data)
+            return response.data
+
+        data = response_flight.do(key, compute)
+        if response is not None:
+            return response
+        if data is None:
+            return handler(request, *args, **kwargs)
+        return Response(data)
@@ -0,0 +1,36 @@
+from rest_framework import serializers
+from recipes.compiled import compile_serializer
+
+FIELDS_PARAM = "fields"
+
+
+class SparseFieldsetMixin:
+    """Let clients pick the response fields with ``?fields=id,title``
+
+    The selection is normalized to the serializer's own field order so
+    equivalent requests share one compiled serializer, and the compiled
+    serializer only selects the columns it renders.
+    """
+
+    fields_query_param = FIELDS_PARAM
+
+    def get_sparse_fields(self, serializer_class):
+        """Return the requested field names, or None for every field"""
+        value = self.request.query_params.get(self.fields_query_param)
+        if not value:
+            return None
+        requested = {name.strip() for name in value.split(",") if name.strip()}
+        available = compile_serializer(serializer_class).names
+        errors = [
+            f"Unknown field: {name}." for name in sorted(requested - set(available))
+        ]
+        if not requested:
+            errors.append("Select at least one field.")
+        if errors:
+            raise serializers.ValidationError({self.fields_query_param: errors})
+        return tuple(name for name in available if name in requested)
+
+    def get_compiled_serializer(self, serializer_class):
+        return compile_serializer(
+            serializer_class, self.get_sparse_fields(serializer_class)
+        )
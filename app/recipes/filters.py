@@ -0,0 +1,85 @@
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+from core.search import search_recipes
+from recipes.serializers import RecipeFilterSerializer
+
+
+class RecipeSearchFilter(BaseFilterBackend):
+    """Full-text search on title and description via ``?search=``"""
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, "").strip()
+        if not term:
+            return queryset
+        return search_recipes(queryset, term)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Words to look for in the title and description",
+                "schema": {"type": "string"},
+            }
+        ]
+
+
+class RecipeRangeFilter(BaseFilterBackend):
+    """Range filters on cooking time and price"""
+
+    lookups = {
+        "min_time_minutes": "time_minutes__gte",
+        "max_time_minutes": "time_minutes__lte",
+        "min_price": "price__gte",
+        "max_price": "price__lte",
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        params = {
+            name: request.query_params[name]
+            for name in self.lookups
+            if request.query_params.get(name, "") != ""
+        }
+        if not params:
+            return queryset
+        serializer = RecipeFilterSerializer(data=params)
+        serializer.is_valid(raise_exception=True)
+        return queryset.filter(
+            **{
+                self.lookups[name]: value
+                for name, value in serializer.validated_data.items()
+            }
+        )
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": name,
+                "required": False,
+                "in": "query",
+                "description": f"Only recipes with {lookup.replace('__', ' ')}",
+                "schema": {"type": "number"},
+            }
+            for name, lookup in self.lookups.items()
+        ]
+
+
+class RecipeOrderingFilter(OrderingFilter):
+    """Whitelisted ``?ordering=`` on a single indexed field
+
+    Ties are broken by ``id`` in the same direction so the order is stable
+    across pages and matches the ``(user, <field>, id)`` indexes.
+    """
+
+    ordering_fields = ("id", "time_minutes", "price")
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        field = ordering[0]
+        if field.lstrip("-") == "id":
+            return (field,)
+        return (field, "-id" if field.startswith("-") else "id")
@@ -0,0 +1,240 @@
+import csv
+import io
+import json
+import os
+import time
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from core.models import Receipe
+from core.signals import deferred_recipes_version_bumps
+from core.stats import deferred_recipe_stats
+
+RECIPE_FIELDS = ("title", "description", "time_minutes", "price", "link")
+OWNER_FIELD = "owner"
+MAX_REPORTED_ERRORS = 20
+COPY_NULL = r"\N"
+
+
+class OwnerCache:
+    """Map owner emails to user ids, resolving unknown emails in batches"""
+
+    def __init__(self):
+        self._ids = {}
+
+    def resolve(self, emails):
+        missing = {email for email in emails if email not in self._ids}
+        if missing:
+            found = dict(
+                get_user_model()
+                .objects.filter(email__in=missing)
+                .values_list("email", "id")
+            )
+            for email in missing:
+                self._ids[email] = found.get(email)
+
+    def get(self, email):
+        return self._ids.get(email)
+
+
+class MalformedRecord:
+    """Stands in for a record that could not be parsed"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def read_jsonl(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            # Decimal keeps 4.99 exact for the price's decimal_places check
+            yield json.loads(line, parse_float=Decimal)
+        except ValueError as exc:
+            yield MalformedRecord(f"invalid JSON: {exc}")
+
+
+def read_csv(stream):
+    yield from csv.DictReader(stream)
+
+
+READERS = {"jsonl": read_jsonl, "csv": read_csv}
+
+
+class Command(BaseCommand):
+    help = "Import recipes from a JSONL or CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSONL or CSV file, one recipe per record")
+        parser.add_argument(
+            "--format", choices=sorted(READERS), help="Defaults to the file extension"
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--method",
+            choices=("auto", "copy", "bulk"),
+            default="auto",
+            help="COPY is used on PostgreSQL and bulk_create elsewhere by default",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help=(
+                "File recording progress so an interrupted import can resume. "
+                "Resuming is at-least-once: a batch committed just before a "
+                "crash, but not yet checkpointed, is imported again"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        reader = READERS[options["format"] or self.detect_format(path)]
+        method = options["method"]
+        if method == "auto":
+            method = "copy" if connection.vendor == "postgresql" else "bulk"
+        if method == "copy" and connection.vendor != "postgresql":
+            raise CommandError("COPY is only available on PostgreSQL")
+        load = self.copy_batch if method == "copy" else self.bulk_batch
+
+        checkpoint = options["checkpoint"]
+        position = self.read_checkpoint(checkpoint, path)
+        owners = OwnerCache()
+        imported = rejected = 0
+        started = time.monotonic()
+
+        with open(path, newline="") as stream:
+            records = enumerate(reader(stream), start=1)
+            for _ in islice(records, position):
+                pass
+            while True:
+                batch = list(islice(records, options["batch_size"]))
+                if not batch:
+                    break
+                recipes, errors = self.build_batch(batch, owners)
+                with transaction.atomic(), deferred_recipes_version_bumps() as bumps:
+                    with deferred_recipe_stats() as stats:
+                        load(recipes)
+                        for recipe in recipes:
+                            stats.created(recipe)
+                    bumps.update(recipe.user_id for recipe in recipes)
+                # A file cannot join the transaction; a crash right here
+                # re-imports this batch on resume
+                position = batch[-1][0]
+                self.write_checkpoint(checkpoint, path, position)
+
+                for line, error in errors:
+                    if rejected < MAX_REPORTED_ERRORS:
+                        self.stderr.write(f"Record {line}: {error}")
+                    rejected += 1
+                imported += len(recipes)
+                self.stdout.write(f"{position} records read, {imported} imported")
+
+        elapsed = time.monotonic() - started
+        rate = imported / elapsed if elapsed else imported
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} recipes ({rejected} rejected) "
+                f"in {elapsed:.1f}s, {rate:.0f} rows/sec"
+            )
+        )
+
+    def detect_format(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        if extension == ".csv":
+            return "csv"
+        raise CommandError("Cannot detect the input format, pass --format")
+
+    def build_batch(self, batch, owners):
+        """Validate records and return unsaved recipes plus rejected records"""
+        owners.resolve(
+            record.get(OWNER_FIELD) for _, record in batch if isinstance(record, dict)
+        )
+        recipes, errors = [], []
+        for line, record in batch:
+            if isinstance(record, MalformedRecord):
+                errors.append((line, record.error))
+                continue
+            if not isinstance(record, dict):
+                errors.append((line, "expected an object"))
+                continue
+            user_id = owners.get(record.get(OWNER_FIELD))
+            if user_id is None:
+                errors.append((line, f"unknown owner {record.get(OWNER_FIELD)!r}"))
+                continue
+            try:
+                values = self.clean_record(record)
+            except ValidationError as exc:
+                errors.append((line, "; ".join(exc.messages)))
+                continue
+            recipes.append(Receipe(user_id=user_id, **values))
+        return recipes, errors
+
+    def clean_record(self, record):
+        """Run the Receipe field validators (max_length, max_digits, ...)"""
+        values, errors = {}, {}
+        for name in RECIPE_FIELDS:
+            field = Receipe._meta.get_field(name)
+            raw = record.get(name)
+            if raw is None and field.blank:
+                raw = ""
+            try:
+                values[name] = field.clean(raw, None)
+            except ValidationError as exc:
+                errors[name] = exc.messages
+        if errors:
+            raise ValidationError(
+                [f"{name}: {' '.join(messages)}" for name, messages in errors.items()]
+            )
+        return values
+
+    def bulk_batch(self, recipes):
+        Receipe.objects.bulk_create(recipes, batch_size=1000)
+
+    def copy_batch(self, recipes):
+        """Stream a batch into PostgreSQL with COPY ... FROM STDIN"""
+        fields = [
+            field for field in Receipe._meta.concrete_fields if not field.primary_key
+        ]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for recipe in recipes:
+            values = (
+                field.get_db_prep_save(field.pre_save(recipe, True), connection)
+                for field in fields
+            )
+            writer.writerow(COPY_NULL if value is None else value for value in values)
+        buffer.seek(0)
+
+        columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+        table = connection.ops.quote_name(Receipe._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table} ({columns}) FROM STDIN "
+                f"WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                buffer,
+            )
+
+    def read_checkpoint(self, checkpoint, path):
+        if not checkpoint or not os.path.exists(checkpoint):
+            return 0
+        with open(checkpoint) as stream:
+            state = json.load(stream)
+        if state.get("path") != os.path.abspath(path):
+            raise CommandError(f"Checkpoint {checkpoint} belongs to another file")
+        self.stdout.write(f"Resuming after record {state['position']}")
+        return state["position"]
+
+    def write_checkpoint(self, checkpoint, path, position):
+        if not checkpoint:
+            return
+        tmp = f"{checkpoint}.tmp"
+        with open(tmp, "w") as stream:
+            json.dump({"path": os.path.abspath(path), "position": position}, stream)
+        os.replace(tmp, checkpoint)
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from core.partitioning import RecipePartitioner
+
+
+class Command(BaseCommand):
+    help = "Hash partition the recipe table by owner on PostgreSQL, online"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--partitions",
+            type=int,
+            default=settings.RECIPE_PARTITIONS,
+            help="Number of hash partitions, defaults to RECIPE_PARTITIONS",
+        )
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument(
+            "--sleep", type=float, default=0, help="Seconds to pause between batches"
+        )
+        parser.add_argument(
+            "--start-id",
+            type=int,
+            default=0,
+            help="Resume copying after this id (printed by an interrupted run)",
+        )
+        parser.add_argument(
+            "--swap",
+            action="store_true",
+            help="Replace the recipe table once the copy is complete",
+        )
+        parser.add_argument(
+            "--drop-old", action="store_true", help="Drop the replaced table"
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        if options["partitions"] < 1:
+            raise CommandError("--partitions must be at least 1")
+        try:
+            partitioner = RecipePartitioner(
+                connections[options["database"]],
+                options["partitions"],
+                batch_size=options["batch_size"],
+                sleep=options["sleep"],
+                log=self.stdout.write,
+            )
+        except ValueError as exc:
+            raise CommandError(exc)
+        partitioner.run(
+            start_id=options["start_id"],
+            swap=options["swap"],
+            drop_old=options["drop_old"],
+        )
+        if not options["swap"] and not partitioner.is_partitioned():
+            self.stdout.write(
+                "Writes are mirrored into the partitioned table; "
+                "run again with --swap to switch over"
+            )
@@ -0,0 +1,66 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from core.models import RecipeStats
+from core.stats import aggregate_recipe_stats
+
+MAX_REPORTED_MISMATCHES = 20
+EMPTY = (0, Decimal("0"), 0)
+
+
+class Command(BaseCommand):
+    help = "Verify the per-user recipe statistics and rebuild the ones that drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report mismatches, exit with an error if there are any",
+        )
+
+    def handle(self, *args, **options):
+        mismatches = self.find_mismatches()
+        for user_id, stored, expected in mismatches[:MAX_REPORTED_MISMATCHES]:
+            self.stderr.write(f"User {user_id}: stored {stored}, expected {expected}")
+
+        if options["check"]:
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} users have wrong statistics")
+            self.stdout.write(self.style.SUCCESS("Recipe statistics are consistent"))
+            return
+
+        with transaction.atomic():
+            for user_id, _, expected in mismatches:
+                count, price_total, time_minutes_total = expected
+                RecipeStats.objects.update_or_create(
+                    user_id=user_id,
+                    defaults={
+                        "recipe_count": count,
+                        "price_total": price_total,
+                        "time_minutes_total": time_minutes_total,
+                    },
+                )
+        remaining = self.find_mismatches()
+        if remaining:
+            raise CommandError(f"{len(remaining)} users still have wrong statistics")
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt the statistics of {len(mismatches)} users")
+        )
+
+    def find_mismatches(self):
+        """Compare stored statistics with a full recompute"""
+        expected = aggregate_recipe_stats()
+        stored = {
+            user_id: (count, price_total, time_minutes_total)
+            for user_id, count, price_total, time_minutes_total in (
+                RecipeStats.objects.values_list(
+                    "user_id", "recipe_count", "price_total", "time_minutes_total"
+                ).iterator()
+            )
+        }
+        return [
+            (user_id, stored.get(user_id, EMPTY), expected.get(user_id, EMPTY))
+            for user_id in sorted(stored.keys() | expected.keys())
+            if stored.get(user_id, EMPTY) != expected.get(user_id, EMPTY)
+        ]
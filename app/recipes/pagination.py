@@ -0,0 +1,130 @@
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import BooleanField, F, Func, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class RowComparison(Func):
+    """``(a, b, ...) > (x, y, ...)``, a row value comparison"""
+
+    conditional = True
+    output_field = BooleanField()
+
+    def __init__(self, fields, values, operator):
+        self.operator = operator
+        super().__init__(*(F(name) for name in fields), *map(Value, values))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        parts, params = [], []
+        for expression in self.source_expressions:
+            sql, expression_params = compiler.compile(expression)
+            parts.append(sql)
+            params.extend(expression_params)
+        half = len(parts) // 2
+        columns, values = ", ".join(parts[:half]), ", ".join(parts[half:])
+        return f"({columns}) {self.operator} ({values})", params
+
+
+class RecipeCursorPagination(CursorPagination):
+    """Keyset pagination for recipe lists
+
+    Pages are addressed by an opaque cursor holding the last seen row's
+    values of the whole ordering, e.g. ``(price, id)``. Orderings end with
+    the unique ``id``, so every page is a bounded range scan on the
+    matching ``(user_id, <field>, id)`` index however many recipes share a
+    price, and no ``COUNT(*)`` is ever issued. Orderings on annotations
+    (the search rank, a float the database may round differently on the
+    way back) keep DRF's position and offset cursor.
+    """
+
+    ordering = ("-id",)
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    keyset = False
+
+    def get_ordering(self, request, queryset, view):
+        """Keep an ordering applied by the view (e.g. search rank)"""
+        if queryset.query.order_by:
+            return tuple(queryset.query.order_by)
+        return super().get_ordering(request, queryset, view)
+
+    def can_use_keyset(self, queryset, ordering):
+        names = [field.lstrip("-") for field in ordering]
+        descending = {field.startswith("-") for field in ordering}
+        return (
+            names[-1] in ("id", "pk")
+            and len(descending) == 1
+            and not any(name in queryset.query.annotations for name in names)
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = self.get_ordering(request, queryset, view)
+        self.keyset = self.can_use_keyset(queryset, ordering)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = ordering
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, position = self.cursor or (0, False, None)
+
+        queryset = queryset.order_by(
+            *(_reverse_ordering(ordering) if reverse else ordering)
+        )
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(queryset, position))
+        end = offset + self.page_size + 1
+        results = list(queryset[offset:end])
+        self.page = results[: self.page_size]
+        following = None
+        if len(results) > len(self.page):
+            following = self._get_position_from_instance(results[-1], ordering)
+        has_position = position is not None or offset > 0
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.next_position = has_position, position
+            self.has_previous, self.previous_position = following is not None, following
+        else:
+            self.has_next, self.next_position = following is not None, following
+            self.has_previous, self.previous_position = has_position, position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_keyset_filter(self, queryset, position):
+        """Rows after ``position`` in the direction the cursor walks"""
+        opts = queryset.model._meta
+        names = [field.lstrip("-") for field in self.ordering]
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(names):
+                raise ValueError
+            values = [
+                (opts.pk if name == "pk" else opts.get_field(name)).to_python(value)
+                for name, value in zip(names, values)
+            ]
+        except (ValueError, TypeError, ValidationError, FieldDoesNotExist):
+            raise NotFound(self.invalid_cursor_message)
+        descending = self.ordering[0].startswith("-") != self.cursor.reverse
+        return RowComparison(names, values, "<" if descending else ">")
+
+    def _get_position_from_instance(self, instance, ordering):
+        if not self.keyset:
+            return super()._get_position_from_instance(instance, ordering)
+        values = []
+        for field in ordering:
+            name = field.lstrip("-")
+            value = (
+                instance[name]
+                if isinstance(instance, dict)
+                else getattr(instance, name)
+            )
+            values.append(str(value))
+        return json.dumps(values, separators=(",", ":"))
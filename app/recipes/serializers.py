@@ -1,8 +1,9 @@
 from rest_framework import serializers
-from core.models import Receipe
+from core.metrics import TimedRepresentationMixin
+from core.models import Receipe, RecipeStats
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     """Serializer for recipe objects"""
 
     class Meta:
@@ -25,3 +26,32 @@ class RecipeDetailSerializer(RecipeSerializer):
     class Meta:
         model = Receipe
         fields = RecipeSerializer.Meta.fields + ("description",)
+
+
+class RecipeBulkSerializer(RecipeSerializer):
+    """Serializer for recipe objects in bulk requests"""
+
+    class Meta(RecipeSerializer.Meta):
+        fields = RecipeSerializer.Meta.fields + ("description",)
+
+
+class RecipeFilterSerializer(serializers.Serializer):
+    """Serializer for recipe list range filters"""
+
+    min_time_minutes = serializers.IntegerField(required=False)
+    max_time_minutes = serializers.IntegerField(required=False)
+    min_price = serializers.DecimalField(max_digits=5, decimal_places=2, required=False)
+    max_price = serializers.DecimalField(max_digits=5, decimal_places=2, required=False)
+
+
+class RecipeStatsSerializer(serializers.ModelSerializer):
+    """Serializer for a user's recipe statistics"""
+
+    average_price = serializers.DecimalField(
+        max_digits=5, decimal_places=2, read_only=True
+    )
+    average_time_minutes = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = RecipeStats
+        fields = ("recipe_count", "average_price", "average_time_minutes")
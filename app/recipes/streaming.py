@@ -0,0 +1,85 @@
+import csv
+import json
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from recipes.compiled import compile_serializer
+
+ITERATOR_CHUNK_SIZE = 2000
+FLUSH_SIZE = 64 * 1024
+
+
+class Echo:
+    """File-like object whose write returns the value, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def render_json(rows, fields):
+    yield "["
+    for i, row in enumerate(rows):
+        yield ("," if i else "") + json.dumps(row, separators=(",", ":"))
+    yield "]"
+
+
+def render_ndjson(rows, fields):
+    for row in rows:
+        yield json.dumps(row, separators=(",", ":")) + "\n"
+
+
+def render_csv(rows, fields):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([row[field] for field in fields])
+
+
+STREAM_FORMATS = {
+    "json": ("application/json", render_json),
+    "ndjson": ("application/x-ndjson", render_ndjson),
+    "csv": ("text/csv", render_csv),
+}
+
+
+def buffered(pieces, size=FLUSH_SIZE):
+    """Join small string pieces into chunks of roughly ``size`` bytes"""
+    buffer, length = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        length += len(piece)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def streaming_response(
+    queryset, serializer_class, stream_format, filename=None, only=None
+):
+    """Serialize ``queryset`` row by row into a streaming response
+
+    Rows are read through a server-side cursor and serialized one at a
+    time, so memory use does not grow with the number of rows.
+    """
+    if stream_format not in STREAM_FORMATS:
+        raise serializers.ValidationError(
+            {"stream": [f"Expected one of: {', '.join(STREAM_FORMATS)}."]}
+        )
+    content_type, render = STREAM_FORMATS[stream_format]
+
+    compiled = compile_serializer(serializer_class, only)
+    fields = compiled.names
+    rows = map(
+        compiled.to_representation,
+        compiled.values(queryset).iterator(chunk_size=ITERATOR_CHUNK_SIZE),
+    )
+
+    response = StreamingHttpResponse(
+        buffered(render(rows, fields)), content_type=content_type
+    )
+    if filename:
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="{filename}.{stream_format}"'
+    return response
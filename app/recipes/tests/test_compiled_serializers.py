@@ -0,0 +1,56 @@
+import random
+from decimal import Decimal
+import pytest
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from core.models import Receipe
+from recipes.compiled import compile_serializer
+from recipes.serializers import RecipeSerializer, RecipeDetailSerializer
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def recipes(normal_user):
+    rng = random.Random(0)
+    titles = ["Soup", "Crème brûlée", 'Quote "this"', "Emoji 🍜", "", "\\n"]
+    return Receipe.objects.bulk_create(
+        Receipe(
+            user=normal_user,
+            title=rng.choice(titles),
+            description=rng.choice(titles),
+            time_minutes=rng.randint(-5, 10**6),
+            price=Decimal(rng.randint(-99999, 99999)) / 100,
+            link=rng.choice(["", "http://example.com/é"]),
+        )
+        for _ in range(200)
+    )
+
+
+@pytest.mark.parametrize("serializer_class", [RecipeSerializer, RecipeDetailSerializer])
+def test_compiled_output_matches_drf(recipes, serializer_class):
+    """Test that compiled and DRF serializers render identical bytes"""
+    queryset = Receipe.objects.order_by("id")
+    compiled = compile_serializer(serializer_class)
+
+    expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+    actual = JSONRenderer().render(compiled.serialize(compiled.values(queryset)))
+
+    assert actual == expected
+
+
+def test_api_responses_match_drf(recipes, normal_user):
+    """Test that list and detail responses are unchanged byte for byte"""
+    client = APIClient()
+    client.force_authenticate(user=normal_user)
+    recipe = Receipe.objects.order_by("-id").first()
+
+    detail = client.get(reverse("recipes:recipe-detail", args=[recipe.id]))
+    listing = client.get(reverse("recipes:recipe-list"), {"page_size": 500})
+
+    assert detail.content == JSONRenderer().render(RecipeDetailSerializer(recipe).data)
+    assert (
+        listing.json()["results"]
+        == RecipeSerializer(Receipe.objects.order_by("-id"), many=True).data
+    )
@@ -0,0 +1,128 @@
+import json
+import pytest
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from core.models import Receipe
+
+pytestmark = pytest.mark.django_db
+
+
+def write_jsonl(path, records):
+    path.write_text("\n".join(json.dumps(record) for record in records))
+    return str(path)
+
+
+def recipe_record(owner, **fields):
+    return {
+        "owner": owner,
+        "title": "Imported",
+        "time_minutes": 20,
+        "price": "4.50",
+        **fields,
+    }
+
+
+def test_import_jsonl(tmp_path, normal_user):
+    """Test importing recipes from a JSONL file"""
+    path = write_jsonl(
+        tmp_path / "recipes.jsonl",
+        [recipe_record(normal_user.email, title=f"Recipe {i}") for i in range(5)],
+    )
+    out = StringIO()
+    call_command("import_recipes", path, batch_size=2, stdout=out)
+
+    assert Receipe.objects.filter(user=normal_user).count() == 5
+    assert Receipe.objects.first().price == Decimal("4.50")
+    assert "rows/sec" in out.getvalue()
+
+
+def test_import_csv(tmp_path, normal_user):
+    """Test importing recipes from a CSV file"""
+    path = tmp_path / "recipes.csv"
+    path.write_text(
+        "owner,title,time_minutes,price,description\n"
+        f'{normal_user.email},Soup,15,3.00,"Hot, tasty"\n'
+    )
+    call_command("import_recipes", str(path), stdout=StringIO())
+
+    recipe = Receipe.objects.get()
+    assert recipe.title == "Soup"
+    assert recipe.description == "Hot, tasty"
+    assert recipe.link == ""
+
+
+def test_import_rejects_invalid_rows(tmp_path, normal_user):
+    """Test that rows violating field constraints are skipped"""
+    path = write_jsonl(
+        tmp_path / "recipes.jsonl",
+        [
+            recipe_record(normal_user.email),
+            recipe_record(normal_user.email, price="1000.00"),
+            recipe_record(normal_user.email, time_minutes="soon"),
+            recipe_record("nobody@example.com"),
+        ],
+    )
+    err = StringIO()
+    call_command("import_recipes", path, stdout=StringIO(), stderr=err)
+
+    assert Receipe.objects.count() == 1
+    assert "Record 2: price" in err.getvalue()
+    assert "Record 3: time_minutes" in err.getvalue()
+    assert "Record 4: unknown owner" in err.getvalue()
+
+
+def test_import_rejects_malformed_json(tmp_path, normal_user):
+    """Test that a broken line is rejected without aborting the import"""
+    path = tmp_path / "recipes.jsonl"
+    path.write_text(
+        "\n".join(
+            [
+                json.dumps(recipe_record(normal_user.email, title="Before")),
+                '{"owner": "broken',
+                json.dumps(recipe_record(normal_user.email, title="After")),
+            ]
+        )
+    )
+    out, err = StringIO(), StringIO()
+    call_command("import_recipes", str(path), batch_size=2, stdout=out, stderr=err)
+
+    assert sorted(Receipe.objects.values_list("title", flat=True)) == [
+        "After",
+        "Before",
+    ]
+    assert "Record 2: invalid JSON" in err.getvalue()
+    assert "(1 rejected)" in out.getvalue()
+
+
+def test_import_numeric_prices_and_blank_lines(tmp_path, normal_user):
+    """Test that JSON number prices import exactly and blank lines are skipped"""
+    owner = normal_user.email
+    path = tmp_path / "recipes.jsonl"
+    path.write_text(
+        f'{{"owner": "{owner}", "title": "A", "time_minutes": 5, "price": 4.99}}\n'
+        "\n"
+        f'{{"owner": "{owner}", "title": "B", "time_minutes": 5, "price": 1.1}}\n'
+    )
+    out, err = StringIO(), StringIO()
+    call_command("import_recipes", str(path), stdout=out, stderr=err)
+
+    assert dict(Receipe.objects.values_list("title", "price")) == {
+        "A": Decimal("4.99"),
+        "B": Decimal("1.10"),
+    }
+    assert err.getvalue() == ""
+    assert "(0 rejected)" in out.getvalue()
+
+
+def test_import_resumes_from_checkpoint(tmp_path, normal_user):
+    """Test that a checkpoint skips records that were already imported"""
+    records = [recipe_record(normal_user.email, title=f"R{i}") for i in range(4)]
+    path = write_jsonl(tmp_path / "recipes.jsonl", records)
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text(json.dumps({"path": path, "position": 3}))
+
+    call_command("import_recipes", path, checkpoint=str(checkpoint), stdout=StringIO())
+
+    assert list(Receipe.objects.values_list("title", flat=True)) == ["R3"]
+    assert json.loads(checkpoint.read_text())["position"] == 4
@@ -0,0 +1,105 @@
+import re
+import pytest
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from mixer.backend.django import mixer
+from core.models import Receipe
+from core.partitioning import NEW_TABLE, OLD_TABLE, RecipePartitioner
+
+postgresql_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="needs a PostgreSQL database"
+)
+
+
+def scanned_partitions(queryset):
+    """Names of the recipe partitions in the query plan"""
+    return set(re.findall(r" on (core_receipe_p\d+)\b", queryset.explain()))
+
+
+def create_recipes(user, count):
+    return [
+        Receipe.objects.create(
+            user=user, title=f"Recipe {i}", time_minutes=i, price=Decimal("1.00")
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor == "postgresql", reason="PostgreSQL works")
+def test_command_requires_postgresql():
+    """Test that other databases are refused"""
+    with pytest.raises(CommandError, match="PostgreSQL"):
+        call_command("partition_recipes", stdout=StringIO())
+
+
+@postgresql_only
+@pytest.mark.django_db(transaction=True)
+def test_online_partitioning(normal_user, superuser):
+    """Test copying, mirroring writes, swapping and partition pruning"""
+    kept, updated, deleted = create_recipes(normal_user, 3)
+    partitioner = RecipePartitioner(connection, partitions=4, batch_size=1)
+
+    partitioner.prepare()
+    # Writes during the copy are mirrored into the new table
+    create_recipes(superuser, 2)
+    updated.title = "Updated"
+    updated.save()
+    deleted.delete()
+    partitioner.copy()
+    partitioner.swap()
+    partitioner.drop_old()
+
+    assert partitioner.is_partitioned()
+    assert not partitioner.table_exists(NEW_TABLE)
+    assert not partitioner.table_exists(OLD_TABLE)
+    assert sorted(Receipe.objects.values_list("title", flat=True)) == [
+        "Recipe 0",
+        "Recipe 0",
+        "Recipe 1",
+        "Updated",
+    ]
+    assert Receipe.objects.get(pk=kept.pk).user == normal_user
+
+    # The ORM keeps working, and new ids continue the old sequence
+    recipe = create_recipes(normal_user, 1)[0]
+    assert recipe.pk > deleted.pk
+    recipe.user = superuser
+    recipe.save()
+    assert Receipe.objects.filter(user=superuser).count() == 3
+
+    assert len(scanned_partitions(Receipe.objects.filter(user=normal_user))) == 1
+    assert len(scanned_partitions(Receipe.objects.all())) == 4
+
+
+@postgresql_only
+@pytest.mark.django_db(transaction=True)
+def test_partition_command_resumes_and_swaps(normal_user):
+    """Test the command copying in several runs before the swap"""
+    mixer.cycle(5).blend(Receipe, user=normal_user)
+    out = StringIO()
+
+    call_command("partition_recipes", partitions=2, batch_size=2, stdout=out)
+    assert "run again with --swap" in out.getvalue()
+
+    call_command(
+        "partition_recipes", partitions=2, swap=True, drop_old=True, stdout=out
+    )
+    assert "is now partitioned" in out.getvalue()
+    assert Receipe.objects.filter(user=normal_user).count() == 5
+
+
+@postgresql_only
+@pytest.mark.django_db(transaction=True)
+def test_kept_old_table_does_not_block_user_deletion(normal_user):
+    """Test that the table replaced by the swap references no users"""
+    create_recipes(normal_user, 2)
+    RecipePartitioner(connection, partitions=2).run(swap=True)
+
+    get_user_model().objects.filter(pk=normal_user.pk).delete()
+
+    assert RecipePartitioner(connection, partitions=2).table_exists(OLD_TABLE)
+    assert not Receipe.objects.exists()
@@ -1,10 +1,12 @@
 from decimal import Decimal
+from unittest.mock import patch
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 from mixer.backend.django import mixer
 from core.models import Receipe
+from recipes.pagination import RecipeCursorPagination
 from recipes.serializers import RecipeSerializer, RecipeDetailSerializer
 
 
@@ -44,7 +46,7 @@ class PrivateRecipeApiTests(APITestCase):
         recipes = Receipe.objects.all().order_by("-id")
         serializer = RecipeSerializer(recipes, many=True)
         assert response.status_code == status.HTTP_200_OK
-        assert response.data == serializer.data
+        assert response.data["results"] == serializer.data
 
     def test_recipe_list_limited_to_user(self):
         """Test retrieving recipes for user"""
@@ -55,7 +57,37 @@ class PrivateRecipeApiTests(APITestCase):
         serializer = RecipeSerializer(recipes, many=True)
 
         assert response.status_code == status.HTTP_200_OK
-        assert response.data == serializer.data
+        assert response.data["results"] == serializer.data
+
+    def test_recipe_list_paginated_by_cursor(self):
+        """Test walking the recipe list page by page with cursors"""
+        mixer.cycle(5).blend(Receipe, user=self.user)
+        expected = list(
+            Receipe.objects.filter(user=self.user)
+            .order_by("-id")
+            .values_list("id", flat=True)
+        )
+
+        seen = []
+        url = f"{RECIPE_URL}?page_size=2"
+        while url:
+            response = self.client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert "count" not in response.data
+            seen += [recipe["id"] for recipe in response.data["results"]]
+            url = response.data["next"]
+
+        assert seen == expected
+
+    def test_recipe_list_page_size_capped(self):
+        """Test that the requested page size cannot exceed the server cap"""
+        mixer.cycle(3).blend(Receipe, user=self.user)
+        with patch.object(RecipeCursorPagination, "max_page_size", 2):
+            response = self.client.get(RECIPE_URL, {"page_size": 1000})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 2
+        assert response.data["next"] is not None
 
     def test_get_recipe_detail(self):
         """Test retrieving a recipe detail"""
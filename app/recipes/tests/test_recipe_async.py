@@ -0,0 +1,143 @@
+import asyncio
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from mixer.backend.django import mixer
+from core.models import Receipe
+from recipes.urls import RecipeAsyncView
+
+pytestmark = pytest.mark.django_db
+RECIPE_URL = reverse("recipes:recipe-list")
+ASYNC_RECIPE_URL = reverse("recipes:recipe-async-list")
+
+
+def detail_url(recipe_id, name="recipes:recipe-detail"):
+    return reverse(name, args=[recipe_id])
+
+
+def get_async(url, data=None, **headers):
+    """GET through the async test client, headers given without HTTP_"""
+
+    async def request():
+        return await AsyncClient().get(url, data or {}, **headers)
+
+    return async_to_sync(request)()
+
+
+@pytest.fixture
+def token(normal_user):
+    mixer.cycle(5).blend(Receipe, user=normal_user, description="Text")
+    mixer.blend(Receipe)
+    return Token.objects.create(user=normal_user)
+
+
+@pytest.fixture
+def sync_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client
+
+
+def assert_same_response(sync_response, async_response):
+    assert async_response.status_code == sync_response.status_code
+    assert async_response["Content-Type"] == sync_response["Content-Type"]
+    assert async_response.get("ETag") == sync_response.get("ETag")
+    assert async_response.content == sync_response.content
+
+
+def test_async_view_is_a_coroutine_function():
+    """Test that the view runs on the event loop under ASGI"""
+    assert asyncio.iscoroutinefunction(RecipeAsyncView.as_view())
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"fields": "id,title"},
+        {"ordering": "price", "min_time_minutes": 0},
+        {"fields": "secret"},
+    ],
+)
+def test_async_detail_matches_sync(token, sync_client, params):
+    """Test that the async detail view answers like the sync view"""
+    recipe = Receipe.objects.filter(user=token.user).first()
+
+    sync_response = sync_client.get(detail_url(recipe.id), params)
+    async_response = get_async(
+        detail_url(recipe.id, "recipes:recipe-async-detail"),
+        params,
+        authorization=f"Token {token.key}",
+    )
+
+    assert_same_response(sync_response, async_response)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"page_size": 2}, {"ordering": "-time_minutes"}, {"fields": "title"}],
+)
+def test_async_list_matches_sync(token, sync_client, params):
+    """Test that the async list returns the same page and cursors"""
+    sync_response = sync_client.get(RECIPE_URL, params)
+    async_response = get_async(
+        ASYNC_RECIPE_URL, params, authorization=f"Token {token.key}"
+    )
+
+    assert async_response.status_code == status.HTTP_200_OK
+    assert async_response["ETag"] == sync_response["ETag"]
+    sync_data, async_data = sync_response.json(), async_response.json()
+    assert async_data["results"] == sync_data["results"]
+    for link in ("next", "previous"):
+        if sync_data[link] is None:
+            assert async_data[link] is None
+        else:
+            assert async_data[link].replace("/async/", "/") == sync_data[link]
+
+
+def test_async_detail_of_other_user_not_found(token, sync_client):
+    """Test that recipes of other users are hidden"""
+    other = Receipe.objects.exclude(user=token.user).get()
+
+    sync_response = sync_client.get(detail_url(other.id))
+    async_response = get_async(
+        detail_url(other.id, "recipes:recipe-async-detail"),
+        authorization=f"Token {token.key}",
+    )
+
+    assert async_response.status_code == status.HTTP_404_NOT_FOUND
+    assert_same_response(sync_response, async_response)
+
+
+def test_async_list_not_modified(token, sync_client):
+    """Test that an ETag from the sync view is honoured by the async view"""
+    etag = sync_client.get(RECIPE_URL)["ETag"]
+
+    response = get_async(
+        ASYNC_RECIPE_URL,
+        authorization=f"Token {token.key}",
+        **{"if-none-match": etag},
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+
+
+@pytest.mark.parametrize("authorization", [None, "Token invalid", "Token"])
+def test_async_list_unauthorized(token, authorization):
+    """Test that the async view rejects requests like the sync view"""
+    headers = {"authorization": authorization} if authorization else {}
+    sync_client = APIClient()
+    if authorization:
+        sync_client.credentials(HTTP_AUTHORIZATION=authorization)
+
+    sync_response = sync_client.get(RECIPE_URL)
+    async_response = get_async(ASYNC_RECIPE_URL, **headers)
+
+    assert async_response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert async_response["WWW-Authenticate"] == sync_response["WWW-Authenticate"]
+    assert_same_response(sync_response, async_response)
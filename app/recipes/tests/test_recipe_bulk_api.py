@@ -0,0 +1,127 @@
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from mixer.backend.django import mixer
+from core.models import Receipe
+
+
+BULK_URL = reverse("recipes:recipe-bulk")
+
+
+class BulkRecipeApiTests(APITestCase):
+    """Test the recipe bulk endpoint"""
+
+    def setUp(self):
+        self.user = mixer.blend(get_user_model(), email="example@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_bulk_create(self):
+        """Test creating many recipes in one request"""
+        data = [
+            {"title": f"Recipe {i}", "time_minutes": i, "price": "1.50"}
+            for i in range(3)
+        ]
+        # savepoint, insert, stats update, version bump, release
+        with self.assertNumQueries(5):
+            response = self.client.post(BULK_URL, data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [recipe["title"] for recipe in response.data] == [
+            "Recipe 0",
+            "Recipe 1",
+            "Recipe 2",
+        ]
+        assert [recipe["id"] for recipe in response.data] == list(
+            Receipe.objects.order_by("id").values_list("id", flat=True)
+        )
+
+    def test_bulk_create_returns_ids_without_returning_inserts(self):
+        """Test that ids are read back on backends that cannot return them"""
+        mixer.blend(Receipe, user=self.user)
+        data = [
+            {"title": f"Recipe {i}", "time_minutes": i, "price": "1.50"}
+            for i in range(3)
+        ]
+        with patch.object(
+            type(connection.features), "can_return_rows_from_bulk_insert", False
+        ):
+            response = self.client.post(BULK_URL, data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        created = Receipe.objects.filter(title__startswith="Recipe ").order_by("id")
+        assert [recipe["id"] for recipe in response.data] == [
+            recipe.id for recipe in created
+        ]
+        assert [recipe["title"] for recipe in response.data] == [
+            recipe.title for recipe in created
+        ]
+
+    def test_bulk_create_reports_errors_per_item(self):
+        """Test that one invalid item rejects the whole batch"""
+        data = [
+            {"title": "Fine", "time_minutes": 5, "price": "1.00"},
+            {"title": "Too expensive", "time_minutes": 5, "price": "1000.00"},
+        ]
+        response = self.client.post(BULK_URL, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["errors"][0] == {}
+        assert "price" in response.data["errors"][1]
+        assert Receipe.objects.count() == 0
+
+    def test_bulk_create_rejects_too_many_items(self):
+        """Test that batches over the cap are refused"""
+        data = [{"title": "x", "time_minutes": 1, "price": "1.00"}] * 3
+        with override_settings(RECIPE_BULK_MAX_ITEMS=2):
+            response = self.client.post(BULK_URL, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_partial_update(self):
+        """Test updating many recipes by id"""
+        first, second = mixer.cycle(2).blend(Receipe, user=self.user, price="2.00")
+        data = [
+            {"id": first.id, "title": "First"},
+            {"id": second.id, "price": "3.00"},
+        ]
+        response = self.client.patch(BULK_URL, data, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.title == "First"
+        assert str(second.price) == "3.00"
+
+    def test_bulk_update_other_users_recipe_error(self):
+        """Test that recipes of other users cannot be updated"""
+        other_recipe = mixer.blend(Receipe, user=mixer.blend(get_user_model()))
+        data = [{"id": other_recipe.id, "title": "Stolen"}]
+        response = self.client.patch(BULK_URL, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["errors"] == [{"id": ["Not found."]}]
+        other_recipe.refresh_from_db()
+        assert other_recipe.title != "Stolen"
+
+    def test_bulk_delete(self):
+        """Test deleting many recipes by id"""
+        recipes = mixer.cycle(3).blend(Receipe, user=self.user)
+        data = [recipe.id for recipe in recipes[:2]]
+        response = self.client.delete(BULK_URL, data, format="json")
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert list(Receipe.objects.values_list("id", flat=True)) == [recipes[2].id]
+
+    def test_bulk_delete_reports_missing_ids(self):
+        """Test that unknown ids are reported and nothing is deleted"""
+        recipe = mixer.blend(Receipe, user=self.user)
+        response = self.client.delete(BULK_URL, [recipe.id, 0], format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["errors"] == [{}, {"id": ["Not found."]}]
+        assert Receipe.objects.count() == 1
@@ -0,0 +1,68 @@
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from mixer.backend.django import mixer
+from core.models import Receipe
+from recipes.serializers import RecipeSerializer
+
+
+RECIPE_URL = reverse("recipes:recipe-list")
+
+
+def get_detail_url(recipe_id):
+    return reverse("recipes:recipe-detail", args=[recipe_id])
+
+
+class RecipeResponseCacheTests(APITestCase):
+    """Test the versioned recipe response cache"""
+
+    def setUp(self):
+        self.user = mixer.blend(get_user_model(), email="example@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipe = mixer.blend(Receipe, user=self.user)
+
+    def test_list_served_from_cache(self):
+        """Test that a repeated list only reads the recipes version"""
+        first = self.client.get(RECIPE_URL)
+
+        with self.assertNumQueries(1), patch.object(
+            RecipeSerializer, "to_representation"
+        ) as to_representation:
+            second = self.client.get(RECIPE_URL)
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+        to_representation.assert_not_called()
+
+    def test_query_params_cached_separately(self):
+        """Test that different query strings do not share entries"""
+        mixer.blend(Receipe, user=self.user)
+        self.client.get(RECIPE_URL)
+
+        response = self.client.get(RECIPE_URL, {"page_size": 1})
+
+        assert len(response.data["results"]) == 1
+
+    def test_write_invalidates_cache(self):
+        """Test that updates are visible on the next read"""
+        url = get_detail_url(self.recipe.id)
+        self.client.get(url)
+        self.client.get(RECIPE_URL)
+
+        self.client.patch(url, {"title": "Changed"})
+
+        assert self.client.get(url).data["title"] == "Changed"
+        assert self.client.get(RECIPE_URL).data["results"][0]["title"] == "Changed"
+
+    def test_missing_recipe_not_cached(self):
+        """Test that errors are not stored in the cache"""
+        url = get_detail_url(self.recipe.id + 1000)
+        assert self.client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
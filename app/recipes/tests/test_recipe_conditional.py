@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from mixer.backend.django import mixer
+from core.models import Receipe
+
+
+RECIPE_URL = reverse("recipes:recipe-list")
+BULK_URL = reverse("recipes:recipe-bulk")
+
+
+def get_detail_url(recipe_id):
+    return reverse("recipes:recipe-detail", args=[recipe_id])
+
+
+class ConditionalRecipeApiTests(APITestCase):
+    """Test conditional GET on recipe endpoints"""
+
+    def setUp(self):
+        self.user = mixer.blend(get_user_model(), email="example@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipe = mixer.blend(Receipe, user=self.user)
+
+    def test_list_not_modified(self):
+        """Test that a matching ETag is answered with one cheap query"""
+        response = self.client.get(RECIPE_URL)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(RECIPE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+
+    def test_list_if_modified_since(self):
+        """Test that Last-Modified validates the list"""
+        last_modified = self.client.get(RECIPE_URL)["Last-Modified"]
+
+        response = self.client.get(RECIPE_URL, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_write_changes_etag(self):
+        """Test that creating, updating and deleting invalidate the ETag"""
+        etag = self.client.get(RECIPE_URL)["ETag"]
+        writes = [
+            lambda: mixer.blend(Receipe, user=self.user),
+            lambda: self.client.patch(get_detail_url(self.recipe.id), {"title": "x"}),
+            lambda: self.client.delete(BULK_URL, [self.recipe.id], format="json"),
+        ]
+        for write in writes:
+            write()
+            response = self.client.get(RECIPE_URL, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_200_OK
+            etag = response["ETag"]
+
+    def test_other_users_writes_keep_etag(self):
+        """Test that another user's writes do not invalidate the list"""
+        etag = self.client.get(RECIPE_URL)["ETag"]
+        mixer.blend(Receipe)
+
+        response = self.client.get(RECIPE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_detail_not_modified(self):
+        """Test conditional GET on a recipe detail"""
+        url = get_detail_url(self.recipe.id)
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
@@ -0,0 +1,97 @@
+import json
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from mixer.backend.django import mixer
+from core.models import Receipe
+
+
+RECIPE_URL = reverse("recipes:recipe-list")
+EXPORT_URL = reverse("recipes:recipe-export")
+
+
+def detail_url(recipe_id):
+    return reverse("recipes:recipe-detail", args=[recipe_id])
+
+
+class SparseFieldsetApiTests(APITestCase):
+    """Test the ?fields= parameter of the recipe API"""
+
+    def setUp(self):
+        self.user = mixer.blend(get_user_model(), email="example@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        mixer.cycle(3).blend(Receipe, user=self.user, description="Long text")
+        self.recipe = Receipe.objects.filter(user=self.user).order_by("-id").first()
+
+    def get_selects(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        selects = [
+            query["sql"]
+            for query in queries.captured_queries
+            if '"core_receipe"' in query["sql"] and query["sql"].startswith("SELECT")
+        ]
+        return response, selects
+
+    def test_list_returns_requested_fields(self):
+        """Test that the list only renders the requested fields"""
+        response = self.client.get(RECIPE_URL, {"fields": "title,id"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [list(row) for row in response.data["results"]] == [["id", "title"]] * 3
+
+    def test_detail_does_not_read_unrequested_columns(self):
+        """Test that the description column is not selected unless requested"""
+        response, selects = self.get_selects(
+            detail_url(self.recipe.id), {"fields": "id,title"}
+        )
+
+        assert response.data == {"id": self.recipe.id, "title": self.recipe.title}
+        assert selects
+        assert not any('"description"' in sql for sql in selects)
+        assert not any('"link"' in sql for sql in selects)
+
+    def test_detail_description_can_be_requested(self):
+        """Test requesting the detail only field"""
+        response = self.client.get(
+            detail_url(self.recipe.id), {"fields": "description"}
+        )
+
+        assert response.data == {"description": "Long text"}
+
+    def test_pagination_with_fields_without_ordering_column(self):
+        """Test that cursors still work when id is not requested"""
+        response = self.client.get(RECIPE_URL, {"fields": "title", "page_size": 2})
+        next_page = self.client.get(response.data["next"])
+
+        assert len(response.data["results"]) == 2
+        assert len(next_page.data["results"]) == 1
+
+    def test_stream_with_fields(self):
+        """Test that streamed exports honour the selection"""
+        response = self.client.get(
+            EXPORT_URL, {"stream": "ndjson", "fields": "id,description"}
+        )
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert [list(json.loads(line)) for line in lines] == [["id", "description"]] * 3
+
+    def test_unknown_field_error(self):
+        """Test that unknown field names are rejected"""
+        response = self.client.get(RECIPE_URL, {"fields": "id,secret,description"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["fields"] == [
+            "Unknown field: description.",
+            "Unknown field: secret.",
+        ]
+
+    def test_empty_selection_error(self):
+        """Test that a selection without any field name is rejected"""
+        response = self.client.get(detail_url(self.recipe.id), {"fields": ","})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,184 @@
+import itertools
+from decimal import Decimal
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+from mixer.backend.django import mixer
+from core.models import Receipe
+from recipes.views import RecipeViewSet
+
+
+RECIPE_URL = reverse("recipes:recipe-list")
+
+FILTERS = [
+    {},
+    {"max_time_minutes": 30},
+    {"max_price": "10.00"},
+    {"min_time_minutes": 5, "max_time_minutes": 30, "max_price": "10.00"},
+]
+ORDERINGS = ["-id", "id", "time_minutes", "-time_minutes", "price", "-price"]
+
+
+class RecipeFilterApiTests(APITestCase):
+    """Test filtering and ordering the recipe list"""
+
+    def setUp(self):
+        self.user = mixer.blend(get_user_model(), email="example@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def get_ids(self, params):
+        response = self.client.get(RECIPE_URL, params)
+        assert response.status_code == status.HTTP_200_OK
+        return [recipe["id"] for recipe in response.data["results"]]
+
+    def test_filter_by_time_and_price(self):
+        """Test the range filters combine"""
+        match = mixer.blend(
+            Receipe, user=self.user, time_minutes=20, price=Decimal("8.00")
+        )
+        mixer.blend(Receipe, user=self.user, time_minutes=45, price=Decimal("8.00"))
+        mixer.blend(Receipe, user=self.user, time_minutes=20, price=Decimal("12.00"))
+
+        ids = self.get_ids({"max_time_minutes": 30, "max_price": "10"})
+
+        assert ids == [match.id]
+
+    def test_invalid_filter_value_error(self):
+        """Test that malformed filter values are rejected"""
+        response = self.client.get(RECIPE_URL, {"max_price": "cheap"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "max_price" in response.data
+
+    def test_order_by_price(self):
+        """Test cheapest first ordering with ties broken by id"""
+        recipes = [
+            mixer.blend(Receipe, user=self.user, price=Decimal(price))
+            for price in ("3.00", "1.00", "2.00", "1.00")
+        ]
+
+        ids = self.get_ids({"ordering": "price"})
+
+        assert ids == [recipes[1].id, recipes[3].id, recipes[2].id, recipes[0].id]
+
+    def test_unknown_ordering_ignored(self):
+        """Test that orderings outside the whitelist fall back to newest first"""
+        recipes = mixer.cycle(2).blend(Receipe, user=self.user)
+
+        ids = self.get_ids({"ordering": "description"})
+
+        assert ids == [recipes[1].id, recipes[0].id]
+
+    def test_ordering_paginates(self):
+        """Test walking pages of an ordering with many ties"""
+        for price in ("1.00", "2.00") * 3:
+            mixer.blend(Receipe, user=self.user, price=Decimal(price))
+        expected = list(
+            Receipe.objects.order_by("-price", "-id").values_list("id", flat=True)
+        )
+
+        seen = []
+        response = self.client.get(RECIPE_URL, {"ordering": "-price", "page_size": 2})
+        while True:
+            seen += [recipe["id"] for recipe in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        assert seen == expected
+
+    def test_ordering_cursor_skips_ties_without_offset(self):
+        """Test that pages within a run of equal prices are keyset seeks"""
+        for _ in range(7):
+            mixer.blend(Receipe, user=self.user, price=Decimal("5.00"))
+        expected = list(
+            Receipe.objects.order_by("price", "id").values_list("id", flat=True)
+        )
+
+        pages = []
+        url, params = RECIPE_URL, {"ordering": "price", "page_size": 2}
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params)
+            pages.append(response.data)
+            assert not any("OFFSET" in query["sql"] for query in queries)
+            url, params = response.data["next"], None
+
+        assert [recipe["id"] for page in pages for recipe in page["results"]] == (
+            expected
+        )
+        previous = self.client.get(pages[-1]["previous"])
+        assert previous.data["results"] == pages[-2]["results"]
+
+
+def list_queryset(user, params):
+    """Build the queryset the recipe list runs for ``params``"""
+    request = Request(APIRequestFactory().get(RECIPE_URL, params))
+    request.user = user
+    view = RecipeViewSet(request=request, action="list", format_kwarg=None)
+    return view.filter_queryset(view.get_queryset())
+
+
+# Index that serves each ordering, with or without the range filters
+ORDERING_INDEXES = {
+    "-id": "core_receipe_user_id_desc",
+    "id": "core_receipe_user_id_desc",
+    "time_minutes": "core_receipe_user_time",
+    "-time_minutes": "core_receipe_user_time",
+    "price": "core_receipe_user_price",
+    "-price": "core_receipe_user_price",
+}
+
+
+def index_names(cursor, name):
+    """``name`` plus the indexes of its partitions, if the table is partitioned"""
+    cursor.execute(
+        "SELECT child.relname FROM pg_inherits"
+        " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+        " WHERE pg_inherits.inhparent = %s::regclass",
+        [name],
+    )
+    return {name, *(row[0] for row in cursor.fetchall())}
+
+
+@pytest.fixture
+def analyzed_recipes(normal_user):
+    """Enough rows, of the user and of others, for the planner to pick indexes"""
+    other_user = mixer.blend(get_user_model())
+    Receipe.objects.bulk_create(
+        Receipe(
+            user=user,
+            title=f"Recipe {i}",
+            time_minutes=1 + i % 60,
+            price=Decimal(i % 2000) / 100,
+            link="",
+        )
+        for i in range(5000)
+        for user in (normal_user, other_user)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Receipe._meta.db_table}")
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="EXPLAIN plans are PostgreSQL specific"
+)
+@pytest.mark.parametrize(
+    "params, ordering", list(itertools.product(FILTERS, ORDERINGS))
+)
+def test_list_queries_use_indexes(normal_user, analyzed_recipes, params, ordering):
+    """Test that every filter and ordering combination reads the matching index"""
+    queryset = list_queryset(normal_user, {**params, "ordering": ordering})
+    plan = queryset[:51].explain()
+
+    with connection.cursor() as cursor:
+        names = index_names(cursor, ORDERING_INDEXES[ordering])
+    assert any(name in plan for name in names), plan
+    assert "Sort" not in plan, plan
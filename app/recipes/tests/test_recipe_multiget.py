@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from mixer.backend.django import mixer
+from core.models import Receipe
+
+RECIPES_URL = reverse("recipes:recipe-list")
+
+
+class MultiGetRecipeApiTests(APITestCase):
+    """Test retrieving several recipes with ?ids="""
+
+    def setUp(self):
+        self.user = mixer.blend(get_user_model(), email="example@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipes = mixer.cycle(3).blend(Receipe, user=self.user, price="2.50")
+
+    def get(self, ids, **params):
+        return self.client.get(RECIPES_URL, {"ids": ids, **params})
+
+    def test_multi_get_keeps_request_order(self):
+        """Test that recipes come back in the order of the requested ids"""
+        first, second, third = self.recipes
+        response = self.get(f"{third.id},{first.id},{third.id}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [recipe["id"] for recipe in response.data["results"]] == [
+            third.id,
+            first.id,
+        ]
+        assert (
+            response.data["results"][0]
+            == self.client.get(reverse("recipes:recipe-detail", args=[third.id])).data
+        )
+        assert response.data["missing"] == []
+
+    def test_multi_get_reports_missing_ids(self):
+        """Test that unknown and other users' ids are reported as missing"""
+        other = mixer.blend(Receipe, user=mixer.blend(get_user_model()))
+        response = self.get(f"{self.recipes[0].id},{other.id},0,{2**70}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [recipe["id"] for recipe in response.data["results"]] == [
+            self.recipes[0].id
+        ]
+        assert response.data["missing"] == [other.id, 0, 2**70]
+
+    def test_multi_get_single_query(self):
+        """Test that the recipes are fetched with one query"""
+        ids = ",".join(str(recipe.id) for recipe in self.recipes)
+        # recipes version, recipes
+        with self.assertNumQueries(2):
+            response = self.get(ids)
+
+        assert len(response.data["results"]) == 3
+
+    def test_multi_get_sparse_fields(self):
+        """Test that ?fields= applies to the retrieved recipes"""
+        recipe = self.recipes[1]
+        response = self.get(str(recipe.id), fields="title")
+
+        assert response.data["results"] == [{"title": recipe.title}]
+
+    def test_multi_get_invalid_ids(self):
+        """Test that malformed or empty id lists are rejected"""
+        for ids in ("1,x", ",", ""):
+            response = self.get(ids)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert "ids" in response.data
+
+    @override_settings(RECIPE_MULTI_GET_MAX_IDS=2)
+    def test_multi_get_caps_batch_size(self):
+        """Test that more ids than the cap are rejected"""
+        response = self.get(",".join(str(recipe.id) for recipe in self.recipes))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["ids"] == ["Ensure there are no more than 2 ids."]
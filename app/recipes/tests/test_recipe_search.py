@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from mixer.backend.django import mixer
+from core.models import Receipe
+
+
+RECIPE_URL = reverse("recipes:recipe-list")
+
+
+class RecipeSearchApiTests(APITestCase):
+    """Test full-text search on the recipe list"""
+
+    def setUp(self):
+        self.user = mixer.blend(get_user_model(), email="example@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def search(self, term, **params):
+        response = self.client.get(RECIPE_URL, {"search": term, **params})
+        assert response.status_code == status.HTTP_200_OK
+        return response
+
+    def test_search_ranks_title_matches_first(self):
+        """Test that title matches outrank description matches"""
+        in_title = mixer.blend(
+            Receipe, user=self.user, title="Tomato soup", description="Warm"
+        )
+        in_description = mixer.blend(
+            Receipe, user=self.user, title="Pasta", description="With tomato sauce"
+        )
+        mixer.blend(Receipe, user=self.user, title="Cake", description="Sweet")
+
+        response = self.search("tomato")
+
+        assert [recipe["id"] for recipe in response.data["results"]] == [
+            in_title.id,
+            in_description.id,
+        ]
+
+    def test_search_limited_to_user(self):
+        """Test that other users' recipes never match"""
+        mixer.blend(Receipe, title="Tomato soup")
+
+        response = self.search("tomato")
+
+        assert response.data["results"] == []
+
+    def test_search_sees_updates(self):
+        """Test that the search index follows updates and deletes"""
+        recipe = mixer.blend(Receipe, user=self.user, title="Tomato soup")
+        recipe.title = "Onion soup"
+        recipe.save()
+        deleted = mixer.blend(Receipe, user=self.user, title="Onion pie")
+        deleted.delete()
+
+        assert self.search("tomato").data["results"] == []
+        assert [r["id"] for r in self.search("onion").data["results"]] == [recipe.id]
+
+    def test_search_paginates(self):
+        """Test walking ranked search results with cursors"""
+        recipes = mixer.cycle(5).blend(Receipe, user=self.user, title="Bean stew")
+
+        seen = []
+        response = self.search("bean", page_size=2)
+        while True:
+            seen += [recipe["id"] for recipe in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        assert sorted(seen) == sorted(recipe.id for recipe in recipes)
+
+    def test_search_ignores_query_syntax(self):
+        """Test that search operators in user input are treated as text"""
+        response = self.search('"tomato AND (')
+
+        assert response.data["results"] == []
@@ -0,0 +1,194 @@
+import json
+import pytest
+from decimal import Decimal
+from io import StringIO
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.models import Receipe, RecipeStats
+from core.stats import aggregate_recipe_stats
+
+pytestmark = pytest.mark.django_db
+RECIPES_URL = reverse("recipes:recipe-list")
+BULK_URL = reverse("recipes:recipe-bulk")
+STATS_URL = reverse("recipes:recipe-stats")
+
+
+def detail_url(recipe_id):
+    return reverse("recipes:recipe-detail", args=[recipe_id])
+
+
+@pytest.fixture
+def api_client(normal_user):
+    client = APIClient()
+    client.force_authenticate(user=normal_user)
+    return client
+
+
+def create_recipe(user, price="2.00", time_minutes=10):
+    return Receipe.objects.create(
+        user=user, title="Recipe", price=Decimal(price), time_minutes=time_minutes
+    )
+
+
+def assert_consistent(user):
+    """The stored stats match a full recompute"""
+    stats = RecipeStats.objects.get(user=user)
+    expected = aggregate_recipe_stats([user.pk]).get(user.pk, (0, Decimal("0"), 0))
+    assert (
+        stats.recipe_count,
+        stats.price_total,
+        stats.time_minutes_total,
+    ) == expected
+
+
+def test_stats_endpoint(api_client, normal_user, superuser):
+    """Test the recipe count and averages of the user"""
+    create_recipe(normal_user, "1.00", 10)
+    create_recipe(normal_user, "2.50", 25)
+    create_recipe(superuser, "9.00", 90)
+
+    response = api_client.get(STATS_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {
+        "recipe_count": 2,
+        "average_price": "1.75",
+        "average_time_minutes": 17.5,
+    }
+
+
+def test_stats_endpoint_without_recipes(api_client, django_assert_num_queries):
+    """Test that a user without recipes gets empty stats from one read"""
+    with django_assert_num_queries(2):  # recipes version, stats
+        response = api_client.get(STATS_URL)
+
+    assert response.data == {
+        "recipe_count": 0,
+        "average_price": None,
+        "average_time_minutes": None,
+    }
+
+
+def test_single_writes_update_stats(api_client, normal_user):
+    """Test create, update and delete through the API"""
+    response = api_client.post(
+        RECIPES_URL,
+        {"title": "Soup", "time_minutes": 30, "price": "5.00", "user": normal_user.pk},
+    )
+    recipe_id = response.data["id"]
+    assert_consistent(normal_user)
+
+    api_client.patch(detail_url(recipe_id), {"price": "7.25", "time_minutes": 5})
+    stats = RecipeStats.objects.get(user=normal_user)
+    assert (stats.price_total, stats.time_minutes_total) == (Decimal("7.25"), 5)
+
+    api_client.delete(detail_url(recipe_id))
+    stats.refresh_from_db()
+    assert (stats.recipe_count, stats.price_total) == (0, Decimal("0"))
+
+
+def test_repeated_saves_are_counted_once(normal_user):
+    """Test that saving the same instance again only applies the new change"""
+    recipe = create_recipe(normal_user, "1.00", 10)
+    recipe.price = Decimal("3.00")
+    recipe.save()
+    recipe.time_minutes = 20
+    recipe.save()
+
+    assert_consistent(normal_user)
+
+
+def test_update_of_deferred_instance(normal_user):
+    """Test that a save without the previous values reads them from the row"""
+    create_recipe(normal_user, "1.00", 10)
+    recipe = Receipe.objects.only("id", "title").get()
+    recipe.price = Decimal("4.00")
+    recipe.save()
+
+    assert_consistent(normal_user)
+    assert RecipeStats.objects.get(user=normal_user).price_total == Decimal("4.00")
+
+
+def test_writes_of_stale_instances(normal_user):
+    """Test that a write counts from the stored row, not the loaded instance"""
+    create_recipe(normal_user, "1.00", 10)
+    create_recipe(normal_user, "1.00", 10)
+    stale = list(Receipe.objects.order_by("id"))
+    # A concurrent writer, committed after the instances were loaded
+    for recipe in Receipe.objects.all():
+        recipe.price, recipe.time_minutes = Decimal("5.00"), 50
+        recipe.save()
+
+    stale[0].price = Decimal("2.00")
+    stale[0].save()
+    assert_consistent(normal_user)
+    stale[1].delete()
+    assert_consistent(normal_user)
+
+
+def test_bulk_writes_update_stats(api_client, normal_user):
+    """Test the bulk create, update and delete paths"""
+    data = [
+        {"title": f"Recipe {i}", "time_minutes": i, "price": "1.50"} for i in range(3)
+    ]
+    ids = [item["id"] for item in api_client.post(BULK_URL, data, format="json").data]
+    assert_consistent(normal_user)
+
+    api_client.patch(BULK_URL, [{"id": ids[0], "price": "9.99"}], format="json")
+    assert_consistent(normal_user)
+
+    api_client.delete(BULK_URL, ids[:2], format="json")
+    assert_consistent(normal_user)
+    assert RecipeStats.objects.get(user=normal_user).recipe_count == 1
+
+
+def test_stats_roll_back_with_the_write(normal_user):
+    """Test that the stats change in the transaction of the write"""
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            create_recipe(normal_user)
+            raise RuntimeError
+
+    assert RecipeStats.objects.get(user=normal_user).recipe_count == 0
+
+
+def test_user_deletion_removes_stats(normal_user):
+    """Test that deleting a user with recipes leaves no stats behind"""
+    create_recipe(normal_user)
+    normal_user.delete()
+
+    assert not RecipeStats.objects.exists()
+
+
+def test_import_updates_stats(tmp_path, normal_user):
+    """Test that imported recipes are counted"""
+    path = tmp_path / "recipes.jsonl"
+    records = [
+        {"owner": normal_user.email, "title": "A", "time_minutes": 5, "price": "2.00"}
+    ] * 3
+    path.write_text("\n".join(json.dumps(record) for record in records))
+
+    call_command("import_recipes", str(path), batch_size=2, stdout=StringIO())
+
+    assert_consistent(normal_user)
+    assert RecipeStats.objects.get(user=normal_user).recipe_count == 3
+
+
+def test_rebuild_command_repairs_drift(normal_user, superuser):
+    """Test that the command finds and fixes wrong statistics"""
+    create_recipe(normal_user, "1.00", 10)
+    RecipeStats.objects.filter(user=normal_user).update(recipe_count=7)
+    RecipeStats.objects.filter(user=superuser).delete()
+
+    with pytest.raises(CommandError, match="1 users have wrong statistics"):
+        call_command("rebuild_recipe_stats", check=True, stderr=StringIO())
+
+    out = StringIO()
+    call_command("rebuild_recipe_stats", stdout=out, stderr=StringIO())
+
+    assert "Rebuilt the statistics of 1 users" in out.getvalue()
+    assert_consistent(normal_user)
+    call_command("rebuild_recipe_stats", check=True, stdout=StringIO())
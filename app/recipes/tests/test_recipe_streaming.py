@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from mixer.backend.django import mixer
+from core.models import Receipe
+from recipes.serializers import RecipeSerializer, RecipeDetailSerializer
+
+
+RECIPE_URL = reverse("recipes:recipe-list")
+EXPORT_URL = reverse("recipes:recipe-export")
+
+
+def read_stream(response):
+    return b"".join(response.streaming_content).decode()
+
+
+class StreamingRecipeApiTests(APITestCase):
+    """Test streamed recipe responses"""
+
+    def setUp(self):
+        self.user = mixer.blend(get_user_model(), email="example@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        mixer.cycle(3).blend(Receipe, user=self.user)
+        mixer.blend(Receipe)
+        self.recipes = Receipe.objects.filter(user=self.user).order_by("-id")
+
+    def test_stream_list_as_json(self):
+        """Test that a streamed list matches the serializer output"""
+        response = self.client.get(RECIPE_URL, {"stream": "json"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/json"
+        expected = RecipeSerializer(self.recipes, many=True).data
+        assert json.loads(read_stream(response)) == json.loads(json.dumps(expected))
+
+    def test_stream_list_as_ndjson(self):
+        """Test streaming the list as newline delimited JSON"""
+        response = self.client.get(RECIPE_URL, {"stream": "ndjson"})
+
+        lines = read_stream(response).splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [
+            recipe.id for recipe in self.recipes
+        ]
+
+    def test_stream_unknown_format_error(self):
+        """Test that unsupported stream formats are rejected"""
+        response = self.client.get(RECIPE_URL, {"stream": "xml"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_as_csv(self):
+        """Test exporting recipes with their descriptions as CSV"""
+        response = self.client.get(EXPORT_URL, {"stream": "csv"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "attachment" in response["Content-Disposition"]
+        rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+        assert list(rows[0]) == list(RecipeDetailSerializer().fields)
+        assert [row["description"] for row in rows] == [
+            recipe.description for recipe in self.recipes
+        ]
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from recipes.views import RecipeViewSet
+from recipes.views import RecipeAsyncView, RecipeViewSet
 
 
 router = DefaultRouter()
@@ -9,5 +9,11 @@ router.register("recipes", RecipeViewSet, basename="recipe")
 app_name = "recipes"
 
 urlpatterns = [
+    path("recipes/async/", RecipeAsyncView.as_view(), name="recipe-async-list"),
+    path(
+        "recipes/async/<int:pk>/",
+        RecipeAsyncView.as_view(),
+        name="recipe-async-detail",
+    ),
     path("", include(router.urls)),
 ]
@@ -1,28 +1,194 @@
+from asgiref.sync import sync_to_async
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
-from core.models import Receipe
-from recipes.serializers import RecipeSerializer, RecipeDetailSerializer
+from django.contrib.auth import get_user_model
+from core.async_views import AsyncAPIView
+from core.authentication import CachedTokenAuthentication
+from core.conditional import ConditionalGetMixin
+from core.models import Receipe, RecipeStats
+from recipes.bulk import RecipeBulkMixin
+from recipes.cache import RecipeResponseCacheMixin
+from recipes.fieldsets import SparseFieldsetMixin
+from recipes.filters import (
+    RecipeOrderingFilter,
+    RecipeRangeFilter,
+    RecipeSearchFilter,
+)
+from recipes.multiget import IDS_PARAM, RecipeMultiGetMixin
+from recipes.pagination import RecipeCursorPagination
+from recipes.serializers import (
+    RecipeDetailSerializer,
+    RecipeSerializer,
+    RecipeStatsSerializer,
+)
+from recipes.streaming import streaming_response
 
 
-class RecipeViewSet(ModelViewSet):
+def get_recipes_validators(user_id):
+    """Return the user's ``(recipes_version, recipes_modified_at)``"""
+    return (
+        get_user_model()
+        .objects.filter(pk=user_id)
+        .values_list("recipes_version", "recipes_modified_at")
+        .get()
+    )
+
+
+class RecipeViewSet(
+    ConditionalGetMixin,
+    RecipeResponseCacheMixin,
+    SparseFieldsetMixin,
+    RecipeBulkMixin,
+    RecipeMultiGetMixin,
+    ModelViewSet,
+):
     """ViewSet for manage recipe APIs"""
 
+    replica_reads = True
     serializer_class = RecipeDetailSerializer
     queryset = Receipe.objects.all()
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
+    pagination_class = RecipeCursorPagination
+    filter_backends = (RecipeSearchFilter, RecipeRangeFilter, RecipeOrderingFilter)
 
     def get_queryset(self):
         """Retrieve the recipes for the authenticated user"""
         return self.queryset.filter(user=self.request.user).order_by("-id")
 
+    def get_conditional_validators(self, request):
+        """Validate every read against the user's recipes version"""
+        self.recipes_version, modified_at = get_recipes_validators(request.user.pk)
+        return f"recipes:{request.user.pk}:{self.recipes_version}", modified_at
+
     def get_serializer_class(self):
         """Return appropriate serializer class"""
         if self.action == "list":
             return RecipeSerializer
         return self.serializer_class
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                IDS_PARAM,
+                description=(
+                    "Comma separated recipe ids to retrieve instead of listing; "
+                    "the response has the recipes in that order as `results` "
+                    "and the ids not found as `missing`"
+                ),
+            )
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        """List recipes, or retrieve the recipes given as ?ids=
+
+        The list is streamed without pagination when ?stream= is set.
+        """
+        if self.ids_query_param in request.query_params:
+            return self.cached_response(self.multi_get_values, request, *args, **kwargs)
+        stream_format = request.query_params.get("stream")
+        if stream_format:
+            queryset = self.filter_queryset(self.get_queryset())
+            return streaming_response(
+                queryset,
+                RecipeSerializer,
+                stream_format,
+                only=self.get_sparse_fields(RecipeSerializer),
+            )
+        return self.cached_response(self.list_values, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a recipe, served from the response cache when possible"""
+        return self.cached_response(self.retrieve_values, request, *args, **kwargs)
+
+    def list_values(self, request, *args, **kwargs):
+        """List recipes through the compiled read-only serializer"""
+        compiled = self.get_compiled_serializer(RecipeSerializer)
+        rows = compiled.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.serialize(page))
+        return Response(compiled.serialize(rows))
+
+    def retrieve_values(self, request, *args, **kwargs):
+        """Retrieve a recipe through the compiled read-only serializer"""
+        compiled = self.get_compiled_serializer(RecipeDetailSerializer)
+        rows = compiled.values(self.filter_queryset(self.get_queryset()))
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(rows, **{self.lookup_field: kwargs[lookup_url_kwarg]})
+        return Response(compiled.serialize([row])[0])
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """Download every recipe of the user as JSON, NDJSON or CSV"""
+        queryset = self.filter_queryset(self.get_queryset())
+        stream_format = request.query_params.get("stream", "ndjson")
+        return streaming_response(
+            queryset,
+            RecipeDetailSerializer,
+            stream_format,
+            filename="recipes",
+            only=self.get_sparse_fields(RecipeDetailSerializer),
+        )
+
+    @action(detail=False, methods=["get"], pagination_class=None, filter_backends=())
+    def stats(self, request):
+        """Number of recipes, average price and cooking time of the user"""
+        stats = RecipeStats.objects.filter(user=request.user).first()
+        if stats is None:
+            stats = RecipeStats(user=request.user)
+        return Response(RecipeStatsSerializer(stats).data)
+
     def perform_create(self, serializer):
         """Create a new recipe"""
         serializer.save(user=self.request.user)
+
+
+class RecipeAsyncView(SparseFieldsetMixin, AsyncAPIView):
+    """Async recipe list and detail, same responses as ``RecipeViewSet``
+
+    Only the validator query and the page query leave the event loop.
+    """
+
+    replica_reads = True
+    http_method_names = ["get", "head"]
+    filter_backends = RecipeViewSet.filter_backends
+    pagination_class = RecipeViewSet.pagination_class
+
+    def get_queryset(self):
+        """Retrieve the recipes for the authenticated user"""
+        return Receipe.objects.filter(user=self.request.user).order_by("-id")
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    async def get_conditional_validators(self, request):
+        """Validate every read against the user's recipes version"""
+        version, modified_at = await sync_to_async(get_recipes_validators)(
+            request.user.pk
+        )
+        return f"recipes:{request.user.pk}:{version}", modified_at
+
+    async def get(self, request, pk=None):
+        if pk is None:
+            return await self.list(request)
+        return await self.retrieve(request, pk)
+
+    async def list(self, request):
+        compiled = self.get_compiled_serializer(RecipeSerializer)
+        rows = compiled.values(self.filter_queryset(self.get_queryset()))
+        paginator = self.pagination_class()
+        page = await sync_to_async(paginator.paginate_queryset)(rows, request, self)
+        return paginator.get_paginated_response(compiled.serialize(page))
+
+    async def retrieve(self, request, pk):
+        compiled = self.get_compiled_serializer(RecipeDetailSerializer)
+        rows = compiled.values(self.filter_queryset(self.get_queryset()))
+        row = await sync_to_async(get_object_or_404)(rows, pk=pk)
+        return Response(compiled.serialize([row])[0])
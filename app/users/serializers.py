@@ -1,9 +1,13 @@
+from asgiref.sync import sync_to_async
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework import serializers
+from core.authentication import token_cache
+from core.hashers import acheck_password, ahash_password
+from core.metrics import TimedRepresentationMixin
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     class Meta:
         model = get_user_model()
         fields = ("email", "name", "password")
@@ -20,6 +24,7 @@ class UserSerializer(serializers.ModelSerializer):
             user.set_password(password)
             user.save()
 
+        token_cache.invalidate_user(user.pk)
         return user
 
 
@@ -46,3 +51,31 @@ class AuthTokenSerializer(serializers.Serializer):
 
         attrs["user"] = user
         return attrs
+
+
+class AsyncAuthTokenSerializer(AuthTokenSerializer):
+    """Serializer for the auth token that checks credentials asynchronously
+
+    ``is_valid`` only runs field validation; ``aauthenticate`` must be
+    awaited afterwards to resolve the user.
+    """
+
+    def validate(self, attrs):
+        return attrs
+
+    async def aauthenticate(self):
+        email = self.validated_data["email"]
+        password = self.validated_data["password"]
+
+        user = await sync_to_async(get_user_model().objects.filter(email=email).first)()
+        if user is None:
+            # Hash anyway so unknown emails take as long as wrong passwords
+            await ahash_password(password)
+        elif user.is_active and await acheck_password(password, user.password):
+            self.validated_data["user"] = user
+            return user
+
+        msg = _("Unable to authenticate with provided credentials")
+        raise serializers.ValidationError(
+            {"non_field_errors": [msg]}, code="authentication"
+        )
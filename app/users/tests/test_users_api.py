@@ -1,13 +1,42 @@
 import pytest
+from datetime import timedelta
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework import status
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase, APIClient
+from core.hashers import HashingExecutor, HashingExecutorBusy
 
 pytestmark = pytest.mark.django_db
 CREATE_USER_URL = reverse("users:create")
 TOKEN_URL = reverse("users:token")
+ASYNC_TOKEN_URL = reverse("users:token-async")
 ME_URL = reverse("users:me")
+ASYNC_ME_URL = reverse("users:me-async")
+
+
+def post_async(url, data):
+    """POST JSON through the async test client"""
+
+    async def request():
+        return await AsyncClient().post(url, data, content_type="application/json")
+
+    return async_to_sync(request)()
+
+
+def request_async(method, url, data=None, **headers):
+    """Send a JSON request through the async test client"""
+
+    async def request():
+        send = getattr(AsyncClient(), method)
+        if data is None:
+            return await send(url, **headers)
+        return await send(url, data, content_type="application/json", **headers)
+
+    return async_to_sync(request)()
 
 
 # Public test
@@ -66,6 +95,94 @@ def test_create_token_bad_credentials(client, normal_user):
     assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+def test_create_token_when_hashing_saturated(client, normal_user):
+    """Test that login is shed with 503 when the hashing pool is full"""
+    data = {"email": normal_user.email, "password": "Password123"}
+    with patch.object(HashingExecutor, "run", side_effect=HashingExecutorBusy):
+        response = client.post(TOKEN_URL, data)
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response["Retry-After"] == "1"
+
+
+def test_create_token_async(normal_user):
+    """Test that the async token view issues the same token"""
+    data = {"email": normal_user.email, "password": "Password123"}
+    response = post_async(ASYNC_TOKEN_URL, data)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["token"] == normal_user.auth_token.key
+
+
+def test_create_token_async_when_hashing_saturated(normal_user):
+    """Test that the async token view sheds login with 503 when saturated"""
+    data = {"email": normal_user.email, "password": "Password123"}
+    with patch.object(HashingExecutor, "arun", side_effect=HashingExecutorBusy):
+        response = post_async(ASYNC_TOKEN_URL, data)
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response["Retry-After"] == "1"
+    assert not Token.objects.filter(user=normal_user).exists()
+
+
+def test_create_token_async_bad_credentials(normal_user):
+    """Test that the async token view rejects bad credentials"""
+    for email in (normal_user.email, "missing@example.com"):
+        data = {"email": email, "password": "wrong"}
+        response = post_async(ASYNC_TOKEN_URL, data)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "non_field_errors" in response.json()
+
+
+def test_manage_user_async_matches_sync(normal_user):
+    """Test that the async me view answers like the sync view"""
+    token = Token.objects.create(user=normal_user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    auth = {"authorization": f"Token {token.key}"}
+
+    sync_response = client.get(ME_URL)
+    async_response = request_async("get", ASYNC_ME_URL, **auth)
+    assert async_response.status_code == status.HTTP_200_OK
+    assert async_response.content == sync_response.content
+    assert async_response["ETag"] == sync_response["ETag"]
+
+    not_modified = request_async(
+        "get", ASYNC_ME_URL, **auth, **{"if-none-match": sync_response["ETag"]}
+    )
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = request_async("patch", ASYNC_ME_URL, {"name": "Async"}, **auth)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == client.get(ME_URL).content
+
+    response = request_async("patch", ASYNC_ME_URL, {"email": "bad"}, **auth)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "email" in response.json()
+
+    assert request_async("get", ASYNC_ME_URL).status_code == 401
+    assert request_async("post", ASYNC_ME_URL, {}, **auth).status_code == 405
+
+
+def test_manage_user_ignores_cached_user(normal_user):
+    """Test that an update made by another worker is not answered with 304"""
+    token = Token.objects.create(user=normal_user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    auth = {"authorization": f"Token {token.key}"}
+    etag = client.get(ME_URL)["ETag"]
+    assert request_async("get", ASYNC_ME_URL, **auth)["ETag"] == etag
+
+    # Leaves this process's token cache holding the old user
+    get_user_model().objects.filter(pk=normal_user.pk).update(
+        name="Elsewhere", updated_at=normal_user.updated_at + timedelta(seconds=1)
+    )
+
+    response = client.get(ME_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["name"] == "Elsewhere"
+    response = request_async("get", ASYNC_ME_URL, **auth, **{"if-none-match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == "Elsewhere"
+
+
 def test_retrieve_user_unauthorized(client):
     """Test that authentication is required for users"""
     response = client.get(ME_URL)
@@ -92,6 +209,26 @@ class PrivateUserApiTests(APITestCase):
         assert response.data["email"] == self.user.email
         assert response.data["name"] == self.user.name
 
+    def test_retrieve_profile_not_modified(self):
+        """Test that an unchanged profile is answered with 304"""
+        etag = self.client.get(ME_URL)["ETag"]
+
+        # Only the user's row, re-read for its modification time
+        with self.assertNumQueries(1):
+            response = self.client.get(ME_URL, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_update_profile_changes_etag(self):
+        """Test that updating the profile invalidates its ETag"""
+        etag = self.client.get(ME_URL)["ETag"]
+        self.client.patch(ME_URL, {"name": "new name"})
+
+        response = self.client.get(ME_URL, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["name"] == "new name"
+
     def test_post_me_not_allowed(self):
         """Test that POST is not allowed on the me url"""
         response = self.client.post(ME_URL, {})
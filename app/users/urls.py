@@ -1,5 +1,11 @@
 from django.urls import path
-from users.views import CreateUserView, CreateTokenView, ManageUserView
+from users.views import (
+    CreateUserView,
+    CreateTokenView,
+    ManageUserView,
+    ManageUserAsyncView,
+    create_token_async,
+)
 
 
 app_name = "users"
@@ -7,5 +13,7 @@ app_name = "users"
 urlpatterns = [
     path("create/", CreateUserView.as_view(), name="create"),
     path("token/", CreateTokenView.as_view(), name="token"),
+    path("token/async/", create_token_async, name="token-async"),
     path("me/", ManageUserView.as_view(), name="me"),
+    path("me/async/", ManageUserAsyncView.as_view(), name="me-async"),
 ]
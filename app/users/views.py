@@ -1,33 +1,159 @@
+import json
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import HttpResponseNotAllowed, JsonResponse
+from rest_framework.exceptions import APIException
 from rest_framework.generics import CreateAPIView, RetrieveUpdateAPIView
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.authentication import TokenAuthentication
-from users.serializers import UserSerializer, AuthTokenSerializer
+from rest_framework.serializers import ValidationError
+from core.async_views import AsyncAPIView
+from core.authentication import CachedTokenAuthentication
+from core.conditional import ConditionalGetMixin
+from core.hashers import HashingExecutorBusy
+from users.serializers import (
+    UserSerializer,
+    AuthTokenSerializer,
+    AsyncAuthTokenSerializer,
+)
 
-# import TokenAuthentication from rest framework
+HASHING_RETRY_AFTER = 1
 
 
-class CreateUserView(CreateAPIView):
+class HashingUnavailable(APIException):
+    status_code = 503
+    default_detail = "Too many password operations in progress, try again later."
+    default_code = "hashing_unavailable"
+
+
+class HashingBackpressureMixin:
+    """Turn a saturated hashing executor into 503 + Retry-After"""
+
+    def handle_exception(self, exc):
+        if isinstance(exc, HashingExecutorBusy):
+            response = super().handle_exception(HashingUnavailable())
+            response["Retry-After"] = str(HASHING_RETRY_AFTER)
+            return response
+        return super().handle_exception(exc)
+
+
+class CreateUserView(HashingBackpressureMixin, CreateAPIView):
     """Create a new user"""
 
     serializer_class = UserSerializer
 
 
-class CreateTokenView(ObtainAuthToken):
+class CreateTokenView(HashingBackpressureMixin, ObtainAuthToken):
     """Create a new auth token for user"""
 
     serializer_class = AuthTokenSerializer
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
 
 
-class ManageUserView(RetrieveUpdateAPIView):
+async def create_token_async(request):
+    """Create a new auth token for user without blocking the event loop"""
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return JsonResponse({"detail": "JSON parse error"}, status=400)
+    else:
+        data = request.POST
+
+    serializer = AsyncAuthTokenSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+    try:
+        user = await serializer.aauthenticate()
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+    except HashingExecutorBusy:
+        response = JsonResponse(
+            {"detail": HashingUnavailable.default_detail}, status=503
+        )
+        response["Retry-After"] = str(HASHING_RETRY_AFTER)
+        return response
+
+    token, _ = await sync_to_async(Token.objects.get_or_create)(user=user)
+    return JsonResponse({"token": token.key})
+
+
+def get_user_validators(user):
+    """Return the conditional GET validators of a user's profile"""
+    return f"user:{user.pk}:{user.updated_at.isoformat()}", user.updated_at
+
+
+def get_stored_user(user):
+    """Return ``user`` as stored in the database
+
+    ``request.user`` may come from this process's token cache, which an
+    update served by another worker does not invalidate, so the profile
+    views read the row again (one primary key lookup).
+    """
+    return get_user_model().objects.get(pk=user.pk)
+
+
+class ManageUserView(
+    ConditionalGetMixin, HashingBackpressureMixin, RetrieveUpdateAPIView
+):
     """Manage the authenticated user"""
 
+    replica_reads = True
     serializer_class = UserSerializer
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
+    user = None
+
+    def get_conditional_validators(self, request):
+        """Validate reads against the user's modification time"""
+        return get_user_validators(self.get_object())
 
     def get_object(self):
         """Retrieve and return authenticated user"""
-        return self.request.user
+        if self.user is None:
+            self.user = get_stored_user(self.request.user)
+        return self.user
+
+
+class ManageUserAsyncView(HashingBackpressureMixin, AsyncAPIView):
+    """Manage the authenticated user, same responses as ``ManageUserView``"""
+
+    replica_reads = True
+    http_method_names = ["get", "put", "patch", "head"]
+    user = None
+
+    async def get_object(self):
+        if self.user is None:
+            self.user = await sync_to_async(get_stored_user)(self.request.user)
+        return self.user
+
+    async def get_conditional_validators(self, request):
+        """Validate reads against the user's modification time"""
+        return get_user_validators(await self.get_object())
+
+    async def get(self, request):
+        return Response(UserSerializer(await self.get_object()).data)
+
+    async def put(self, request):
+        return await self.update(request)
+
+    async def patch(self, request):
+        return await self.update(request, partial=True)
+
+    async def update(self, request, partial=False):
+        user = await self.get_object()
+        serializer = UserSerializer(user, data=request.data, partial=partial)
+
+        def save():
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        await sync_to_async(save)()
+        return Response(serializer.data)